@@ -0,0 +1,93 @@
+"""Benchmark da Busca em Arquivos do PyDragon contra o ripgrep (rg)
+
+Uso:
+    python benchmarks/find_in_files.py <pasta do projeto> <padrão> [--regex] [--case] [--word]
+
+Roda o FindInFilesWorker de forma síncrona (mesmo motor da interface, sem o
+limite de resultados) duas vezes — a primeira com o cache de diretórios do
+ProjectWalker frio, a segunda quente — e, se o `rg` estiver no PATH, a mesma
+busca com o ripgrep. Mostra tempo, arquivos, MB/s e linhas com ocorrência.
+Rode cada medição mais de uma vez para descontar o cache de disco do SO.
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QCoreApplication  # noqa: E402
+
+import main  # noqa: E402
+
+
+def project_bytes(root):
+    """Total de bytes dos arquivos que a busca percorre"""
+    walker = main.ProjectWalker.shared(root)
+    return sum(size for _path, size in walker.iter_files(threading.Event()))
+
+
+def run_pydragon(root, args):
+    worker = main.FindInFilesWorker(
+        root, args.pattern, case_sensitive=args.case,
+        whole_word=args.word, use_regex=args.regex)
+    worker.MAX_RESULTS = sys.maxsize
+    result = {}
+    worker.search_finished.connect(
+        lambda searched, total: result.update(files=searched, lines=total))
+    started = time.perf_counter()
+    worker.run()  # síncrono: sinais chegam por conexão direta
+    return time.perf_counter() - started, result.get('files', 0), result.get('lines', 0)
+
+
+def run_ripgrep(root, args):
+    command = ['rg', '--count', '--no-messages']
+    if not args.case:
+        command.append('--ignore-case')
+    if not args.regex:
+        command.append('--fixed-strings')
+    if args.word:
+        command.append('--word-regexp')
+    command += ['--', args.pattern, root]
+    started = time.perf_counter()
+    output = subprocess.run(command, capture_output=True, text=True).stdout
+    elapsed = time.perf_counter() - started
+    lines = sum(int(line.rsplit(':', 1)[1]) for line in output.splitlines())
+    return elapsed, len(output.splitlines()), lines
+
+
+def report(name, elapsed, files, lines, total_bytes, files_label):
+    throughput = total_bytes / elapsed / (1024 * 1024) if elapsed else 0
+    print(f"{name:<22} {elapsed:8.2f}s  {throughput:9.1f} MB/s  "
+          f"{files:>8,} {files_label}  {lines:>9,} linhas")
+
+
+def main_benchmark():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('root')
+    parser.add_argument('pattern')
+    parser.add_argument('--regex', action='store_true')
+    parser.add_argument('--case', action='store_true', help="diferencia maiúsculas")
+    parser.add_argument('--word', action='store_true', help="palavra inteira")
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv)  # noqa: F841 (QObjects precisam da aplicação)
+    root = os.path.abspath(args.root)
+
+    elapsed, files, lines = run_pydragon(root, args)
+    total_bytes = project_bytes(root)
+    print(f"Projeto: {root} ({total_bytes / (1024 * 1024):,.0f} MB)")
+    report("PyDragon (frio)", elapsed, files, lines, total_bytes, "pesquisados")
+    report("PyDragon (quente)", *run_pydragon(root, args), total_bytes, "pesquisados")
+
+    if shutil.which('rg'):
+        report("ripgrep", *run_ripgrep(root, args), total_bytes, "com ocorrência")
+    else:
+        print("ripgrep (rg) não encontrado no PATH; comparação omitida")
+
+
+if __name__ == '__main__':
+    main_benchmark()
@@ -1,6 +1,176 @@
 # ===== CORREÇÃO DE ENCODING PARA WINDOWS =====
 import os
 import sys
+import time
+
+# Referência para medir o tempo até a primeira pintura da janela
+STARTUP_TIME = time.perf_counter()
+# Meta de tempo até a primeira pintura (ms)
+FIRST_PAINT_BUDGET_MS = 500
+
+
+class StartupProfiler:
+    """Perfil da inicialização, ativado com --profile-startup.
+
+    Registra o custo de cada import (tempo acumulado e próprio, como
+    -X importtime), as fases setup_* do IDE, o carregamento dos plugins e a
+    primeira pintura. Ao final grava um relatório em texto e um trace JSON
+    para chrome://tracing / Perfetto e encerra o IDE.
+    """
+
+    def __init__(self, argv):
+        self.enabled = '--profile-startup' in argv
+        # (nome, categoria, início, duração, tempo próprio), em segundos
+        # desde STARTUP_TIME
+        self.events = []
+        self.marks = []
+        self.notes = []
+        self._child_time = []
+        self._original_import = None
+
+    def _record(self, name, category, start, end, self_time):
+        self.events.append(
+            (name, category, start - STARTUP_TIME, end - start, self_time))
+
+    def install_import_hook(self):
+        """Mede cada módulo importado pela primeira vez"""
+        import builtins
+        original_import = self._original_import = builtins.__import__
+        profiler = self
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in sys.modules:
+                return original_import(name, globals, locals, fromlist, level)
+            profiler._child_time.append(0.0)
+            start = time.perf_counter()
+            try:
+                return original_import(name, globals, locals, fromlist, level)
+            finally:
+                end = time.perf_counter()
+                children = profiler._child_time.pop()
+                if profiler._child_time:
+                    profiler._child_time[-1] += end - start
+                profiler._record(f"import {name}", 'import', start, end,
+                                 end - start - children)
+
+        builtins.__import__ = timed_import
+
+    def remove_import_hook(self):
+        if self._original_import is not None:
+            import builtins
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def phase(self, name, category='setup'):
+        """Context manager que mede uma fase (no-op se desativado)"""
+        return _ProfilerPhase(self if self.enabled else None, name, category)
+
+    def mark(self, name):
+        if self.enabled:
+            self.marks.append((name, time.perf_counter() - STARTUP_TIME))
+
+    def note(self, text):
+        if self.enabled:
+            self.notes.append(text)
+
+    def write_report(self, output_dir):
+        """Grava o relatório em texto e o trace JSON; retorna os caminhos"""
+        import json
+        self.remove_import_hook()
+        os.makedirs(output_dir, exist_ok=True)
+        stamp = time.strftime('%Y%m%d_%H%M%S')
+        report_path = os.path.join(output_dir, f"startup_{stamp}.txt")
+        trace_path = os.path.join(output_dir, f"startup_{stamp}.json")
+
+        lines = ["Perfil de inicialização", ""]
+        for name, offset in self.marks:
+            lines.append(f"{name:<40} {offset * 1000:10.1f} ms")
+        if self.notes:
+            lines += [""] + [f"⚠ {text}" for text in self.notes]
+
+        for category, title in (('setup', 'Fases'), ('plugin', 'Plugins'),
+                                ('deferred', 'Tarefas adiadas')):
+            events = [e for e in self.events if e[1] == category]
+            if events:
+                lines += ["", title]
+                lines += [f"  {name:<50} {duration * 1000:10.1f} ms"
+                          for name, _cat, _start, duration, _self in events]
+
+        imports = sorted((e for e in self.events if e[1] == 'import'),
+                         key=lambda e: e[4], reverse=True)
+        if imports:
+            total = sum(e[4] for e in imports)
+            lines += ["", f"Imports ({len(imports)} módulos, {total * 1000:.1f} ms)",
+                      f"  {'módulo':<50} {'próprio':>10} {'acumulado':>12}"]
+            lines += [f"  {name[7:]:<50} {self_time * 1000:8.1f} ms {duration * 1000:9.1f} ms"
+                      for name, _cat, _start, duration, self_time in imports[:40]]
+
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+        trace_events = [
+            {'name': name, 'cat': category, 'ph': 'X', 'pid': 1, 'tid': 1,
+             'ts': round(start * 1e6), 'dur': round(duration * 1e6)}
+            for name, category, start, duration, _self in self.events]
+        trace_events += [
+            {'name': name, 'cat': 'mark', 'ph': 'i', 's': 'g', 'pid': 1, 'tid': 1,
+             'ts': round(offset * 1e6)}
+            for name, offset in self.marks]
+        with open(trace_path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': trace_events}, f)
+
+        return report_path, trace_path
+
+
+class _ProfilerPhase:
+    def __init__(self, profiler, name, category):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.profiler is not None:
+            end = time.perf_counter()
+            self.profiler._record(self.name, self.category, self.start, end, end - self.start)
+        return False
+
+
+startup_profiler = StartupProfiler(sys.argv)
+if startup_profiler.enabled:
+    startup_profiler.install_import_hook()
+
+APP_ID = "py_dragon_studio_ide"
+
+# Diretório de caches do IDE (índice de busca, perfis de inicialização...)
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".py_dragon_cache")
+
+
+def forward_to_running_instance(app_id, args):
+    """Envia os argumentos à instância já aberta; True se ela os recebeu"""
+    import json
+    from PySide6.QtNetwork import QLocalSocket
+
+    socket = QLocalSocket()
+    socket.connectToServer(app_id)
+    if not socket.waitForConnected(500):
+        return False
+    payload = json.dumps({'cwd': os.getcwd(), 'args': args}) + "\n"
+    socket.write(payload.encode('utf-8'))
+    sent = socket.waitForBytesWritten(1000)
+    socket.disconnectFromServer()
+    return sent
+
+
+# Com o IDE já aberto, `pydragon arquivo.py:120` só repassa os argumentos,
+# antes de carregar o restante do Qt e do IDE
+if (__name__ == "__main__" and not startup_profiler.enabled and
+        '--plugin-host' not in sys.argv):
+    if forward_to_running_instance(APP_ID, sys.argv[1:]):
+        sys.exit(0)
 
 # Forçar UTF-8 no Windows
 if os.name == 'nt':
@@ -13,7 +183,12 @@ if os.name == 'nt':
     os.environ['PYTHONUTF8'] = '1'
     os.environ['PYTHONIOENCODING'] = 'utf-8'
 import ast
+import bisect
+import codecs
+import concurrent.futures
 import glob
+import hashlib
+import heapq
 
 
 
@@ -22,37 +197,70 @@ import importlib
 import importlib.util
 import inspect
 import json
+import mmap
 import platform
 import re
 import shutil
 import subprocess
-import tempfile
 import textwrap
 import threading
-import time
 import traceback
-import zipfile
 from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict, namedtuple
+from array import array
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable, Dict, List
-from urllib.request import urlretrieve
 
-try:
-    import jedi
 
-    JEDI_AVAILABLE = True
-except ImportError:
-    JEDI_AVAILABLE = False
+class LazyModule:
+    """Módulo importado só no primeiro acesso a um atributo"""
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            module = self.__dict__['_module'] = importlib.import_module(self._name)
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        return f"<lazy module {self._name!r}>"
+
+
+# Dependências pesadas usadas só por alguns recursos (autocomplete,
+# instalação de plugins, deploy) carregam no primeiro uso
+LAZY_MODULES = ('jedi', 'tempfile', 'urllib.request', 'zipfile')
+tempfile = LazyModule('tempfile')
+urllib_request = LazyModule('urllib.request')
+zipfile = LazyModule('zipfile')
+
+# Só verifica se o Jedi está instalado; o import acontece no primeiro uso
+JEDI_AVAILABLE = importlib.util.find_spec('jedi') is not None
+jedi = LazyModule('jedi')
+if not JEDI_AVAILABLE:
     print("Jedi não disponível - usando autocomplete básico")
 from typing import Any, Dict, List, Set
 
 from PySide6.QtCore import (
+    QAbstractListModel,
+    QByteArray,
     QDir,
+    QEvent,
+    QFileSystemWatcher,
     QModelIndex,
+    QObject,
+    QPointF,
     QProcess,
+    QRectF,
     QRegularExpression,
     QSize,
+    QSortFilterProxyModel,
     QStringListModel,
     Qt,
     QThread,
@@ -65,7 +273,9 @@ from PySide6.QtGui import (
     QColor,
     QFont,
     QFontDatabase,
+    QFontMetrics,
     QGuiApplication,
+    QImage,
     QKeyEvent,
     QPainter,
     QPalette,
@@ -78,6 +288,7 @@ from PySide6.QtGui import (
 )
 from PySide6.QtNetwork import QLocalServer, QLocalSocket
 from PySide6.QtWidgets import (
+    QAbstractScrollArea,
     QApplication,
     QButtonGroup,
     QCheckBox,
@@ -94,6 +305,7 @@ from PySide6.QtWidgets import (
     QLabel,
     QLineEdit,
     QListWidget,
+    QListView,
     QListWidgetItem,
     QMainWindow,
     QMenu,
@@ -105,10 +317,15 @@ from PySide6.QtWidgets import (
     QScrollArea,
     QSplitter,
     QStyledItemDelegate,
+    QTableWidget,
+    QTableWidgetItem,
     QTabWidget,
     QTextEdit,
     QToolBar,
+    QToolTip,
     QTreeView,
+    QTreeWidget,
+    QTreeWidgetItem,
 )
 from PySide6.QtWidgets import QVBoxLayout
 from PySide6.QtWidgets import QVBoxLayout as QVBoxLayoutDialog
@@ -158,81 +375,294 @@ class PluginBase(ABC):
         """Retorna itens para a toolbar"""
         return []
 
+    def get_commands(self) -> Dict[str, Callable]:
+        """Comandos declarados no manifesto (id -> função)"""
+        return {}
+
+
+class PluginDescriptor:
+    """Plugin conhecido pelo manifesto; só é importado ao ser ativado.
+
+    Manifesto (JSON, lido sem executar código):
+        {"name": "...", "version": "...", "author": "...", "description": "...",
+         "main": "plugin.py", "class": "MeuPlugin", "enabled": true,
+         "activationEvents": ["onStartup", "onCommand:<id>", "onLanguage:<linguagem>"],
+         "commands": [{"id": "<id>", "title": "Texto do menu"}],
+         "host": "process"}
+
+    Com "host": "process" o plugin roda no processo de plugins
+    (PluginHost), fora da thread da interface.
+    """
+
+    def __init__(self, manifest, loader):
+        self.manifest = manifest
+        self.name = manifest['name']
+        self.version = manifest.get('version', '')
+        self.enabled = manifest.get('enabled', True)
+        self.activation_events = set(manifest.get('activationEvents', []))
+        self.commands = [
+            command for command in manifest.get('commands', [])
+            if isinstance(command, dict) and command.get('id')]
+        self.out_of_process = manifest.get('host') == 'process'
+        self.loader = loader  # cria a instância do plugin (importa o código)
+        self.plugin = None
+        self.failed = False
+
+    @property
+    def is_active(self):
+        return self.plugin is not None
+
+
+class PluginStats:
+    """Tempos acumulados das chamadas a um plugin (na thread da GUI)"""
+
+    def __init__(self):
+        self.calls = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.max_wall_time = 0.0
+        self.slow_calls = 0
+        self.last_slow = ""  # última chamada lenta (rótulo e duração)
+
+    def record(self, label, wall_time, cpu_time, is_slow):
+        self.calls += 1
+        self.wall_time += wall_time
+        self.cpu_time += cpu_time
+        self.max_wall_time = max(self.max_wall_time, wall_time)
+        if is_slow:
+            self.slow_calls += 1
+            self.last_slow = f"{label} ({wall_time * 1000:.0f} ms)"
+
 
 class PluginManager:
-    """Gerenciador de plugins"""
+    """Gerenciador de plugins com ativação sob demanda"""
+    # Chamadas de plugin acima disso bloquearam visivelmente a interface
+    SLOW_CALLBACK_MS = 100
 
     def __init__(self, ide_instance):
         self.ide = ide_instance
-        self.plugins: Dict[str, PluginBase] = {}
+        self.plugins: Dict[str, PluginBase] = {}  # plugins ativos
+        self.descriptors: Dict[str, PluginDescriptor] = {}
         self.plugins_dir = os.path.join(
             os.path.expanduser("~"), ".py_dragon_plugins")
         os.makedirs(self.plugins_dir, exist_ok=True)
+        self.settings_file = os.path.join(
+            self.plugins_dir, "settings.json")
+        self.stats: Dict[str, PluginStats] = {}
+
+    def timed_call(self, name, label, func, *args):
+        """Executa um callback do plugin medindo tempo de parede e de CPU"""
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            return func(*args)
+        finally:
+            wall_time = time.perf_counter() - wall_start
+            cpu_time = time.thread_time() - cpu_start
+            is_slow = wall_time * 1000 > self.SLOW_CALLBACK_MS
+            self.stats.setdefault(name, PluginStats()).record(
+                label, wall_time, cpu_time, is_slow)
+            if is_slow:
+                message = (f"⚠ Plugin {name} bloqueou a interface por "
+                           f"{wall_time * 1000:.0f} ms ({label})")
+                print(message)
+                if self.ide is not None:
+                    self.ide.statusBar().showMessage(message, 5000)
+
+    def wrap_action(self, name, action):
+        """Ação equivalente cujo disparo é medido e atribuído ao plugin"""
+        timed_action = QAction(action.icon(), action.text(), self.ide)
+        timed_action.setShortcut(action.shortcut())
+        timed_action.setToolTip(action.toolTip())
+        timed_action.triggered.connect(
+            lambda _checked=False: self.timed_call(
+                name, f"ação {action.text()}", action.trigger))
+        # A ação original passa a viver junto com a ação medida
+        action.setParent(timed_action)
+        return timed_action
+
+    def load_settings(self):
+        """Configurações dos plugins (ex.: {"disabled": ["Git Integration"]})"""
+        try:
+            with open(self.settings_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def read_manifest(manifest_path):
+        """Lê um manifesto JSON; None se inválido"""
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Manifesto de plugin inválido {manifest_path}: {e}")
+            return None
+        if not isinstance(manifest, dict) or not manifest.get('name'):
+            print(f"Manifesto de plugin sem nome: {manifest_path}")
+            return None
+        return manifest
+
+    def plugin_module_name(self, module_path):
+        return "py_dragon_plugin_" + re.sub(
+            r'\W', '_', os.path.splitext(os.path.relpath(module_path, self.plugins_dir))[0])
+
+    @staticmethod
+    def find_plugin_class(module_path, module_name, class_name=None):
+        """Executa o módulo do plugin e devolve sua classe"""
+        spec = importlib.util.spec_from_file_location(
+            module_name, module_path)
+        module = importlib.util.module_from_spec(
+            spec)
+        spec.loader.exec_module(
+            module)
+
+        if class_name:
+            return getattr(module, class_name)
+        for attr_name in dir(
+                module):
+            attr = getattr(
+                module, attr_name)
+            if (inspect.isclass(attr) and
+                    issubclass(attr, PluginBase) and
+                    attr != PluginBase):
+                return attr
+        raise ImportError(f"nenhuma subclasse de PluginBase em {module_path}")
+
+    def load_plugin_module(self, module_path, class_name=None):
+        """Executa o módulo do plugin e instancia sua classe"""
+        plugin_class = self.find_plugin_class(
+            module_path, self.plugin_module_name(module_path), class_name)
+        return plugin_class(self.ide)
 
     def discover_plugins(self):
-        """Descobre plugins disponíveis"""
-        plugins = {}
+        """Descobre plugins pelos manifestos, sem executar o código deles"""
+        descriptors = {}
 
-        # Plugins internos
+        # Plugins internos: manifesto declarado na própria classe
         internal_plugins = [
             CodeFormatterPlugin,
             GitIntegrationPlugin,
             CodeMetricsPlugin,
             SnippetManagerPlugin
         ]
-
         for plugin_class in internal_plugins:
-            try:
-                plugin = plugin_class(
-                    self.ide)
-                plugins[plugin.info.name] = plugin
-            except Exception as e:
-                print(
-                    f"Erro ao carregar plugin interno {plugin_class.__name__}: {e}")
-
-        # Plugins externos
-        for file in os.listdir(self.plugins_dir):
-            if file.endswith(
-                    '.py') and not file.startswith('_'):
-                try:
-                    plugin_path = os.path.join(
-                        self.plugins_dir, file)
-                    spec = importlib.util.spec_from_file_location(
-                        file[:-3], plugin_path)
-                    module = importlib.util.module_from_spec(
-                        spec)
-                    spec.loader.exec_module(
-                        module)
+            descriptor = PluginDescriptor(
+                plugin_class.MANIFEST,
+                lambda plugin_class=plugin_class: plugin_class(self.ide))
+            descriptors[descriptor.name] = descriptor
 
-                    for attr_name in dir(
-                            module):
-                        attr = getattr(
-                            module, attr_name)
-                        if (inspect.isclass(attr) and
-                                issubclass(attr, PluginBase) and
-                                attr != PluginBase):
-                            plugin = attr(
-                                self.ide)
-                            plugins[plugin.info.name] = plugin
-
-                except Exception as e:
-                    print(
-                        f"Erro ao carregar plugin externo {file}: {e}")
+        # Plugins externos: <nome>.json ao lado de <nome>.py, ou
+        # <pasta>/plugin.json
+        try:
+            entries = sorted(os.listdir(self.plugins_dir))
+        except OSError:
+            entries = []
+        for file in entries:
+            path = os.path.join(self.plugins_dir, file)
+            if os.path.isdir(path):
+                manifest_path = os.path.join(path, "plugin.json")
+                if not os.path.isfile(manifest_path):
+                    continue
+                base_dir, default_main = path, "plugin.py"
+            elif file.endswith('.json') and file != "settings.json":
+                manifest_path = path
+                base_dir, default_main = self.plugins_dir, file[:-5] + ".py"
+            elif (file.endswith('.py') and not file.startswith('_') and
+                  not os.path.exists(path[:-3] + ".json")):
+                # Plugin antigo sem manifesto: precisa ser executado para ser
+                # conhecido, então continua carregando na inicialização
+                descriptor = PluginDescriptor(
+                    {'name': file, 'activationEvents': ['onStartup']},
+                    lambda path=path: self.load_plugin_module(path))
+                descriptors[descriptor.name] = descriptor
+                continue
+            else:
+                continue
+
+            manifest = self.read_manifest(manifest_path)
+            if manifest is None:
+                continue
+            module_path = os.path.join(base_dir, manifest.get('main', default_main))
+            descriptor = PluginDescriptor(manifest, None)
+            if descriptor.out_of_process:
+                descriptor.loader = (
+                    lambda descriptor=descriptor, module_path=module_path:
+                        RemotePlugin(self.ide.get_plugin_host(), descriptor,
+                                     module_path, self.plugin_module_name(module_path)))
+            else:
+                descriptor.loader = (
+                    lambda module_path=module_path, class_name=manifest.get('class'):
+                        self.load_plugin_module(module_path, class_name))
+            descriptors[descriptor.name] = descriptor
 
-        return plugins
+        disabled = set(self.load_settings().get('disabled', []))
+        for name in disabled & set(descriptors):
+            descriptors[name].enabled = False
+        return descriptors
 
     def load_plugins(self):
-        """Carrega todos os plugins"""
-        self.plugins = self.discover_plugins()
+        """Registra os plugins e ativa só os que pedem onStartup"""
+        self.descriptors = self.discover_plugins()
+        self.fire_event('onStartup')
+        lazy = sum(1 for d in self.descriptors.values()
+                   if d.enabled and not d.is_active and not d.failed)
+        print(f"🔌 {len(self.plugins)} plugin(s) ativo(s), {lazy} sob demanda")
+
+    def activate(self, name):
+        """Importa e inicializa o plugin (uma única vez); None se falhar"""
+        descriptor = self.descriptors.get(name)
+        if descriptor is None or not descriptor.enabled or descriptor.failed:
+            return None
+        if descriptor.plugin is not None:
+            return descriptor.plugin
 
-        for name, plugin in self.plugins.items():
-            try:
-                plugin.initialize()
-                print(
-                    f"✅ Plugin carregado: {name} v{plugin.info.version}")
-            except Exception as e:
-                print(
-                    f"❌ Erro ao inicializar plugin {name}: {e}")
+        try:
+            with startup_profiler.phase(f"plugin {name}", 'plugin'):
+                plugin = self.timed_call(name, "carregamento", descriptor.loader)
+                self.timed_call(name, "initialize", plugin.initialize)
+        except Exception as e:
+            descriptor.failed = True
+            print(
+                f"❌ Erro ao ativar plugin {name}: {e}")
+            return None
+
+        descriptor.plugin = plugin
+        self.plugins[name] = plugin
+        print(
+            f"✅ Plugin carregado: {plugin.info.name} v{plugin.info.version}")
+        return plugin
+
+    def fire_event(self, event):
+        """Ativa os plugins cujo manifesto declara o evento"""
+        for descriptor in list(self.descriptors.values()):
+            if event in descriptor.activation_events and not descriptor.is_active:
+                self.activate(descriptor.name)
+
+    def fire_file_opened(self, file_path):
+        """Dispara onLanguage:<linguagem> para o arquivo aberto"""
+        wanted = {event.split(':', 1)[1] for descriptor in self.descriptors.values()
+                  if not descriptor.is_active
+                  for event in descriptor.activation_events
+                  if event.startswith('onLanguage:')}
+        if not wanted:
+            return
+        extension = os.path.splitext(file_path)[1].lower()
+        for language in wanted:
+            syntax = language_syntax_manager.syntax_data.get(language, {})
+            if extension in syntax.get('extensions', []):
+                self.fire_event(f"onLanguage:{language}")
+
+    def run_command(self, name, command_id):
+        """Executa um comando do manifesto, ativando o plugin se preciso"""
+        plugin = self.activate(name)
+        if plugin is None:
+            return
+        handler = plugin.get_commands().get(command_id)
+        if handler is None:
+            print(f"❌ Plugin {name} não implementa o comando {command_id}")
+            return
+        self.timed_call(name, f"comando {command_id}", handler)
 
     def shutdown_plugins(self):
         """Finaliza todos os plugins de forma segura"""
@@ -243,7 +673,7 @@ class PluginManager:
             try:
                 if hasattr(
                         plugin, 'shutdown'):
-                    plugin.shutdown()
+                    self.timed_call(name, "shutdown", plugin.shutdown)
                 print(
                     f"✅ Plugin finalizado: {name}")
             except Exception as e:
@@ -254,14 +684,33 @@ class PluginManager:
         self.plugins.clear()
 
     def get_plugin_actions(self):
-        """Obtém todas as ações dos plugins"""
+        """Obtém as ações dos plugins.
+
+        Comandos do manifesto viram ações sem carregar o plugin; plugins já
+        ativos e sem comandos declarados contribuem com get_actions().
+        """
         actions = []
-        for plugin in self.plugins.values():
-            if plugin.info.enabled:
+        for descriptor in self.descriptors.values():
+            if not descriptor.enabled:
+                continue
+            if descriptor.commands:
+                actions.extend(
+                    self.command_action(descriptor.name, command)
+                    for command in descriptor.commands)
+            elif descriptor.plugin is not None and descriptor.plugin.info.enabled:
                 actions.extend(
-                    plugin.get_actions())
+                    self.wrap_action(descriptor.name, action)
+                    for action in descriptor.plugin.get_actions())
         return actions
 
+    def command_action(self, name, command):
+        """Ação de menu para um comando ({"id", "title"}) do plugin"""
+        action = QAction(command.get('title', command['id']), self.ide)
+        action.triggered.connect(
+            lambda _checked=False, command_id=command['id']:
+                self.run_command(name, command_id))
+        return action
+
     def install_plugin(self, plugin_path_or_url):
         """Instala um novo plugin"""
         try:
@@ -270,7 +719,7 @@ class PluginManager:
                 # Download de URL
                 temp_file = tempfile.NamedTemporaryFile(
                     delete=False, suffix='.zip')
-                urlretrieve(
+                urllib_request.urlretrieve(
                     plugin_path_or_url, temp_file.name)
                 plugin_path = temp_file.name
             else:
@@ -295,8 +744,428 @@ class PluginManager:
 
 # ===== PLUGINS INTERNOS =====
 
+class PluginHostContext:
+    """O `ide` visto por um plugin dentro do processo de plugins.
+
+    Não há widgets fora do processo do IDE: o plugin lê os documentos pelos
+    snapshots que o IDE envia e responde com diagnósticos e mensagens.
+    """
+
+    def __init__(self, host, plugin_name):
+        self.host = host
+        self.plugin_name = plugin_name
+
+    @property
+    def active_document(self):
+        """Caminho do arquivo na aba ativa do IDE (ou None)"""
+        return self.host.active_document
+
+    def documents(self):
+        return list(self.host.documents)
+
+    def get_document(self, file_path):
+        """Texto mais recente do documento enviado pelo IDE (ou None)"""
+        entry = self.host.documents.get(file_path)
+        return entry[1] if entry else None
+
+    def publish_diagnostics(self, file_path, diagnostics):
+        """Substitui os diagnósticos do plugin para o arquivo.
+
+        diagnostics: [{"line": <base 1>, "message": "...",
+                       "severity": "error" | "warning" | "info"}]
+        """
+        self.host.send({
+            'type': 'diagnostics',
+            'plugin': self.plugin_name,
+            'file_path': file_path,
+            'items': [
+                {'line': int(item.get('line', 1)),
+                 'message': str(item.get('message', '')),
+                 'severity': item.get('severity', 'warning')}
+                for item in diagnostics],
+        })
+
+    def show_message(self, text):
+        """Mensagem na barra de status do IDE"""
+        self.host.send({'type': 'message', 'plugin': self.plugin_name, 'text': str(text)})
+
+
+class PluginHost:
+    """Processo de plugins (`main.py --plugin-host`).
+
+    Protocolo: uma mensagem JSON por linha, comandos do IDE na entrada padrão
+    e respostas na saída padrão. Cada plugin tem sua própria thread, então um
+    comando demorado não atrasa os outros plugins nem a leitura do canal.
+
+    IDE -> host: load, unload, command, document, active_document,
+                 close_document, shutdown
+    host -> IDE: ready, loaded, error, result, diagnostics, message
+    """
+
+    def __init__(self, input_stream, output_stream):
+        self.input = input_stream
+        self.output = output_stream
+        self.write_lock = threading.Lock()
+        self.plugins = {}
+        self.executors = {}
+        self.documents = {}  # caminho -> (versão, texto)
+        self.active_document = None
+
+    def send(self, message):
+        data = (json.dumps(message) + "\n").encode('utf-8')
+        with self.write_lock:
+            self.output.write(data)
+            self.output.flush()
+
+    def run(self):
+        self.send({'type': 'ready', 'pid': os.getpid()})
+        for line in self.input:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                print(f"Mensagem inválida no processo de plugins: {line[:200]!r}")
+                continue
+            if message.get('type') == 'shutdown':
+                break
+            try:
+                self.handle(message)
+            except Exception:
+                traceback.print_exc()
+        self.shutdown()
+        return 0
+
+    def handle(self, message):
+        kind = message.get('type')
+        if kind == 'load':
+            self.submit(message['plugin'], self.load_plugin, message)
+        elif kind == 'unload':
+            self.unload_plugin(message['plugin'])
+        elif kind == 'command':
+            self.submit(message['plugin'], self.run_command, message)
+        elif kind == 'document':
+            file_path = message['file_path']
+            self.documents[file_path] = (message['version'], message['text'])
+            for name, plugin in list(self.plugins.items()):
+                if hasattr(plugin, 'on_document_changed'):
+                    self.submit(name, self.notify_document, name, file_path,
+                                message['version'])
+        elif kind == 'active_document':
+            self.active_document = message['file_path']
+        elif kind == 'close_document':
+            self.documents.pop(message['file_path'], None)
+            if self.active_document == message['file_path']:
+                self.active_document = None
+
+    def submit(self, name, func, *args):
+        """Executa na thread do plugin, preservando a ordem das mensagens"""
+        executor = self.executors.get(name)
+        if executor is None:
+            executor = self.executors[name] = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"plugin-{name}")
+        executor.submit(func, *args)
+
+    def load_plugin(self, message):
+        name = message['plugin']
+        try:
+            plugin_class = PluginManager.find_plugin_class(
+                message['module_path'], message['module_name'], message.get('class'))
+            plugin = plugin_class(PluginHostContext(self, name))
+            plugin.initialize()
+        except Exception as e:
+            traceback.print_exc()
+            self.send({'type': 'error', 'plugin': name, 'message': str(e)})
+            return
+        self.plugins[name] = plugin
+        self.send({'type': 'loaded', 'plugin': name,
+                   'commands': sorted(plugin.get_commands())})
+
+    def unload_plugin(self, name):
+        # Na thread do plugin, depois de um load que ainda esteja na fila
+        executor = self.executors.pop(name, None)
+        if executor is not None:
+            executor.submit(self.shutdown_plugin, name)
+            executor.shutdown(wait=False)
+
+    def shutdown_plugin(self, name):
+        plugin = self.plugins.pop(name, None)
+        if plugin is None:
+            return
+        try:
+            plugin.shutdown()
+        except Exception:
+            traceback.print_exc()
+
+    def run_command(self, message):
+        plugin = self.plugins.get(message['plugin'])
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        error = None
+        try:
+            if plugin is None:
+                raise RuntimeError("plugin não carregado")
+            handler = plugin.get_commands().get(message['command'])
+            if handler is None:
+                raise RuntimeError(f"comando desconhecido: {message['command']}")
+            handler()
+        except Exception as e:
+            traceback.print_exc()
+            error = str(e) or type(e).__name__
+        self.send({'type': 'result', 'id': message['id'], 'error': error,
+                   'wall_time': time.perf_counter() - wall_start,
+                   'cpu_time': time.thread_time() - cpu_start})
+
+    def notify_document(self, name, file_path, version):
+        entry = self.documents.get(file_path)
+        plugin = self.plugins.get(name)
+        # Versões intermediárias já substituídas são puladas
+        if entry is None or entry[0] != version or plugin is None:
+            return
+        try:
+            plugin.on_document_changed(file_path, entry[1])
+        except Exception:
+            traceback.print_exc()
+
+    def shutdown(self):
+        for name in list(self.executors):
+            self.unload_plugin(name)
+
+
+def run_plugin_host():
+    """Ponto de entrada do processo de plugins"""
+    output = sys.stdout.buffer
+    # print() dos plugins vai para stderr e não corrompe o protocolo
+    sys.stdout = sys.stderr
+    return PluginHost(sys.stdin.buffer, output).run()
+
+
+class RemotePlugin:
+    """Representa no IDE um plugin que roda no processo de plugins"""
+
+    def __init__(self, host, descriptor, module_path, module_name):
+        self.host = host
+        self.descriptor = descriptor
+        self.module_path = module_path
+        self.module_name = module_name
+        manifest = descriptor.manifest
+        self.info = PluginInfo(
+            name=descriptor.name,
+            version=manifest.get('version', ''),
+            author=manifest.get('author', ''),
+            description=manifest.get('description', ''))
+
+    def initialize(self):
+        self.host.load_plugin(
+            self.descriptor.name, self.module_path, self.module_name,
+            self.descriptor.manifest.get('class'))
+
+    def shutdown(self):
+        self.host.unload_plugin(self.descriptor.name)
+
+    def get_actions(self):
+        return []
+
+    def get_commands(self):
+        """Cada comando só envia a requisição; o resultado chega depois"""
+        return {
+            command['id']: (lambda command_id=command['id']:
+                            self.host.run_command(self.descriptor.name, command_id))
+            for command in self.descriptor.commands}
+
+
+class PluginHostClient(QObject):
+    """Lado do IDE do processo de plugins.
+
+    Envia mensagens sem esperar resposta e reinicia o processo se ele
+    cair, recarregando os plugins (com espera crescente entre tentativas).
+    """
+    # Espera antes de cada nova tentativa seguida de reinício
+    RESTART_DELAYS_MS = (500, 1000, 2000, 5000, 10000)
+    # Rodando por mais tempo que isso, a queda não conta como tentativa seguida
+    STABLE_RUN_S = 30
+
+    plugin_loaded = QSignal(str, list)  # plugin, ids dos comandos
+    plugin_failed = QSignal(str, str)
+    command_finished = QSignal(str, str, float, float, str)  # plugin, comando, parede, CPU, erro
+    diagnostics_received = QSignal(str, str, list)  # plugin, arquivo, itens
+    message_received = QSignal(str, str)
+    restarted = QSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.process = None
+        self.buffer = b''
+        self.outbox = []
+        self.loaded = {}  # plugin -> mensagem de load (reenviada ao reiniciar)
+        self.pending = {}  # id -> (plugin, comando)
+        self.next_request_id = 1
+        self.sent_versions = {}  # arquivo -> última versão enviada
+        self.crash_count = 0
+        self.started_at = 0.0
+        self.stopping = False
+        self.restart_timer = QTimer(self)
+        self.restart_timer.setSingleShot(True)
+        self.restart_timer.timeout.connect(self.start)
+
+    def start(self):
+        if self.stopping or (self.process is not None and
+                             self.process.state() != QProcess.NotRunning):
+            return
+        if self.process is not None:
+            self.process.deleteLater()
+        self.buffer = b''
+        self.process = QProcess(self)
+        self.process.readyReadStandardOutput.connect(self.on_stdout)
+        self.process.readyReadStandardError.connect(self.on_stderr)
+        self.process.started.connect(self.on_started)
+        self.process.finished.connect(self.on_finished)
+        self.process.errorOccurred.connect(self.on_error)
+        if getattr(sys, 'frozen', False):
+            self.process.start(sys.executable, ['--plugin-host'])
+        else:
+            self.process.start(sys.executable, [os.path.abspath(__file__), '--plugin-host'])
+
+    def is_running(self):
+        return self.process is not None and self.process.state() == QProcess.Running
+
+    def send(self, message):
+        if not self.is_running():
+            self.outbox.append(message)
+            return
+        self.process.write((json.dumps(message) + "\n").encode('utf-8'))
+
+    def on_started(self):
+        self.started_at = time.monotonic()
+        outbox, self.outbox = self.outbox, []
+        for message in outbox:
+            self.send(message)
+
+    # ===== API =====
+
+    def load_plugin(self, name, module_path, module_name, class_name=None):
+        message = {'type': 'load', 'plugin': name, 'module_path': module_path,
+                   'module_name': module_name, 'class': class_name}
+        self.loaded[name] = message
+        self.send(message)
+
+    def unload_plugin(self, name):
+        if self.loaded.pop(name, None) is not None:
+            self.send({'type': 'unload', 'plugin': name})
+
+    def run_command(self, name, command_id):
+        request_id = self.next_request_id
+        self.next_request_id += 1
+        self.pending[request_id] = (name, command_id)
+        self.send({'type': 'command', 'id': request_id, 'plugin': name,
+                   'command': command_id})
+        return request_id
+
+    def push_document(self, snapshot):
+        """Envia o BufferSnapshot se essa versão ainda não foi enviada"""
+        if self.sent_versions.get(snapshot.file_path) == snapshot.version:
+            return
+        self.sent_versions[snapshot.file_path] = snapshot.version
+        self.send({'type': 'document', 'file_path': snapshot.file_path,
+                   'version': snapshot.version, 'text': snapshot.text()})
+
+    def set_active_document(self, file_path):
+        self.send({'type': 'active_document', 'file_path': file_path})
+
+    def close_document(self, file_path):
+        if self.sent_versions.pop(file_path, None) is not None:
+            self.send({'type': 'close_document', 'file_path': file_path})
+
+    # ===== CANAL =====
+
+    def on_stdout(self):
+        self.buffer += bytes(self.process.readAllStandardOutput())
+        *lines, self.buffer = self.buffer.split(b'\n')
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                message = json.loads(line)
+            except ValueError:
+                # Saída de import antes do protocolo começar
+                print(f"[plugins] {line.decode('utf-8', 'replace')}")
+                continue
+            self.handle_message(message)
+
+    def on_stderr(self):
+        text = bytes(self.process.readAllStandardError()).decode('utf-8', 'replace')
+        for line in text.rstrip().splitlines():
+            print(f"[plugins] {line}")
+
+    def handle_message(self, message):
+        kind = message.get('type')
+        name = message.get('plugin', '')
+        if kind == 'loaded':
+            self.plugin_loaded.emit(name, message.get('commands', []))
+        elif kind == 'error':
+            self.loaded.pop(name, None)
+            self.plugin_failed.emit(name, message.get('message', ''))
+        elif kind == 'result':
+            plugin, command_id = self.pending.pop(message.get('id'), ('', ''))
+            self.command_finished.emit(
+                plugin, command_id, message.get('wall_time', 0.0),
+                message.get('cpu_time', 0.0), message.get('error') or '')
+        elif kind == 'diagnostics':
+            self.diagnostics_received.emit(
+                name, message.get('file_path', ''), message.get('items', []))
+        elif kind == 'message':
+            self.message_received.emit(name, message.get('text', ''))
+
+    # ===== QUEDAS E REINÍCIO =====
+
+    def on_error(self, error):
+        # Falha ao iniciar não emite finished
+        if error == QProcess.FailedToStart:
+            self.on_finished(-1, QProcess.CrashExit)
+
+    def on_finished(self, exit_code, exit_status):
+        for plugin, command_id in self.pending.values():
+            self.command_finished.emit(
+                plugin, command_id, 0.0, 0.0, "processo de plugins encerrado")
+        self.pending.clear()
+        self.sent_versions.clear()
+        if self.stopping:
+            return
+
+        if self.started_at and time.monotonic() - self.started_at > self.STABLE_RUN_S:
+            self.crash_count = 0
+        self.started_at = 0.0
+        if self.crash_count >= len(self.RESTART_DELAYS_MS):
+            self.message_received.emit(
+                '', "❌ Processo de plugins caiu repetidamente; reinício suspenso")
+            return
+        delay = self.RESTART_DELAYS_MS[self.crash_count]
+        self.crash_count += 1
+        print(f"⚠ Processo de plugins encerrado (código {exit_code}); "
+              f"reiniciando em {delay} ms")
+        # Plugins carregados voltam primeiro; documentos vêm via restarted
+        self.outbox = list(self.loaded.values())
+        self.restart_timer.start(delay)
+        self.restarted.emit()
+
+    def stop(self):
+        self.stopping = True
+        self.restart_timer.stop()
+        if not self.is_running():
+            return
+        self.send({'type': 'shutdown'})
+        self.process.closeWriteChannel()
+        if not self.process.waitForFinished(2000):
+            self.process.kill()
+            self.process.waitForFinished(1000)
+
+
 class CodeFormatterPlugin(PluginBase):
     """Plugin de formatação de código avançada"""
+    MANIFEST = {
+        'name': "Code Formatter",
+        'version': "1.1.0",
+        'activationEvents': ['onCommand:formatter.show'],
+        'commands': [{'id': 'formatter.show', 'title': "🚀 Formatador Avançado"}],
+    }
 
     def __init__(self, ide_instance):
         super().__init__(ide_instance)
@@ -329,6 +1198,9 @@ class CodeFormatterPlugin(PluginBase):
             "Ferramentas": self.get_actions()
         }
 
+    def get_commands(self):
+        return {'formatter.show': self.show_format_dialog}
+
     def show_format_dialog(self):
         """Mostra diálogo de formatação avançada"""
         dialog = FormatDialog(self.ide, self.formatters)
@@ -375,6 +1247,18 @@ class CodeFormatterPlugin(PluginBase):
 
 class GitIntegrationPlugin(PluginBase):
     """Integração com Git"""
+    MANIFEST = {
+        'name': "Git Integration",
+        'version': "1.0.0",
+        'activationEvents': ['onCommand:git.status', 'onCommand:git.commit',
+                             'onCommand:git.push', 'onCommand:git.pull'],
+        'commands': [
+            {'id': 'git.status', 'title': "📊 Status Git"},
+            {'id': 'git.commit', 'title': "🔄 Commit"},
+            {'id': 'git.push', 'title': "📤 Push"},
+            {'id': 'git.pull', 'title': "📥 Pull"},
+        ],
+    }
 
     def __init__(self, ide_instance):
         super().__init__(ide_instance)
@@ -406,6 +1290,14 @@ class GitIntegrationPlugin(PluginBase):
 
         return actions
 
+    def get_commands(self):
+        return {
+            'git.status': self.show_git_status,
+            'git.commit': self.show_commit_dialog,
+            'git.push': self.git_push,
+            'git.pull': self.git_pull,
+        }
+
     def show_git_status(self):
         """Mostra status do Git"""
         if not self.ide.project_path:
@@ -508,6 +1400,12 @@ class GitIntegrationPlugin(PluginBase):
 
 class CodeMetricsPlugin(PluginBase):
     """Plugin de métricas de código"""
+    MANIFEST = {
+        'name': "Code Metrics",
+        'version': "1.0.0",
+        'activationEvents': ['onCommand:metrics.analyze'],
+        'commands': [{'id': 'metrics.analyze', 'title': "📈 Métricas de Código"}],
+    }
 
     def __init__(self, ide_instance):
         super().__init__(ide_instance)
@@ -529,13 +1427,16 @@ class CodeMetricsPlugin(PluginBase):
         action.triggered.connect(self.analyze_metrics)
         return [action]
 
+    def get_commands(self):
+        return {'metrics.analyze': self.analyze_metrics}
+
     def analyze_metrics(self):
         """Analisa métricas do código atual"""
         editor = self.ide.get_current_editor()
         if not editor:
             return
 
-        code = editor.toPlainText()
+        code = editor.snapshot().text()
         metrics = self.calculate_metrics(code)
 
         dialog = MetricsDialog(self.ide, metrics)
@@ -577,6 +1478,15 @@ class CodeMetricsPlugin(PluginBase):
 
 class SnippetManagerPlugin(PluginBase):
     """Gerenciador de snippets de código"""
+    MANIFEST = {
+        'name': "Snippet Manager",
+        'version': "1.0.0",
+        'activationEvents': ['onCommand:snippets.save', 'onCommand:snippets.manage'],
+        'commands': [
+            {'id': 'snippets.save', 'title': "💾 Salvar Snippet"},
+            {'id': 'snippets.manage', 'title': "📋 Gerenciar Snippets"},
+        ],
+    }
 
     def __init__(self, ide_instance):
         super().__init__(ide_instance)
@@ -625,6 +1535,12 @@ class SnippetManagerPlugin(PluginBase):
 
         return actions
 
+    def get_commands(self):
+        return {
+            'snippets.save': self.save_current_snippet,
+            'snippets.manage': self.manage_snippets,
+        }
+
     def save_current_snippet(self):
         """Salva o código selecionado como snippet"""
         editor = self.ide.get_current_editor()
@@ -786,6 +1702,314 @@ class MetricsDialog(QDialog):
         self.setLayout(layout)
 
 
+class StallRecord:
+    """Travamentos agregados pela mesma pilha dominante"""
+
+    def __init__(self, stack):
+        self.stack = stack  # [(arquivo, linha, função)], de fora para dentro
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_seen = 0.0
+
+    def add(self, duration_ms, stack):
+        self.stack = stack
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.last_seen = time.time()
+
+    @staticmethod
+    def format_frame(frame):
+        filename, line, function = frame
+        return f"{function} ({os.path.basename(filename)}:{line})"
+
+    def location(self):
+        """Chamada mais interna do IDE e, se diferente, a mais interna de todas"""
+        own_file = os.path.abspath(__file__)
+        own = next((frame for frame in reversed(self.stack)
+                    if os.path.abspath(frame[0]) == own_file), None)
+        innermost = self.stack[-1]
+        if own is None or own == innermost:
+            return self.format_frame(innermost)
+        return f"{self.format_frame(own)} → {self.format_frame(innermost)}"
+
+
+class EventLoopWatchdog:
+    """Detecta travamentos do loop de eventos da GUI.
+
+    Um QTimer na thread principal registra batimentos; uma thread de vigia
+    percebe quando eles param por mais de STALL_MS e amostra a pilha Python
+    da thread principal (sys._current_frames) até o loop voltar. Cada
+    travamento é agregado pela pilha mais amostrada e gravado em LOG_FILE.
+    """
+    HEARTBEAT_MS = 20
+    STALL_MS = 100
+    SAMPLE_INTERVAL_S = 0.01
+    MAX_STACK_DEPTH = 40
+    LOG_FILE = os.path.join(CACHE_DIR, "stalls.log")
+
+    def __init__(self, parent=None):
+        self.main_thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self.timer = QTimer(parent)
+        self.timer.setInterval(self.HEARTBEAT_MS)
+        self.timer.timeout.connect(self.beat)
+        self.lock = threading.Lock()
+        self.records: Dict[tuple, StallRecord] = {}
+        self.running = False
+        self.thread = None
+
+    def beat(self):
+        self.last_beat = time.monotonic()
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.beat()
+        self.timer.start()
+        self.thread = threading.Thread(
+            target=self.run, name="event-loop-watchdog", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        self.timer.stop()
+
+    def sample_main_thread(self):
+        frame = sys._current_frames().get(self.main_thread_id)
+        stack = []
+        while frame is not None and len(stack) < self.MAX_STACK_DEPTH:
+            stack.append((frame.f_code.co_filename, frame.f_lineno,
+                          frame.f_code.co_name))
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+    def run(self):
+        while self.running:
+            time.sleep(self.SAMPLE_INTERVAL_S)
+            last_beat = self.last_beat
+            if (time.monotonic() - last_beat) * 1000 < self.STALL_MS:
+                continue
+
+            # Loop parado: amostra a pilha até o próximo batimento
+            samples = Counter()
+            while self.running and self.last_beat == last_beat:
+                stack = self.sample_main_thread()
+                if stack:
+                    samples[stack] += 1
+                time.sleep(self.SAMPLE_INTERVAL_S)
+            if self.running and samples:
+                self.record_stall((self.last_beat - last_beat) * 1000, samples)
+
+    def record_stall(self, duration_ms, samples):
+        stack, hits = samples.most_common(1)[0]
+        # Agrupa por sequência de funções, sem depender das linhas exatas
+        key = tuple((filename, function) for filename, _line, function in stack)
+        with self.lock:
+            record = self.records.get(key)
+            if record is None:
+                record = self.records[key] = StallRecord(stack)
+            record.add(duration_ms, stack)
+
+        total = sum(samples.values())
+        print(f"⚠ Interface travada por {duration_ms:.0f} ms em {record.location()}")
+        try:
+            os.makedirs(os.path.dirname(self.LOG_FILE), exist_ok=True)
+            with open(self.LOG_FILE, 'a', encoding='utf-8') as f:
+                f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')}  {duration_ms:.0f} ms  "
+                        f"({total} amostras, {hits * 100 // total}% nesta pilha)\n")
+                f.writelines(f"    {filename}:{line} {function}\n"
+                             for filename, line, function in stack)
+                f.write("\n")
+        except OSError as e:
+            print(f"Erro ao gravar log de travamentos: {e}")
+
+    def snapshot(self):
+        """Cópia dos registros, do maior tempo total para o menor"""
+        with self.lock:
+            return sorted(self.records.values(),
+                          key=lambda record: record.total_ms, reverse=True)
+
+    def clear(self):
+        with self.lock:
+            self.records.clear()
+
+    def report_text(self):
+        """Relatório agregado em texto, para anexar a um bug"""
+        lines = [f"Travamentos do loop de eventos (> {self.STALL_MS} ms)", ""]
+        for record in self.snapshot():
+            lines.append(f"{record.count}x, total {record.total_ms:.0f} ms, "
+                         f"máximo {record.max_ms:.0f} ms — {record.location()}")
+            lines.extend(f"    {filename}:{line} {function}"
+                         for filename, line, function in record.stack)
+            lines.append("")
+        return "\n".join(lines)
+
+
+class PluginPerformanceDialog(QDialog):
+    """Tempos por plugin medidos pelo PluginManager"""
+    COLUMNS = ["Plugin", "Estado", "Chamadas", "Tempo total (ms)",
+               "CPU (ms)", "Máximo (ms)", "Lentas", "Última lenta"]
+
+    def __init__(self, parent, plugin_manager):
+        super().__init__(parent)
+        self.plugin_manager = plugin_manager
+        self.setup_ui()
+        self.refresh()
+
+    def setup_ui(self):
+        self.setWindowTitle("📊 Desempenho de Plugins")
+        self.resize(820, 360)
+
+        layout = QVBoxLayout()
+
+        self.info_label = QLabel(
+            f"Chamadas acima de {PluginManager.SLOW_CALLBACK_MS} ms bloqueiam a "
+            "interface e são contadas como lentas.")
+        layout.addWidget(self.info_label)
+
+        self.table = QTableWidget()
+        self.table.setColumnCount(len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSortingEnabled(True)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        refresh_btn = QPushButton("🔄 Atualizar")
+        refresh_btn.clicked.connect(self.refresh)
+        close_btn = QPushButton("Fechar")
+        close_btn.clicked.connect(self.accept)
+        buttons.addWidget(refresh_btn)
+        buttons.addStretch()
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+
+        self.setLayout(layout)
+
+    def refresh(self):
+        manager = self.plugin_manager
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(manager.descriptors))
+        for row, (name, descriptor) in enumerate(sorted(manager.descriptors.items())):
+            stats = manager.stats.get(name, PluginStats())
+            if not descriptor.enabled:
+                state = "desativado"
+            elif descriptor.failed:
+                state = "erro"
+            elif descriptor.is_active:
+                state = "ativo"
+            else:
+                state = "sob demanda"
+            values = [name, state, stats.calls, stats.wall_time * 1000,
+                      stats.cpu_time * 1000, stats.max_wall_time * 1000,
+                      stats.slow_calls, stats.last_slow]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem()
+                if isinstance(value, float):
+                    item.setData(Qt.DisplayRole, round(value, 1))
+                else:
+                    item.setData(Qt.DisplayRole, value)
+                if column == 6 and stats.slow_calls:
+                    item.setForeground(QColor("#f48771"))
+                self.table.setItem(row, column, item)
+        self.table.setSortingEnabled(True)
+        self.table.resizeColumnsToContents()
+
+
+class StallReportDialog(QDialog):
+    """Travamentos da interface agregados pelo EventLoopWatchdog"""
+    COLUMNS = ["Ocorrências", "Total (ms)", "Máximo (ms)", "Última", "Local"]
+
+    def __init__(self, parent, watchdog):
+        super().__init__(parent)
+        self.watchdog = watchdog
+        self.records = []
+        self.setup_ui()
+        self.refresh()
+
+    def setup_ui(self):
+        self.setWindowTitle("🐢 Travamentos da Interface")
+        self.resize(900, 520)
+
+        layout = QVBoxLayout()
+
+        info_label = QLabel(
+            f"Períodos acima de {EventLoopWatchdog.STALL_MS} ms sem processar "
+            f"eventos. Log completo: {EventLoopWatchdog.LOG_FILE}")
+        info_label.setWordWrap(True)
+        layout.addWidget(info_label)
+
+        splitter = QSplitter(Qt.Vertical)
+        self.table = QTableWidget()
+        self.table.setColumnCount(len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSortingEnabled(True)
+        self.table.itemSelectionChanged.connect(self.show_stack)
+        splitter.addWidget(self.table)
+
+        self.stack_view = QPlainTextEdit()
+        self.stack_view.setReadOnly(True)
+        self.stack_view.setFont(QFont("Monospace", 9))
+        splitter.addWidget(self.stack_view)
+        layout.addWidget(splitter)
+
+        buttons = QHBoxLayout()
+        refresh_btn = QPushButton("🔄 Atualizar")
+        refresh_btn.clicked.connect(self.refresh)
+        copy_btn = QPushButton("📋 Copiar Relatório")
+        copy_btn.clicked.connect(
+            lambda: QApplication.clipboard().setText(self.watchdog.report_text()))
+        clear_btn = QPushButton("🗑 Limpar")
+        clear_btn.clicked.connect(self.clear)
+        close_btn = QPushButton("Fechar")
+        close_btn.clicked.connect(self.accept)
+        buttons.addWidget(refresh_btn)
+        buttons.addWidget(copy_btn)
+        buttons.addWidget(clear_btn)
+        buttons.addStretch()
+        buttons.addWidget(close_btn)
+        layout.addLayout(buttons)
+
+        self.setLayout(layout)
+
+    def refresh(self):
+        self.records = self.watchdog.snapshot()
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(self.records))
+        for row, record in enumerate(self.records):
+            values = [record.count, round(record.total_ms, 1), round(record.max_ms, 1),
+                      time.strftime('%H:%M:%S', time.localtime(record.last_seen)),
+                      record.location()]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem()
+                item.setData(Qt.DisplayRole, value)
+                # Índice do registro, estável mesmo com a tabela ordenada
+                item.setData(Qt.UserRole, row)
+                self.table.setItem(row, column, item)
+        self.table.setSortingEnabled(True)
+        self.table.resizeColumnsToContents()
+        self.stack_view.clear()
+
+    def show_stack(self):
+        items = self.table.selectedItems()
+        if not items:
+            return
+        record = self.records[items[0].data(Qt.UserRole)]
+        self.stack_view.setPlainText("\n".join(
+            f"{filename}:{line} {function}"
+            for filename, line, function in record.stack))
+
+    def clear(self):
+        self.watchdog.clear()
+        self.refresh()
+
+
 class SnippetManagerDialog(QDialog):
     def __init__(self, parent, snippets):
         super().__init__(parent)
@@ -1103,13 +2327,14 @@ class PythonVersionManager:
     """Gerenciador de versões Python instaladas e para download"""
 
     def __init__(self):
+        # A varredura (um subprocesso por interpretador) não roda mais no
+        # construtor: o IDE a agenda em background após a primeira pintura
         self.installed_versions = []
         self.available_versions = []
-        self.scan_installed_versions()
 
     def scan_installed_versions(self):
         """Detecta versões Python instaladas no sistema"""
-        self.installed_versions = []
+        installed_versions = []
 
         # Locais comuns de instalação
         search_paths = []
@@ -1146,7 +2371,7 @@ class PythonVersionManager:
                         )
                         if result.returncode == 0:
                             version = result.stdout.strip()
-                            self.installed_versions.append({
+                            installed_versions.append({
                                 'path': python_path,
                                 'version': version,
                                 'type': 'system'
@@ -1157,7 +2382,7 @@ class PythonVersionManager:
         # Remove duplicatas
         seen = set()
         unique_versions = []
-        for v in self.installed_versions:
+        for v in installed_versions:
             key = v['path']
             if key not in seen:
                 seen.add(key)
@@ -1383,14 +2608,201 @@ class PythonVersionDialog(QDialog):
 
 # ===== LOCALIZADOR DE TEXTOS SIMILARES APRIMORADO =====
 
+def replace_in_text(text, regex, replacement):
+    """Substitui todas as ocorrências por texto literal; retorna (novo, quantidade)"""
+    return regex.subn(lambda _match: replacement, text)
+
+
+def replace_in_lines(text, regex, replacement, line_numbers=None):
+    """Como replace_in_text, mas linha a linha, do mesmo jeito que a busca
+    em arquivos casa (^, $ e \\s+ não atravessam quebras de linha).
+
+    Assim como search_file_contents, só '\\n' quebra linha; o '\\r' de um
+    CRLF fica fora do conteúdo e é preservado. line_numbers (base 1), se
+    informado, limita a substituição às linhas escolhidas na prévia.
+    """
+    lines = text.split('\n')
+    total = 0
+    for index, line in enumerate(lines):
+        if line_numbers is not None and index + 1 not in line_numbers:
+            continue
+        ending = '\r' if line.endswith('\r') else ''
+        content = line[:len(line) - len(ending)]
+        new_content, count = regex.subn(lambda _match: replacement, content)
+        if count:
+            lines[index] = new_content + ending
+            total += count
+    return '\n'.join(lines), total
+
+
+def preview_line_replacements(text, regex, replacement):
+    """Linhas que replace_in_lines alteraria: [(linha, antes, depois)]"""
+    preview = []
+    for number, line in enumerate(text.split('\n'), 1):
+        content = line[:-1] if line.endswith('\r') else line
+        new_content, count = regex.subn(lambda _match: replacement, content)
+        if count:
+            preview.append((number, content, new_content))
+    return preview
+
+
+def common_prefix_length(a, b):
+    """Tamanho do prefixo comum, comparando fatias (em C) por busca binária"""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[low:middle] == b[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+# Caracteres fora do BMP: ocupam duas unidades UTF-16 no QTextDocument
+ASTRAL_CHARS = re.compile('[\U00010000-\U0010FFFF]')
+
+
+class Utf16Offsets:
+    """Converte índices de str do Python em posições do QTextDocument,
+    que conta unidades UTF-16 (emoji e outros caracteres fora do BMP valem 2)"""
+
+    def __init__(self, text):
+        self.astral = [match.start() for match in ASTRAL_CHARS.finditer(text)]
+        # Posição UTF-16 logo após cada caractere fora do BMP
+        self.astral_ends = [index + order + 2 for order, index in enumerate(self.astral)]
+
+    def to_document(self, index):
+        if not self.astral:
+            return index
+        return index + bisect.bisect_left(self.astral, index)
+
+    def from_document(self, position):
+        if not self.astral:
+            return position
+        return position - bisect.bisect_right(self.astral_ends, position)
+
+
+def apply_text_minimal_edit(editor, new_text, old_text=None):
+    """Troca o conteúdo do editor editando só o trecho que mudou, em um único passo de desfazer"""
+    if old_text is None:
+        old_text = editor.toPlainText()
+    if new_text == old_text:
+        return
+
+    prefix = common_prefix_length(old_text, new_text)
+    max_suffix = min(len(old_text), len(new_text)) - prefix
+    suffix = common_prefix_length(old_text[::-1][:max_suffix], new_text[::-1][:max_suffix])
+
+    offsets = Utf16Offsets(old_text)
+    cursor = QTextCursor(editor.document())
+    cursor.beginEditBlock()
+    cursor.setPosition(offsets.to_document(prefix))
+    cursor.setPosition(offsets.to_document(len(old_text) - suffix), QTextCursor.KeepAnchor)
+    cursor.insertText(new_text[prefix:len(new_text) - suffix])
+    cursor.endEditBlock()
+
+
+class TextSearchWorker(QThread):
+    """Busca em um BufferSnapshot fora da thread da GUI"""
+    search_finished = QSignal(int, list, int)  # geração, ocorrências, total
+    search_failed = QSignal(int, str)
+    MAX_RESULTS = 5000
+    _detached = set()  # buscas abandonadas que ainda estão rodando
+
+    def __init__(self, generation, snapshot, pattern, flags):
+        super().__init__()
+        self.generation = generation
+        self.snapshot = snapshot
+        self.pattern = pattern
+        self.flags = flags
+        self._is_running = True
+
+    def detach(self):
+        """Abandona a busca sem bloquear a GUI.
+
+        O finditer só verifica a flag entre ocorrências, então um regex lento
+        pode demorar a devolver o controle; a referência fica viva até a
+        thread terminar e o objeto é liberado com deleteLater.
+        """
+        self._is_running = False
+        TextSearchWorker._detached.add(self)
+        self.finished.connect(self._release)
+        if not self.isRunning():
+            self._release()
+
+    def _release(self):
+        TextSearchWorker._detached.discard(self)
+        self.deleteLater()
+
+    def run(self):
+        try:
+            regex = re.compile(self.pattern, self.flags)
+        except re.error as e:
+            self.search_failed.emit(self.generation, str(e))
+            return
+
+        text = self.snapshot.text()
+        line_starts = self.snapshot.line_starts()
+        offsets = self.snapshot.utf16_offsets()
+        matches = []
+        total = 0
+        for match in regex.finditer(text):
+            if not self._is_running:
+                return
+            if match.start() == match.end():
+                continue
+            total += 1
+            if len(matches) >= self.MAX_RESULTS:
+                continue
+
+            start_pos = match.start()
+            end_pos = match.end()
+            line_index = bisect.bisect_right(line_starts, start_pos) - 1
+            line_start = line_starts[line_index]
+            line_end = (line_starts[line_index + 1] - 1
+                        if line_index + 1 < len(line_starts) else len(text))
+            line_text = text[line_start:line_end]
+
+            # Trecho ao redor da ocorrência para a visualização
+            preview_start = max(0, start_pos - line_start - 20)
+            preview_end = min(len(line_text), end_pos - line_start + 20)
+            preview_text = line_text[preview_start:preview_end]
+            if preview_start > 0:
+                preview_text = "..." + preview_text
+            if preview_end < len(line_text):
+                preview_text = preview_text + "..."
+
+            # 'start'/'end' em posições do documento (UTF-16), prontas para o cursor
+            matches.append({
+                'start': offsets.to_document(start_pos),
+                'end': offsets.to_document(end_pos),
+                'line': line_index + 1,
+                'preview': preview_text,
+                'matched_text': match.group()
+            })
+
+        if self._is_running:
+            self.search_finished.emit(self.generation, matches, total)
+
+
 class AdvancedFindSimilarDialog(QDialog):
+    PAGE_SIZE = 500
+
     def __init__(self, editor, parent=None):
         super().__init__(parent)
         self.editor = editor
         self.current_match_index = 0
         self.all_matches = []
+        self.total_matches = 0
+        self.search_worker = None
+        self.search_generation = 0
         self.setWindowTitle("🔍 Localizador de Textos Similares")
         self.setGeometry(400, 300, 700, 500)
+
+        # Debounce: a busca roda após uma pausa na digitação
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self.perform_search)
         self.setup_ui()
 
     def setup_ui(self):
@@ -1425,6 +2837,9 @@ class AdvancedFindSimilarDialog(QDialog):
         self.regex_mode = QCheckBox("Usar expressões regulares")
         options_layout.addWidget(self.regex_mode)
 
+        for checkbox in (self.case_sensitive, self.whole_word, self.regex_mode):
+            checkbox.stateChanged.connect(self.on_search_text_changed)
+
         search_layout.addLayout(options_layout)
         search_group.setLayout(search_layout)
         layout.addWidget(search_group)
@@ -1462,6 +2877,11 @@ class AdvancedFindSimilarDialog(QDialog):
             self.select_all_matches)
         nav_layout.addWidget(self.select_all_btn)
 
+        self.load_more_btn = QPushButton("Mostrar mais")
+        self.load_more_btn.clicked.connect(self.load_next_page)
+        self.load_more_btn.setVisible(False)
+        nav_layout.addWidget(self.load_more_btn)
+
         results_layout.addLayout(nav_layout)
         results_group.setLayout(results_layout)
         layout.addWidget(results_group)
@@ -1487,96 +2907,90 @@ class AdvancedFindSimilarDialog(QDialog):
         self.setLayout(layout)
 
     def on_search_text_changed(self):
-        """Executa busca quando o texto muda"""
+        """Agenda a busca quando o texto ou as opções mudam"""
         search_text = self.search_input.text().strip()
         if len(search_text) >= 1:  # Busca a partir de 1 caractere
-            self.perform_search()
+            self.search_timer.start(200)
         else:
+            self.search_timer.stop()
+            self.cancel_search()
             self.clear_results()
 
+    def build_pattern(self, search_text):
+        """Monta (padrão, flags) conforme as opções marcadas"""
+        flags = 0 if self.case_sensitive.isChecked() else re.IGNORECASE
+
+        if self.regex_mode.isChecked():
+            pattern = search_text
+        else:
+            pattern = re.escape(search_text)
+        if self.whole_word.isChecked() and not self.regex_mode.isChecked():
+            pattern = r'\b' + pattern + r'\b'
+        return pattern, flags
+
+    def cancel_search(self):
+        # Resultados tardios são descartados pela geração da busca
+        if self.search_worker:
+            self.search_worker.detach()
+        self.search_worker = None
+
     def perform_search(self):
-        """Executa a busca com as configurações atuais"""
+        """Executa a busca em background sobre um snapshot do buffer"""
         search_text = self.search_input.text().strip()
         if not search_text:
             return
 
-        full_text = self.editor.toPlainText()
-        self.all_matches = []
-        self.current_match_index = 0
-
-        # Prepara padrão de busca
-        pattern = search_text
-        flags = 0
-
-        if self.case_sensitive.isChecked():
-            flags = re.IGNORECASE if not self.case_sensitive.isChecked() else 0
-
-        if self.whole_word.isChecked() and not self.regex_mode.isChecked():
-            pattern = r'\b' + \
-                      re.escape(search_text) + r'\b'
-        elif not self.regex_mode.isChecked():
-            pattern = re.escape(search_text)
+        self.cancel_search()
+        self.search_generation += 1
+        pattern, flags = self.build_pattern(search_text)
 
+        # Destaca todas as ocorrências no editor (visíveis primeiro)
         try:
-            if self.regex_mode.isChecked():
-                regex = re.compile(
-                    pattern, flags)
-            else:
-                regex = re.compile(
-                    pattern, flags)
-
-            # Encontra todas as ocorrências
-            for match in regex.finditer(full_text):
-                start_pos = match.start()
-                end_pos = match.end()
-
-                # Encontra a linha
-                line_start = full_text.rfind(
-                    '\n', 0, start_pos) + 1
-                line_end = full_text.find(
-                    '\n', start_pos)
-                if line_end == -1:
-                    line_end = len(
-                        full_text)
-
-                line_text = full_text[line_start:line_end]
-                line_num = full_text.count(
-                    '\n', 0, line_start) + 1
-
-                # Destaca o texto
-                # encontrado na
-                # visualização
-                preview_start = max(
-                    0, start_pos - line_start - 20)
-                preview_end = min(
-                    len(line_text), end_pos - line_start + 20)
-                preview_text = line_text[preview_start:preview_end]
-
-                # Adiciona ellipsis se
-                # necessário
-                if preview_start > 0:
-                    preview_text = "..." + preview_text
-                if preview_end < len(
-                        line_text):
-                    preview_text = preview_text + "..."
-
-                self.all_matches.append({
-                    'start': start_pos,
-                    'end': end_pos,
-                    'line': line_num,
-                    'preview': preview_text,
-                    'matched_text': match.group()
-                })
+            self.editor.search_highlight.set_regex(re.compile(pattern, flags))
+        except re.error:
+            self.editor.search_highlight.clear()
+
+        self.results_count.setText("⏳ Buscando...")
+        self.search_worker = TextSearchWorker(
+            self.search_generation, self.editor.snapshot(), pattern, flags)
+        self.search_worker.search_finished.connect(self.on_search_finished)
+        self.search_worker.search_failed.connect(self.on_search_failed)
+        self.search_worker.start()
+
+    def on_search_finished(self, generation, matches, total):
+        # Ignora resultados de buscas já substituídas
+        if generation != self.search_generation:
+            return
+        # Buffer mudou durante a busca: offsets não valem mais
+        if self.search_worker and self.search_worker.snapshot.is_stale():
+            self.perform_search()
+            return
+        self.all_matches = matches
+        self.total_matches = total
+        self.current_match_index = 0
+        self.update_results_display()
 
-            self.update_results_display()
+    def on_search_failed(self, generation, message):
+        if generation != self.search_generation:
+            return
+        self.clear_results()
+        self.results_count.setText(
+            f"❌ Erro na expressão regular: {message}")
 
-        except re.error as e:
-            self.results_count.setText(
-                f"❌ Erro na expressão regular: {str(e)}")
-            self.clear_results()
+    def add_result_item(self, match):
+        self.results_list.addItem(
+            QListWidgetItem(f"Linha {match['line']}: {match['preview']}"))
+
+    def load_next_page(self):
+        """Adiciona a próxima página de resultados à lista"""
+        loaded = self.results_list.count()
+        for match in self.all_matches[loaded:loaded + self.PAGE_SIZE]:
+            self.add_result_item(match)
+        self.load_more_btn.setVisible(
+            self.results_list.count() < len(self.all_matches))
 
     def update_results_display(self):
-        """Atualiza a exibição dos resultados"""
+        """Preenche a lista com a primeira página de resultados"""
         self.results_list.clear()
 
         if not self.all_matches:
@@ -1586,32 +3000,30 @@ class AdvancedFindSimilarDialog(QDialog):
             self.next_btn.setEnabled(False)
             self.replace_btn.setEnabled(False)
             self.replace_all_btn.setEnabled(False)
+            self.load_more_btn.setVisible(False)
             return
 
-        # Preenche a lista
-        for i, match in enumerate(self.all_matches):
-            item_text = f"Linha {match['line']}: {match['preview']}"
-            item = QListWidgetItem(item_text)
-            if i == self.current_match_index:
-                item.setBackground(
-                    QColor(86, 156, 214))
-                item.setForeground(
-                    QColor(255, 255, 255))
-            self.results_list.addItem(item)
-
-        # Atualiza contador e navegação
-        self.results_count.setText(
-            f"Encontrados {len(self.all_matches)} resultados • Atual: {self.current_match_index + 1}")
+        self.load_next_page()
         self.prev_btn.setEnabled(len(self.all_matches) > 1)
         self.next_btn.setEnabled(len(self.all_matches) > 1)
         self.replace_btn.setEnabled(True)
         self.replace_all_btn.setEnabled(True)
+        self.show_current_match()
 
-        # Rola para o item atual
-        if self.all_matches:
-            self.results_list.setCurrentRow(
-                self.current_match_index)
-            self.highlight_current_match()
+    def show_current_match(self):
+        """Atualiza contador, item selecionado e seleção no editor"""
+        while (self.current_match_index >= self.results_list.count()
+               and self.results_list.count() < len(self.all_matches)):
+            self.load_next_page()
+
+        capped = ""
+        if self.total_matches > len(self.all_matches):
+            capped = f" (exibindo os primeiros {len(self.all_matches)})"
+        self.results_count.setText(
+            f"Encontrados {self.total_matches} resultados{capped} • Atual: {self.current_match_index + 1}")
+
+        self.results_list.setCurrentRow(self.current_match_index)
+        self.highlight_current_match()
 
     def highlight_current_match(self):
         """Destaca a ocorrência atual no editor"""
@@ -1636,38 +3048,35 @@ class AdvancedFindSimilarDialog(QDialog):
         if self.all_matches:
             self.current_match_index = (
                                                self.current_match_index + 1) % len(self.all_matches)
-            self.update_results_display()
+            self.show_current_match()
 
     def previous_match(self):
         """Vai para a ocorrência anterior"""
         if self.all_matches:
             self.current_match_index = (
                                                self.current_match_index - 1) % len(self.all_matches)
-            self.update_results_display()
+            self.show_current_match()
 
     def go_to_match(self, item):
         """Vai para a ocorrência clicada na lista"""
         row = self.results_list.row(item)
         if 0 <= row < len(self.all_matches):
             self.current_match_index = row
-            self.update_results_display()
+            self.show_current_match()
 
     def select_all_matches(self):
-        """Seleciona todas as ocorrências no editor"""
+        """Destaca todas as ocorrências no editor e seleciona a primeira"""
         if not self.all_matches:
             return
 
-        cursor = self.editor.textCursor()
-        cursor.setPosition(self.all_matches[0]['start'])
-
-        for match in self.all_matches[1:]:
-            cursor.setPosition(
-                match['start'], QTextCursor.KeepAnchor)
+        pattern, flags = self.build_pattern(self.search_input.text().strip())
+        try:
+            self.editor.search_highlight.set_regex(re.compile(pattern, flags))
+        except re.error:
+            return
 
-        cursor.setPosition(
-            self.all_matches[-1]['end'], QTextCursor.KeepAnchor)
-        self.editor.setTextCursor(cursor)
-        self.editor.setFocus()
+        self.current_match_index = 0
+        self.show_current_match()
 
     def replace_current(self):
         """Substitui a ocorrência atual"""
@@ -1682,10 +3091,12 @@ class AdvancedFindSimilarDialog(QDialog):
 
             # Substitui no texto
             cursor = self.editor.textCursor()
+            cursor.beginEditBlock()
             cursor.setPosition(match['start'])
             cursor.setPosition(
                 match['end'], QTextCursor.KeepAnchor)
             cursor.insertText(new_text)
+            cursor.endEditBlock()
 
             # Atualiza a busca
             self.perform_search()
@@ -1698,34 +3109,43 @@ class AdvancedFindSimilarDialog(QDialog):
         new_text, ok = QInputDialog.getText(
             self, "Substituir Todos", "Substituir por:")
         if ok and new_text is not None:
-            # Ordena por posição (decrescente) para
-            # evitar problemas com índices
-            sorted_matches = sorted(
-                self.all_matches, key=lambda x: x['start'], reverse=True)
-
-            cursor = self.editor.textCursor()
+            pattern, flags = self.build_pattern(
+                self.search_input.text().strip())
+            try:
+                regex = re.compile(pattern, flags)
+            except re.error as e:
+                self.results_count.setText(
+                    f"❌ Erro na expressão regular: {str(e)}")
+                return
 
-            for match in sorted_matches:
-                cursor.setPosition(
-                    match['start'])
-                cursor.setPosition(
-                    match['end'], QTextCursor.KeepAnchor)
-                cursor.insertText(
-                    new_text)
+            # Monta o novo texto de uma vez e aplica só o trecho alterado,
+            # em um único bloco de edição (um passo de desfazer)
+            old_text = self.editor.snapshot().text()
+            replaced_text, count = replace_in_text(old_text, regex, new_text)
+            apply_text_minimal_edit(self.editor, replaced_text, old_text)
 
             # Atualiza a busca
             self.perform_search()
+            self.results_count.setText(f"✅ {count} ocorrência(s) substituída(s)")
 
     def clear_results(self):
         """Limpa os resultados"""
         self.all_matches = []
+        self.total_matches = 0
         self.current_match_index = 0
         self.results_list.clear()
+        self.load_more_btn.setVisible(False)
         self.prev_btn.setEnabled(False)
         self.next_btn.setEnabled(False)
         self.replace_btn.setEnabled(False)
         self.replace_all_btn.setEnabled(False)
 
+    def closeEvent(self, event):
+        self.search_timer.stop()
+        self.cancel_search()
+        self.editor.search_highlight.clear()
+        super().closeEvent(event)
+
 
 # ===== SISTEMA DE TEMAS FUNCIONAL =====
 
@@ -2259,10 +3679,17 @@ class LanguageSyntaxManager:
     """Gerenciador de sintaxe para múltiplas linguagens"""
 
     def __init__(self):
-        self.syntax_data = {}
+        self._syntax_data = None
         self.syntax_path = os.path.join(
             os.path.expanduser("~"), ".py_dragon_syntax")
-        self.load_all_syntax()
+
+    @property
+    def syntax_data(self):
+        """Definições de sintaxe, montadas no primeiro acesso"""
+        if self._syntax_data is None:
+            self._syntax_data = {}
+            self.load_all_syntax()
+        return self._syntax_data
 
     def load_all_syntax(self):
         """Carrega todos os arquivos de sintaxe"""
@@ -2809,14 +4236,18 @@ language_syntax_manager = LanguageSyntaxManager()
 # ===== SISTEMA DE CACHE DE MÓDULOS =====
 
 class ModuleCacheManager:
-    """Gerenciador de cache para módulos e métodos"""
+    """Gerenciador de cache para módulos e métodos.
+
+    As entradas ficam válidas até que o FileWatcherService informe uma
+    mudança em um dos arquivos de origem (invalidate_file).
+    """
 
     def __init__(self):
         self._cache_lock = threading.RLock()
         self._module_cache: Dict[str, Dict[str, Any]] = {}
         self._project_modules: Dict[str, Set[str]] = {}
-        self._last_scan_time: Dict[str, float] = {}
-        self._scan_interval = 5.0
+        # Arquivo de origem -> chaves de cache que dependem dele
+        self._key_sources: Dict[str, Set[str]] = {}
         self._chain_cache: Dict[str, Set[str]] = {}
         self._preload_done = False
 
@@ -2831,20 +4262,17 @@ class ModuleCacheManager:
             print(
                 "🔄 Preloading todos os módulos do projeto...")
 
-            # Encontra todos os .py no projeto
-            py_files = []
-            for root, dirs, files in os.walk(
-                    project_path):
-                for file in files:
-                    if file.endswith(
-                            '.py') and not file.startswith('__'):
-                        py_files.append(
-                            os.path.join(root, file))
+            # Encontra todos os .py no projeto (sem venvs, .git, etc.)
+            py_files = [
+                file_path for file_path, _size in
+                ProjectWalker.shared(project_path).iter_files()
+                if file_path.endswith('.py') and
+                not os.path.basename(file_path).startswith('__')]
 
             # Carrega cada um
             for py_file in py_files:
-                module_name = os.path.relpath(
-                    py_file, project_path).replace(os.sep, '.').rstrip('.py')
+                module_name = os.path.splitext(os.path.relpath(
+                    py_file, project_path))[0].replace(os.sep, '.')
                 self.get_module_methods(
                     module_name, py_file, project_path)
 
@@ -2859,15 +4287,10 @@ class ModuleCacheManager:
         with self._cache_lock:
             cache_key = f"{module_name}:{file_path or ''}"
 
-            # Verifica se precisa atualizar o cache
-            current_time = time.time()
-            last_scan = self._last_scan_time.get(
-                cache_key, 0)
-
-            if current_time - last_scan > self._scan_interval:
+            # Só recalcula entradas ausentes ou invalidadas
+            if cache_key not in self._module_cache:
                 self._update_module_cache(
                     module_name, file_path, project_path)
-                self._last_scan_time[cache_key] = current_time
 
             methods = self._module_cache.get(
                 cache_key, set())
@@ -2882,6 +4305,7 @@ class ModuleCacheManager:
         """Atualiza o cache para um módulo específico"""
         cache_key = f"{module_name}:{file_path or ''}"
         methods = set()
+        sources = {file_path} if file_path else set()
 
         try:
             # Tenta carregar como módulo Python
@@ -2901,11 +4325,16 @@ class ModuleCacheManager:
                         module)
                     methods.update(
                         self._get_module_attributes(module))
+                    if spec.origin:
+                        sources.add(spec.origin)
             except:
                 pass
 
-            # Procura módulos locais no projeto
+            # Procura módulos locais no projeto (inclusive os que ainda
+            # não existem: criá-los também invalida a entrada)
             if project_path:
+                sources.update(
+                    self._local_module_paths(module_name, project_path))
                 local_methods = self._scan_local_module(
                     module_name, project_path, file_path)
                 methods.update(
@@ -2916,6 +4345,29 @@ class ModuleCacheManager:
                 f"Erro ao atualizar cache para {module_name}: {e}")
 
         self._module_cache[cache_key] = methods
+        for source in sources:
+            self._key_sources.setdefault(
+                os.path.abspath(source), set()).add(cache_key)
+
+    def invalidate_file(self, file_path: str):
+        """Descarta as entradas que dependem do arquivo alterado"""
+        with self._cache_lock:
+            keys = self._key_sources.pop(
+                os.path.abspath(file_path), set())
+            for cache_key in keys:
+                self._module_cache.pop(cache_key, None)
+            if keys:
+                self._chain_cache.clear()
+
+    @staticmethod
+    def _local_module_paths(module_name: str, project_path: str):
+        """Possíveis locais de um módulo local no projeto"""
+        return [
+            os.path.join(
+                project_path, f"{module_name}.py"),
+            os.path.join(
+                project_path, module_name, "__init__.py"),
+        ]
 
     def _get_builtin_module_methods(self, module_name: str) -> Set[str]:
         """Métodos para módulos built-in"""
@@ -2960,12 +4412,8 @@ class ModuleCacheManager:
         methods = set()
         try:
             # Possíveis locais do módulo
-            possible_paths = [
-                os.path.join(
-                    project_path, f"{module_name}.py"),
-                os.path.join(
-                    project_path, module_name, "__init__.py"),
-            ]
+            possible_paths = self._local_module_paths(
+                module_name, project_path)
 
             for module_path in possible_paths:
                 if os.path.exists(
@@ -3033,11 +4481,12 @@ module_cache_manager = ModuleCacheManager()
 class LinterWorker(QThread):
     finished = QSignal(dict, list)  # errors, messages  # <- Mudança aqui: Signal -> QSignal
 
-    def __init__(self, file_path, python_exec, project_path):
+    def __init__(self, file_path, python_exec, project_path, snapshot=None):
         super().__init__()
         self.file_path = file_path
         self.python_exec = python_exec
         self.project_path = project_path
+        self.snapshot = snapshot
         self._is_running = True
 
     def stop(self):
@@ -3051,6 +4500,11 @@ class LinterWorker(QThread):
         errors = {}
         lint_messages = []
 
+        # Buffer já mudou: não vale a pena rodar o pylint
+        if self.snapshot is not None and self.snapshot.is_stale():
+            self.finished.emit(errors, lint_messages)
+            return
+
         try:
             # Try pylint first with corrected enables
             pylint_cmd = [
@@ -3117,13 +4571,21 @@ class AutoCompleteWorker(QThread):
         super().__init__()
         self.ide = ide
         self.running = True
+        self.last_version = None
 
     def run(self):
         while self.running:
             if hasattr(self.ide, 'current_editor') and self.ide.current_editor and JEDI_AVAILABLE:
+                # Usa o último snapshot publicado pelo editor; nada a fazer
+                # se o buffer não mudou desde a última consulta
+                snapshot = getattr(self.ide.current_editor, 'latest_snapshot', None)
+                if snapshot is None or snapshot.version == self.last_version:
+                    self.msleep(500)
+                    continue
+                self.last_version = snapshot.version
                 # Usa Jedi para sugestões
                 try:
-                    source = self.ide.current_editor.toPlainText()
+                    source = snapshot.text()
                     script = jedi.Script(source)
                     completions = script.complete(len(source) - 1)  # Corrige posição
                     suggestions = [comp.name for comp in completions[:10]]  # Top 10
@@ -3568,10 +5030,50 @@ class DebugWorker(QThread):
 # ===== COMPONENTES DE INTERFACE =====
 
 class LineNumberArea(QWidget):
+    """Gutter com números de linha e faixas de marcadores (folding, diagnósticos, git)"""
+    LANES = ('fold', 'diagnostic', 'plugin', 'git')
+    LANE_WIDTH = 5
+    PADDING = 6
+
     def __init__(self, editor):
         super().__init__(editor)
         self.editor = editor
-        self.setFixedWidth(70)
+        self.markers = {lane: {} for lane in self.LANES}
+        self._digits = 0
+
+        # Métricas em cache: recalculadas apenas quando a fonte muda
+        self.refresh_metrics()
+        self.editor.font_changed.connect(self.refresh_metrics)
+
+        # Repinta apenas em rolagem real/áreas sujas e em mudanças de linhas
+        self.editor.updateRequest.connect(self.update_line_numbers_area)
+        self.editor.blockCountChanged.connect(self.update_area_width)
+
+    def refresh_metrics(self):
+        self.gutter_font = QFont(self.editor.font())
+        self.gutter_font.setPointSize(10)
+        metrics = QFontMetrics(self.gutter_font)
+        self.digit_width = metrics.horizontalAdvance('9')
+        self.text_height = metrics.height()
+        self._digits = 0
+        self.update_area_width()
+
+    def numbers_width(self):
+        return self.PADDING + self._digits * self.digit_width
+
+    def area_width(self):
+        return self.numbers_width() + self.PADDING + len(self.LANES) * self.LANE_WIDTH
+
+    def update_area_width(self, *_):
+        """Ajusta a largura apenas quando o número de dígitos muda"""
+        digits = max(3, len(str(self.editor.blockCount())))
+        if digits == self._digits:
+            return
+        self._digits = digits
+        self.setFixedWidth(self.area_width())
+        self.editor.setViewportMargins(self.width() + 4, 0, 0, 0)
+        cr = self.editor.contentsRect()
+        self.setGeometry(cr.left(), cr.top(), self.width(), cr.height())
 
     def update_line_numbers(self):
         self.update()
@@ -3582,55 +5084,65 @@ class LineNumberArea(QWidget):
         else:
             self.update(
                 0, rect.y(), self.width(), rect.height())
-        if rect.contains(self.editor.viewport().rect()):
-            self.update_line_numbers()
+
+    # ===== API DE MARCADORES =====
+
+    def set_marker(self, lane, line, color):
+        """Marca a linha (base 0) na faixa indicada com a cor informada"""
+        self.markers[lane][line] = QColor(color)
+        self.update()
+
+    def set_markers(self, lane, markers):
+        """Substitui todos os marcadores de uma faixa ({linha: cor})"""
+        self.markers[lane] = {line: QColor(color) for line, color in markers.items()}
+        self.update()
+
+    def clear_markers(self, lane=None):
+        lanes = [lane] if lane else self.LANES
+        for name in lanes:
+            self.markers[name] = {}
+        self.update()
 
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.fillRect(event.rect(), QColor(20, 30, 48))
+        painter.setFont(self.gutter_font)
+
+        numbers_width = self.numbers_width()
+        separator_x = numbers_width + self.PADDING // 2
+        lane_x = {lane: separator_x + 2 + i * self.LANE_WIDTH
+                  for i, lane in enumerate(self.LANES)}
+        number_pen = QColor(150, 150, 150)
+        separator_pen = QColor(100, 100, 100)
+
         block = self.editor.firstVisibleBlock()
         block_number = block.blockNumber()
         top = int(
             self.editor.blockBoundingGeometry(block).translated(
                 self.editor.contentOffset()).top())
-        bottom = top + \
-                 int(self.editor.blockBoundingRect(block).height())
-        font = self.editor.font()
-        font.setPointSize(10)
-        painter.setFont(font)
-        font_metrics = self.editor.fontMetrics()
+        bottom = top + int(self.editor.blockBoundingRect(block).height())
+        event_top = event.rect().top()
+        event_bottom = event.rect().bottom()
 
-        while block.isValid() and top <= event.rect().bottom():
-            if block.isVisible() and bottom >= event.rect().top():
-                number = str(
-                    block_number + 1)
-                painter.setPen(
-                    QColor(150, 150, 150))
+        while block.isValid() and top <= event_bottom:
+            if block.isVisible() and bottom >= event_top:
+                painter.setPen(number_pen)
                 painter.drawText(
-                    0, top, 50, font_metrics.height(), Qt.AlignRight, number)
-
-                # Draw vertical
-                # separator
-                painter.setPen(
-                    QColor(100, 100, 100))
-                painter.drawLine(
-                    55, top, 55, bottom)
-
-                # Draw red line for
-                # errors
-                data = block.userData()
-                if isinstance(data, ErrorData) and any(
-                        error['type'] == 'error' for error in data.errors):
-                    painter.setPen(
-                        QColor(255, 0, 0))
-                    painter.drawLine(
-                        60, top, 60, bottom)
+                    0, top, numbers_width, self.text_height,
+                    Qt.AlignRight, str(block_number + 1))
+
+                painter.setPen(separator_pen)
+                painter.drawLine(separator_x, top, separator_x, bottom)
+
+                for lane, x in lane_x.items():
+                    color = self.markers[lane].get(block_number)
+                    if color is not None:
+                        painter.fillRect(
+                            x, top, self.LANE_WIDTH - 1, bottom - top, color)
 
             block = block.next()
             top = bottom
-            bottom = top + \
-                     int(self.editor.blockBoundingRect(
-                         block).height())
+            bottom = top + int(self.editor.blockBoundingRect(block).height())
             block_number += 1
 
 
@@ -4200,7 +5712,223 @@ class AutoCompleteWidget(QListWidget):
             self.hide()
 
 
+class BufferSnapshot:
+    """Cópia imutável e versionada do texto de um CodeEditor.
+
+    O texto é guardado em blocos de CHUNK_LINES linhas compartilhados entre
+    snapshots consecutivos, então só os blocos editados são recriados. Pode
+    ser passado livremente para threads de background.
+    """
+    CHUNK_LINES = 256
+
+    def __init__(self, version, chunks, line_count, file_path, version_source):
+        self.version = version
+        self.chunks = chunks
+        self.line_count = line_count
+        self.file_path = file_path
+        self._version_source = version_source
+        self._text = None
+        self._line_starts = None
+        self._utf16_offsets = None
+
+    def text(self):
+        """Texto completo (montado uma única vez, sob demanda)"""
+        if self._text is None:
+            self._text = '\n'.join(self.chunks)
+        return self._text
+
+    def utf16_offsets(self):
+        """Conversor entre offsets do text() e posições do documento (calculado uma vez)"""
+        if self._utf16_offsets is None:
+            self._utf16_offsets = Utf16Offsets(self.text())
+        return self._utf16_offsets
+
+    def iter_lines(self):
+        for chunk in self.chunks:
+            yield from chunk.split('\n')
+
+    def line(self, line_number):
+        """Texto da linha (base 0)"""
+        chunk = self.chunks[line_number // self.CHUNK_LINES]
+        return chunk.split('\n')[line_number % self.CHUNK_LINES]
+
+    def is_stale(self):
+        """True se o editor já foi modificado depois deste snapshot"""
+        return self._version_source() != self.version
+
+    def line_starts(self):
+        """Offsets de início de cada linha no text() (calculados uma vez)"""
+        if self._line_starts is None:
+            text = self.text()
+            starts = [0]
+            position = text.find('\n')
+            while position != -1:
+                starts.append(position + 1)
+                position = text.find('\n', position + 1)
+            self._line_starts = starts
+        return self._line_starts
+
+    def line_of_offset(self, offset):
+        """Linha (base 0) que contém o offset, por busca binária"""
+        return bisect.bisect_right(self.line_starts(), offset) - 1
+
+
+class SearchOverviewBar(QWidget):
+    """Marcas das ocorrências desenhadas sobre a barra de rolagem vertical"""
+
+    def __init__(self, layer, scrollbar):
+        super().__init__(scrollbar)
+        self.layer = layer
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        scrollbar.installEventFilter(self)
+        self.setGeometry(scrollbar.rect())
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Resize:
+            self.setGeometry(obj.rect())
+        return False
+
+    def paintEvent(self, event):
+        snapshot = self.layer.snapshot
+        if snapshot is None or not self.layer.matches:
+            return
+        painter = QPainter(self)
+        color = QColor(255, 200, 0, 200)
+        height = max(1, self.height())
+        line_count = max(1, snapshot.line_count)
+        rows = {int(snapshot.line_of_offset(start) * height / line_count)
+                for start, _end in self.layer.matches}
+        for y in rows:
+            painter.fillRect(2, y, self.width() - 4, 2, color)
+
+
+class SearchHighlightLayer:
+    """Destaca todas as ocorrências de uma busca via ExtraSelections.
+
+    As ocorrências da área visível são calculadas primeiro; o restante do
+    documento é varrido em fatias pelo timer, sem bloquear a GUI. Só as
+    ocorrências visíveis viram ExtraSelections, e o highlighter de sintaxe
+    não é tocado.
+    """
+    SCAN_CHUNK_CHARS = 200000
+    # Folga após a fatia para ocorrências que começam nela e terminam depois
+    SCAN_OVERLAP_CHARS = 4096
+
+    def __init__(self, editor):
+        self.editor = editor
+        self.regex = None
+        self.snapshot = None
+        self.matches = []  # (início, fim) já varridos, em ordem
+        self.visible_matches = []
+        self._scan_pos = 0
+        self.selection_format = QTextCharFormat()
+        self.selection_format.setBackground(QColor(255, 200, 0, 90))
+
+        self.scan_timer = QTimer(editor)
+        self.scan_timer.timeout.connect(self.scan_next_chunk)
+        self.refresh_timer = QTimer(editor)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+        self.overview = SearchOverviewBar(self, editor.verticalScrollBar())
+        editor.updateRequest.connect(self.on_update_request)
+        editor.document().contentsChange.connect(self.on_contents_change)
+
+    def set_regex(self, regex):
+        """Destaca as ocorrências do regex (None para limpar)"""
+        self.regex = regex
+        self.refresh()
+
+    def clear(self):
+        self.set_regex(None)
+
+    def refresh(self):
+        self.scan_timer.stop()
+        self.matches = []
+        self.visible_matches = []
+        self._scan_pos = 0
+        if self.regex is None:
+            self.snapshot = None
+            self.apply_visible()
+            return
+
+        self.snapshot = self.editor.snapshot()
+        text = self.snapshot.text()
+        start, end = self.visible_range()
+        self.visible_matches = [
+            (match.start(), match.end())
+            for match in self.regex.finditer(text, start, end)
+            if match.end() > match.start()]
+        self.apply_visible()
+        self.scan_timer.start(0)
+
+    def scan_next_chunk(self):
+        """Varre a próxima fatia do documento"""
+        text = self.snapshot.text()
+        limit = self._scan_pos + self.SCAN_CHUNK_CHARS
+        next_pos = limit
+        # endpos limita o trabalho à fatia: sem ele, o finditer procura a
+        # próxima ocorrência até o fim do texto a cada fatia
+        for match in self.regex.finditer(
+                text, self._scan_pos, min(len(text), limit + self.SCAN_OVERLAP_CHARS)):
+            if match.start() >= limit:
+                break
+            if match.end() > match.start():
+                self.matches.append((match.start(), match.end()))
+                next_pos = max(next_pos, match.end())
+        self._scan_pos = next_pos
+
+        if self._scan_pos >= len(text):
+            self.scan_timer.stop()
+            self.visible_matches = []
+            self.apply_visible()
+        self.overview.update()
+
+    def visible_range(self):
+        """Intervalo exibido no viewport, em offsets do text() do snapshot"""
+        first = self.editor.firstVisibleBlock()
+        cursor = self.editor.cursorForPosition(
+            self.editor.viewport().rect().bottomRight())
+        last = cursor.block()
+        start, end = first.position(), last.position() + last.length()
+        if self.snapshot is None:
+            return start, end
+        offsets = self.snapshot.utf16_offsets()
+        return offsets.from_document(start), offsets.from_document(end)
+
+    def apply_visible(self):
+        """Converte em ExtraSelections apenas as ocorrências visíveis"""
+        selections = []
+        if self.regex is not None:
+            start, end = self.visible_range()
+            ranges = self.matches[bisect.bisect_left(self.matches, (start,)):]
+            ranges = [r for r in ranges[:2000] if r[0] < end]
+            ranges += [r for r in self.visible_matches if r[0] >= self._scan_pos]
+            offsets = self.snapshot.utf16_offsets()
+            for match_start, match_end in ranges:
+                selection = QTextEdit.ExtraSelection()
+                selection.format = self.selection_format
+                cursor = QTextCursor(self.editor.document())
+                cursor.setPosition(offsets.to_document(match_start))
+                cursor.setPosition(offsets.to_document(match_end), QTextCursor.KeepAnchor)
+                selection.cursor = cursor
+                selections.append(selection)
+        self.editor.setExtraSelections(selections)
+        self.overview.update()
+
+    def on_update_request(self, rect, dy):
+        if dy and self.regex is not None:
+            self.apply_visible()
+
+    def on_contents_change(self, position, chars_removed, chars_added):
+        # Qualquer edição (inclusive troca de mesmo tamanho) muda as ocorrências
+        if self.regex is not None:
+            self.refresh_timer.start(200)
+
+
 class CodeEditor(QPlainTextEdit):
+    font_changed = QSignal()  # zoom/configurações: o gutter recalcula as métricas
+
     def __init__(
             self,
             text,
@@ -4217,6 +5945,19 @@ class CodeEditor(QPlainTextEdit):
         self.file_path = file_path
         self.project_path = project_path
 
+        # Snapshots versionados do buffer para workers em background
+        self.buffer_version = 0
+        self.latest_snapshot = None
+        self._snapshot_chunks = []
+        self._dirty_chunks = set()
+        self._dirty_from = 0
+        self._block_count = self.document().blockCount()
+        self.document().contentsChange.connect(self._on_contents_change)
+        self._snapshot_timer = QTimer(self)
+        self._snapshot_timer.setSingleShot(True)
+        self._snapshot_timer.timeout.connect(self.snapshot)
+        self._search_highlight = None
+
         # Configurar tab
         self.configure_tab_stop()
 
@@ -4240,6 +5981,79 @@ class CodeEditor(QPlainTextEdit):
         self._cursor_info_timer.timeout.connect(
             self._update_cursor_info_debounced)
 
+    def get_buffer_version(self):
+        return self.buffer_version
+
+    @property
+    def search_highlight(self):
+        """Camada de destaque de ocorrências de busca (criada sob demanda)"""
+        if self._search_highlight is None:
+            self._search_highlight = SearchHighlightLayer(self)
+        return self._search_highlight
+
+    def _on_contents_change(self, position, chars_removed, chars_added):
+        """Incrementa a versão e marca os blocos de snapshot afetados"""
+        self.buffer_version += 1
+        doc = self.document()
+        chunk_lines = BufferSnapshot.CHUNK_LINES
+        first = doc.findBlock(position).blockNumber() // chunk_lines
+
+        if doc.blockCount() != self._block_count:
+            # Linhas deslocadas: todos os blocos seguintes mudam
+            self._block_count = doc.blockCount()
+            if self._dirty_from is None or first < self._dirty_from:
+                self._dirty_from = first
+        else:
+            last = doc.findBlock(position + chars_added).blockNumber() // chunk_lines
+            self._dirty_chunks.update(range(first, last + 1))
+
+        # Publica um snapshot novo para os workers após uma pausa na digitação
+        self._snapshot_timer.start(150)
+
+    def _read_snapshot_chunk(self, index):
+        block = self.document().findBlockByNumber(
+            index * BufferSnapshot.CHUNK_LINES)
+        lines = []
+        while block.isValid() and len(lines) < BufferSnapshot.CHUNK_LINES:
+            lines.append(block.text())
+            block = block.next()
+        return '\n'.join(lines)
+
+    def snapshot(self):
+        """Retorna um BufferSnapshot do estado atual (chamar na thread da GUI).
+
+        Workers em outras threads devem usar latest_snapshot ou receber o
+        snapshot pronto, nunca chamar toPlainText().
+        """
+        if self.latest_snapshot is not None and self.latest_snapshot.version == self.buffer_version:
+            return self.latest_snapshot
+
+        chunk_lines = BufferSnapshot.CHUNK_LINES
+        block_count = self.document().blockCount()
+        chunk_count = (block_count + chunk_lines - 1) // chunk_lines
+        chunks = self._snapshot_chunks
+
+        if self._dirty_from is not None:
+            del chunks[self._dirty_from:]
+        del chunks[chunk_count:]
+        for index in self._dirty_chunks:
+            if index < len(chunks):
+                chunks[index] = self._read_snapshot_chunk(index)
+        for index in range(len(chunks), chunk_count):
+            chunks.append(self._read_snapshot_chunk(index))
+
+        self._dirty_chunks.clear()
+        self._dirty_from = None
+        self.latest_snapshot = BufferSnapshot(
+            self.buffer_version, tuple(chunks), block_count,
+            self.file_path, self.get_buffer_version)
+        return self.latest_snapshot
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.FontChange:
+            self.font_changed.emit()
+
     def configure_tab_stop(self):
         """Configura o tamanho do tab baseado no tipo de arquivo"""
         font = QFont("Monospace", 12)
@@ -4270,6 +6084,10 @@ class CodeEditor(QPlainTextEdit):
                 event.accept()
                 return
 
+            # Escape também limpa os destaques de busca
+            if event.key() == Qt.Key_Escape and self._search_highlight is not None:
+                self._search_highlight.clear()
+
             # Navega no autocomplete com setas
             if self.auto_complete_widget.isVisible():
                 if event.key() in (Qt.Key_Up, Qt.Key_Down, Qt.Key_Return, Qt.Key_Enter):
@@ -4592,7 +6410,89 @@ class JediCompleter:
             return []
 
 
+def detect_file_encoding(file_path, sample_size=8192):
+    """Detecta o encoding lendo apenas um pequeno prefixo do arquivo (BOM/heurística)"""
+    try:
+        with open(file_path, 'rb') as f:
+            raw = f.read(sample_size)
+    except OSError:
+        return 'utf-8'
+
+    # BOMs (UTF-32 antes de UTF-16, pois compartilham o prefixo)
+    if raw.startswith((codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE)):
+        return 'utf-32'
+    if raw.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if raw.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+
+    # Heurística: UTF-8 válido no prefixo (ignora sequência cortada no fim
+    # apenas quando o arquivo é maior que a amostra)
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(
+            raw, final=len(raw) < sample_size)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+
+def write_text_file(file_path, text, encoding):
+    """Grava o texto no encoding do arquivo; retorna o encoding usado.
+
+    Se o texto tiver caracteres que o encoding detectado não comporta (ex.:
+    emoji em um arquivo lido como latin-1), grava em UTF-8.
+    """
+    try:
+        with open(file_path, 'w', encoding=encoding) as f:
+            f.write(text)
+        return encoding
+    except UnicodeEncodeError:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return 'utf-8'
+
+
+class FileLoaderWorker(QThread):
+    """Lê o restante de um arquivo grande em blocos, fora da thread da GUI"""
+    chunk_loaded = QSignal(str)
+    loading_finished = QSignal()
+
+    def __init__(self, file_handle, chunk_size=1024 * 1024):
+        super().__init__()
+        self.file_handle = file_handle
+        self.chunk_size = chunk_size
+        self._is_running = True
+
+    def stop(self):
+        self._is_running = False
+        self.wait(1000)
+
+    def run(self):
+        try:
+            while self._is_running:
+                chunk = self.file_handle.read(self.chunk_size)
+                if not chunk:
+                    break
+                self.chunk_loaded.emit(chunk)
+                # Cede tempo para a GUI processar o bloco anterior
+                self.msleep(1)
+        except Exception as e:
+            print(f"Erro ao carregar arquivo: {e}")
+        finally:
+            self.file_handle.close()
+            self.loading_finished.emit()
+
+
 class EditorTab(QWidget):
+    # Caracteres lidos de forma síncrona antes de exibir a aba
+    FIRST_SCREEN_CHARS = 64 * 1024
+    # Diagnósticos de plugins: (prioridade, cor) por severidade
+    PLUGIN_SEVERITIES = {
+        'error': (2, QColor(255, 0, 0)),
+        'warning': (1, QColor(230, 180, 0)),
+        'info': (0, QColor(80, 150, 255)),
+    }
+
     def __init__(self, file_path=None, parent=None):
         super().__init__(parent)
 
@@ -4600,13 +6500,24 @@ class EditorTab(QWidget):
         layout.setContentsMargins(0, 0, 0, 0)
 
         self.file_path = file_path
+        self.encoding = 'utf-8'
+        self.is_loading = False
+        self.loader_worker = None
 
-        # Obter conteúdo do arquivo se existir
+        # Obter a primeira tela do arquivo; o restante é carregado em
+        # background por FileLoaderWorker
         initial_text = ""
+        pending_handle = None
         if file_path and os.path.exists(file_path):
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    initial_text = f.read()
+                self.encoding = detect_file_encoding(file_path)
+                handle = open(file_path, 'r', encoding=self.encoding,
+                              errors='replace')
+                initial_text = handle.read(self.FIRST_SCREEN_CHARS)
+                if len(initial_text) < self.FIRST_SCREEN_CHARS:
+                    handle.close()
+                else:
+                    pending_handle = handle
             except Exception:
                 initial_text = ""
 
@@ -4641,24 +6552,141 @@ class EditorTab(QWidget):
         self.pending_lint = False
 
         self.linter_worker = None
-        self.last_lint_content = initial_text
+        self.last_lint_version = self.editor.buffer_version
 
         # Connect signals
         self.editor.textChanged.connect(self.schedule_linting)
-        self.editor.cursorPositionChanged.connect(
-            self.update_line_numbers)
-        self.editor.verticalScrollBar().valueChanged.connect(self.update_line_numbers)
 
-        # Line number area
+        # Line number area (repinta via updateRequest do editor e
+        # ajusta as margens do viewport conforme o número de dígitos)
         self.line_number_area = LineNumberArea(self.editor)
         layout.addWidget(self.editor)
         self.setLayout(layout)
 
-        self.update_line_numbers()
+        if pending_handle:
+            self.start_streaming(pending_handle)
+
+        # Assinatura do arquivo em disco, para distinguir os próprios
+        # salvamentos de alterações externas
+        self.disk_signature = self.read_disk_signature()
+
+        # Diagnósticos publicados por plugins do processo de plugins
+        self.plugin_diagnostics = {}
+
+    def set_plugin_diagnostics(self, plugin, items):
+        """Substitui os diagnósticos do plugin e atualiza a faixa do gutter"""
+        if items:
+            self.plugin_diagnostics[plugin] = items
+        else:
+            self.plugin_diagnostics.pop(plugin, None)
+
+        markers = {}
+        for plugin_items in self.plugin_diagnostics.values():
+            for item in plugin_items:
+                line = item['line'] - 1
+                rank = self.PLUGIN_SEVERITIES.get(
+                    item['severity'], self.PLUGIN_SEVERITIES['info'])
+                if line not in markers or rank[0] > markers[line][0]:
+                    markers[line] = rank
+        self.line_number_area.set_markers(
+            'plugin', {line: rank[1] for line, rank in markers.items()})
+
+    def add_plugin_problems(self, problems_list):
+        """Acrescenta os diagnósticos dos plugins à lista de problemas"""
+        for plugin, items in self.plugin_diagnostics.items():
+            for item in items:
+                entry = QListWidgetItem(
+                    f"🔌 {plugin} Line {item['line']}: {item['message']}")
+                entry.setData(Qt.UserRole, {
+                    'file': self.file_path,
+                    'line': str(item['line']),
+                    'type': item['severity'],
+                    'plugin': plugin,
+                })
+                problems_list.addItem(entry)
+
+    def start_streaming(self, file_handle):
+        """Continua a leitura do arquivo em blocos sem bloquear a GUI"""
+        self.is_loading = True
+        self.editor.setReadOnly(True)
+        self.editor.document().setUndoRedoEnabled(False)
+
+        self.loader_worker = FileLoaderWorker(file_handle)
+        self.loader_worker.chunk_loaded.connect(self.append_loaded_chunk)
+        self.loader_worker.loading_finished.connect(self.on_loading_finished)
+        self.loader_worker.start()
+
+    def append_loaded_chunk(self, text):
+        """Anexa um bloco ao fim do documento sem mover o cursor do usuário"""
+        cursor = QTextCursor(self.editor.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+
+    def on_loading_finished(self):
+        """Libera o editor após o carregamento completo"""
+        self.is_loading = False
+        self.editor.document().setUndoRedoEnabled(True)
+        self.editor.document().setModified(False)
+        self.editor.setReadOnly(False)
+        self.last_lint_version = self.editor.buffer_version
+
+    def stop_loading(self):
+        """Interrompe o carregamento em andamento (ex.: aba fechada)"""
+        if self.loader_worker and self.loader_worker.isRunning():
+            self.loader_worker.stop()
+
+    def read_disk_signature(self):
+        """(mtime, tamanho) do arquivo em disco, ou None"""
+        if not self.file_path:
+            return None
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def on_disk_changed(self):
+        """Recarrega o arquivo alterado externamente ou pergunta em caso de conflito"""
+        signature = self.read_disk_signature()
+        if self.is_loading or signature is None or signature == self.disk_signature:
+            return
+        self.disk_signature = signature
+
+        if self.editor.document().isModified():
+            reply = QMessageBox.question(
+                self,
+                "Arquivo alterado no disco",
+                f"{os.path.basename(self.file_path)} foi alterado fora do editor.\n\n"
+                "Recarregar e descartar as alterações não salvas?",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No
+            )
+            if reply != QMessageBox.Yes:
+                return
+        self.reload_from_disk()
+
+    def reload_from_disk(self):
+        """Troca o conteúdo pelo do disco mantendo cursor e histórico de desfazer"""
+        try:
+            with open(self.file_path, 'r', encoding=self.encoding, errors='replace') as f:
+                text = f.read()
+        except OSError as e:
+            print(f"Erro ao recarregar {self.file_path}: {e}")
+            return
+        apply_text_minimal_edit(self.editor, text)
+        self.editor.document().setModified(False)
+        self.disk_signature = self.read_disk_signature()
 
-        # Set viewport margins to shift text to the right
-        self.editor.setViewportMargins(
-            self.line_number_area.width() + 10, 0, 0, 0)
+    def on_disk_deleted(self):
+        """O arquivo sumiu do disco: mantém o texto como alteração não salva"""
+        self.disk_signature = None
+        self.editor.document().setModified(True)
+
+    def set_file_path(self, file_path):
+        """Acompanha a renomeação do arquivo no disco"""
+        self.file_path = file_path
+        self.editor.file_path = file_path
+        self.disk_signature = self.read_disk_signature()
 
     def get_project_path(self):
         """Obtém o caminho do projeto do IDE pai"""
@@ -4667,17 +6695,19 @@ class EditorTab(QWidget):
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
+        cr = self.editor.contentsRect()
         self.line_number_area.setGeometry(
-            0, 0, self.line_number_area.width(), self.height())
+            cr.left(), cr.top(), self.line_number_area.width(), cr.height())
 
     def update_line_numbers(self):
         self.line_number_area.update_line_numbers()
 
     def schedule_linting(self):
         """Schedule linting com debounce melhorado"""
-        current_content = self.editor.toPlainText()
+        if self.is_loading:
+            return
 
-        if (current_content != self.last_lint_content and
+        if (self.editor.buffer_version != self.last_lint_version and
                 self.file_path and
                 self.file_path.endswith('.py')):
 
@@ -4702,20 +6732,33 @@ class EditorTab(QWidget):
         if self.linter_worker and self.linter_worker.isRunning():
             self.linter_worker.stop()
 
-        # Save file and update last content
+        # Save file and update last linted version
+        snapshot = self.editor.snapshot()
+        file_name = os.path.basename(self.file_path)
         try:
-            current_content = self.editor.toPlainText()
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                f.write(current_content)
-            self.last_lint_content = current_content
-        except Exception:
+            encoding = write_text_file(self.file_path, snapshot.text(), self.encoding)
+        except OSError as e:
+            self.is_linting = False
+            ide.statusBar().showMessage(
+                f"❌ Salvamento automático de {file_name} falhou: {e}", 8000)
             return
+        self.last_lint_version = snapshot.version
+        # Escrita do próprio IDE: o observador não deve tratá-la como externa
+        self.disk_signature = self.read_disk_signature()
+        ide.note_file_written(self.file_path)
+        if encoding != self.encoding:
+            ide.statusBar().showMessage(
+                f"⚠ {file_name} salvo em UTF-8: o texto tem caracteres "
+                f"fora de {self.encoding.upper()}", 8000)
+            self.encoding = encoding
+            ide.update_file_info(self.file_path)
 
         # Start new worker
         self.linter_worker = LinterWorker(
             self.file_path,
             ide.get_python_executable(),
-            ide.project_path
+            ide.project_path,
+            snapshot
         )
         self.linter_worker.finished.connect(
             self.on_linting_finished)
@@ -4725,6 +6768,13 @@ class EditorTab(QWidget):
         """Finaliza linting e verifica se precisa relintar"""
         self.is_linting = False
 
+        # Resultado de uma versão antiga: descarta e relinta a atual
+        snapshot = self.linter_worker.snapshot if self.linter_worker else None
+        if snapshot is not None and snapshot.is_stale():
+            self.pending_lint = False
+            self.schedule_linting()
+            return
+
         if self.pending_lint:
             self.pending_lint = False
             self.schedule_linting()
@@ -4733,6 +6783,13 @@ class EditorTab(QWidget):
         doc = self.editor.document()
         block_count = doc.blockCount()
 
+        # Marcadores de diagnóstico no gutter
+        self.line_number_area.set_markers('diagnostic', {
+            line_num: QColor(255, 0, 0) if any(
+                error['type'] == 'error' for error in line_errors) else QColor(230, 180, 0)
+            for line_num, line_errors in errors.items()
+        })
+
         # Clear previous errors from all blocks
         for i in range(block_count):
             block = doc.findBlockByLineNumber(i)
@@ -4779,6 +6836,7 @@ class EditorTab(QWidget):
                     Qt.UserRole, data)
                 ide.problems_list.addItem(
                     item)
+            self.add_plugin_problems(ide.problems_list)
 
         # Also update lint_text for additional info
         if ide and ide.lint_text:
@@ -4791,6 +6849,8 @@ class EditorTab(QWidget):
 
         # Rehighlight with new errors
         self.highlighter.rehighlight()
+        if ide and ide.minimap:
+            ide.minimap.invalidate(self.editor)
 
     def get_ide(self):
         """Find and return the parent IDE instance"""
@@ -4806,115 +6866,1191 @@ class EditorTab(QWidget):
         self.highlighter.rehighlight()
 
 
-class Minimap(QPlainTextEdit):
-    def __init__(self, parent=None):
+class PendingEditorTab(QWidget):
+    """Aba restaurada da sessão; só vira EditorTab quando é ativada"""
+
+    def __init__(self, file_path, cursor_position=0, scroll_value=0, parent=None):
         super().__init__(parent)
-        self.setReadOnly(True)
-        self.setFont(QFont("Monospace", 4))
-        self.setWordWrapMode(QTextOption.NoWrap)
+        self.file_path = file_path
+        self.cursor_position = cursor_position
+        self.scroll_value = scroll_value
 
 
-class ProblemsDelegate(QStyledItemDelegate):
-    def paint(self, painter: QPainter, option, index):
-        super().paint(painter, option, index)
-        data = index.data(Qt.UserRole)
-        if data:
-            error_type = data.get('type', 'info')
-            color = QColor("red") if error_type == 'error' else QColor("yellow") if error_type == 'warning' else QColor(
-                "blue")
-            painter.setPen(color)
-            painter.drawText(
-                option.rect.x() + 5, option.rect.bottom() - 5, "●")
+class SessionManager:
+    """Persiste a sessão (projeto, abas, cursores e layout) entre execuções"""
 
+    def __init__(self):
+        self.session_file = os.path.join(
+            os.path.expanduser("~"), ".py_dragon_session.json")
 
-class FontSelectionDialog(QDialog):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Select Font")
-        self.layout = QVBoxLayoutDialog(self)
-        self.label = QLabel("Choose a font:")
-        self.layout.addWidget(self.label)
-        self.font_combo = QComboBox()
-        self.available_fonts = QFontDatabase.families()
-        self.font_combo.addItems(self.available_fonts)
-        self.layout.addWidget(self.font_combo)
-        self.apply_button = QPushButton("Apply")
-        self.apply_button.clicked.connect(self.accept)
-        self.layout.addWidget(self.apply_button)
-        self.setLayout(self.layout)
+    def load(self):
+        """Carrega a sessão salva ({} se não houver)"""
+        try:
+            with open(self.session_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
 
-    def get_selected_font(self):
-        return self.font_combo.currentText()
+    def save(self, data):
+        """Grava a sessão de forma atômica"""
+        temp_path = self.session_file + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.session_file)
 
 
-class PackageDialog(QDialog):
-    def __init__(self, parent, project_path, main_file):
+class Minimap(QWidget):
+    """Minimap desenhado a partir das formatações do highlighter, em tiles de QImage"""
+    LINE_HEIGHT = 3
+    CHAR_WIDTH = 1
+    TILE_LINES = 128
+    MAX_TILES = 32
+    BACKGROUND = QColor(30, 30, 30)
+    DEFAULT_COLOR = QColor(86, 156, 214)
+
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.project_path = project_path
-        self.main_file = main_file
-        self.setWindowTitle("Empacotar Projeto")
-        self.setFixedSize(400, 200)
+        self.editor = None
+        self.tiles = OrderedDict()  # índice do tile -> QImage (LRU)
+        self._block_count = 0
+        self.setMinimumWidth(60)
+
+    def set_editor(self, editor):
+        """Passa a acompanhar o editor informado (ou nenhum)"""
+        if self.editor is not None:
+            try:
+                self.editor.document().contentsChange.disconnect(self.on_contents_change)
+                self.editor.verticalScrollBar().valueChanged.disconnect(self.on_editor_scrolled)
+            except (RuntimeError, TypeError):
+                pass
 
-        layout = QVBoxLayout(self)
+        self.editor = editor
+        self.tiles.clear()
+        if editor is not None:
+            self._block_count = editor.document().blockCount()
+            editor.document().contentsChange.connect(self.on_contents_change)
+            editor.verticalScrollBar().valueChanged.connect(self.on_editor_scrolled)
+        self.update()
 
-        info_label = QLabel(f"Projeto: {os.path.basename(project_path)}\n"
-                            f"Arquivo principal: {main_file}\n\n"
-                            "Deseja empacotar como executável?")
-        info_label.setWordWrap(True)
-        layout.addWidget(info_label)
+    def clear(self):
+        self.set_editor(None)
 
-        btn_layout = QHBoxLayout()
-        self.yes_btn = QPushButton("Sim, Empacotar")
-        self.yes_btn.clicked.connect(self.package_project)
-        self.no_btn = QPushButton("Cancelar")
-        self.no_btn.clicked.connect(self.reject)
+    def invalidate(self, editor=None):
+        """Descarta todos os tiles (ex.: após rehighlight do editor)"""
+        if editor is None or editor is self.editor:
+            self.tiles.clear()
+            self.update()
 
-        btn_layout.addWidget(self.yes_btn)
-        btn_layout.addWidget(self.no_btn)
-        layout.addLayout(btn_layout)
+    def on_editor_scrolled(self, _value):
+        self.update()
 
-        self.setLayout(layout)
+    def on_contents_change(self, position, chars_removed, chars_added):
+        """Invalida apenas os tiles dos blocos alterados"""
+        doc = self.editor.document()
+        first_line = doc.findBlock(position).blockNumber()
+        last_line = doc.findBlock(position + chars_added).blockNumber()
+        first_tile = max(0, first_line) // self.TILE_LINES
 
-    def package_project(self):
-        """Simula o empacotamento (expanda para PyInstaller real)"""
-        try:
-            # Exemplo simples: cria um ZIP ou use
-            # subprocess para PyInstaller
-            output_dir = os.path.join(
-                self.project_path, "dist")
-            os.makedirs(output_dir, exist_ok=True)
+        block_count = doc.blockCount()
+        if block_count != self._block_count:
+            # Linhas deslocadas: todos os tiles seguintes mudam
+            self._block_count = block_count
+            stale = [t for t in self.tiles if t >= first_tile]
+        else:
+            last_tile = max(first_line, last_line) // self.TILE_LINES
+            stale = [t for t in self.tiles if first_tile <= t <= last_tile]
 
-            # Comando exemplo com PyInstaller
-            # (ajuste conforme necessário)
-            pyinstaller_cmd = [
-                sys.executable, "-m", "PyInstaller",
-                "--onefile",
-                "--distpath", output_dir,
-                os.path.join(
-                    self.project_path, self.main_file)
-            ]
-            result = subprocess.run(
-                pyinstaller_cmd, cwd=self.project_path, capture_output=True, text=True)
+        for tile_index in stale:
+            del self.tiles[tile_index]
+        self.update()
 
-            if result.returncode == 0:
-                QMessageBox.information(
-                    self, "Sucesso", f"Projeto empacotado em {output_dir}!")
-            else:
-                QMessageBox.warning(
-                    self, "Erro", f"Falha no empacotamento:\n{result.stderr}")
-        except Exception as e:
-            QMessageBox.critical(
-                self, "Erro", f"Erro ao empacotar: {str(e)}")
+    def tile_height(self):
+        return self.TILE_LINES * self.LINE_HEIGHT
+
+    def scroll_offset(self):
+        """Deslocamento vertical (px) que mantém a área visível do editor na tela"""
+        total_height = self.editor.document().blockCount() * self.LINE_HEIGHT
+        overflow = total_height - self.height()
+        if overflow <= 0:
+            return 0
+        scrollbar = self.editor.verticalScrollBar()
+        if scrollbar.maximum() <= 0:
+            return 0
+        return int(overflow * scrollbar.value() / scrollbar.maximum())
+
+    def visible_editor_lines(self):
+        return max(1, self.editor.viewport().height() // self.editor.fontMetrics().height())
+
+    def tile(self, tile_index):
+        image = self.tiles.get(tile_index)
+        if image is None:
+            image = self.render_tile(tile_index)
+            self.tiles[tile_index] = image
+            while len(self.tiles) > self.MAX_TILES:
+                self.tiles.popitem(last=False)
+        else:
+            self.tiles.move_to_end(tile_index)
+        return image
+
+    def render_tile(self, tile_index):
+        image = QImage(max(1, self.width()), self.tile_height(),
+                       QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        max_chars = self.width() // self.CHAR_WIDTH
+
+        block = self.editor.document().findBlockByNumber(
+            tile_index * self.TILE_LINES)
+        y = 0
+        for _ in range(self.TILE_LINES):
+            if not block.isValid():
+                break
+            text = block.text()[:max_chars]
+            formats = block.layout().formats()
+            for match in re.finditer(r'\S+', text):
+                painter.fillRect(
+                    match.start() * self.CHAR_WIDTH, y,
+                    (match.end() - match.start()) * self.CHAR_WIDTH,
+                    self.LINE_HEIGHT - 1,
+                    self.color_at(formats, match.start()))
+            block = block.next()
+            y += self.LINE_HEIGHT
 
-        self.accept()
+        painter.end()
+        return image
 
+    def color_at(self, formats, position):
+        """Cor do token na posição, conforme o estado do highlighter"""
+        for format_range in reversed(formats):
+            if format_range.start <= position < format_range.start + format_range.length:
+                color = QColor(format_range.format.foreground().color())
+                break
+        else:
+            color = QColor(self.DEFAULT_COLOR)
+        color.setAlpha(190)
+        return color
 
-class ProgressDialog(QDialog):
-    """Diálogo de progresso para mostrar o carregamento"""
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), self.BACKGROUND)
+        if self.editor is None:
+            return
 
-    def __init__(
-            self,
-            parent=None,
+        offset = self.scroll_offset()
+        tile_height = self.tile_height()
+        first_tile = (offset + event.rect().top()) // tile_height
+        last_tile = (offset + event.rect().bottom()) // tile_height
+        max_tile = (self.editor.document().blockCount() - 1) // self.TILE_LINES
+        for tile_index in range(first_tile, min(last_tile, max_tile) + 1):
+            painter.drawImage(0, tile_index * tile_height - offset,
+                              self.tile(tile_index))
+
+        # Indicador da área visível do editor
+        first_visible = self.editor.firstVisibleBlock().blockNumber()
+        painter.fillRect(
+            0, first_visible * self.LINE_HEIGHT - offset, self.width(),
+            self.visible_editor_lines() * self.LINE_HEIGHT,
+            QColor(255, 255, 255, 30))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # Largura mudou: tiles precisam ser redesenhados
+        if event.oldSize().width() != event.size().width():
+            self.tiles.clear()
+
+    def scroll_editor_to(self, y):
+        """Centraliza no editor a linha correspondente à posição clicada"""
+        if self.editor is None:
+            return
+        line = (y + self.scroll_offset()) // self.LINE_HEIGHT
+        self.editor.verticalScrollBar().setValue(
+            max(0, line - self.visible_editor_lines() // 2))
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.scroll_editor_to(int(event.position().y()))
+
+    def mouseMoveEvent(self, event):
+        if event.buttons() & Qt.LeftButton:
+            self.scroll_editor_to(int(event.position().y()))
+
+
+def find_aligned(data, needle, start, end, origin=0, unit=1, reverse=False):
+    """find/rfind em bytes aceitando só ocorrências alinhadas à unidade do encoding
+
+    Em UTF-16/32 os bytes da quebra de linha (ou da busca) podem aparecer no
+    meio de outro caractere; vale apenas a ocorrência em um limite de unidade
+    contado a partir de origin (o fim do BOM)."""
+    while True:
+        if reverse:
+            position = data.rfind(needle, start, end)
+        else:
+            position = data.find(needle, start, end)
+        if position == -1 or (position - origin) % unit == 0:
+            return position
+        if reverse:
+            end = position + len(needle) - 1
+        else:
+            start = position + 1
+
+
+class LineIndexWorker(QThread):
+    """Constrói em background o índice de offsets de linha de um mmap"""
+    progress = QSignal(int)  # linhas indexadas até agora
+    indexing_finished = QSignal(int)
+
+    def __init__(self, mapped, offsets, newline=b'\n', origin=0,
+                 batch_size=4 * 1024 * 1024):
+        super().__init__()
+        self.mapped = mapped
+        self.offsets = offsets
+        self.newline = newline  # \n já codificado (2 bytes em UTF-16, 4 em UTF-32)
+        self.origin = origin
+        self.batch_size = batch_size
+        self._is_running = True
+
+    def stop(self):
+        self._is_running = False
+        self.wait(1000)
+
+    def run(self):
+        size = len(self.mapped)
+        unit = len(self.newline)
+        # Lotes começam no fim do BOM: com batch_size múltiplo da unidade,
+        # nenhum \n alinhado fica dividido entre dois lotes
+        position = self.origin
+        while self._is_running and position < size:
+            batch_end = min(position + self.batch_size, size)
+            batch = array('Q')
+            newline = find_aligned(
+                self.mapped, self.newline, position, batch_end, self.origin, unit)
+            while newline != -1:
+                batch.append(newline + unit)
+                newline = find_aligned(
+                    self.mapped, self.newline, newline + unit, batch_end,
+                    self.origin, unit)
+            # Última linha terminada em \n não gera linha extra vazia
+            if batch and batch[-1] == size:
+                batch.pop()
+            self.offsets.extend(batch)
+            position = batch_end
+            self.progress.emit(len(self.offsets))
+        if self._is_running:
+            self.indexing_finished.emit(len(self.offsets))
+
+
+class MappedTextView(QAbstractScrollArea):
+    """Renderiza apenas as linhas visíveis de um arquivo mapeado em memória"""
+    MAX_RENDERED_CHARS = 4096
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.mapped = None
+        self.offsets = array('Q', [0])
+        self.encoding = 'utf-8'
+        self.match_range = None  # (início, fim) em bytes
+        self.setFont(QFont("Monospace", 12))
+        self.horizontalScrollBar().setSingleStep(
+            self.fontMetrics().horizontalAdvance(' '))
+
+    def set_source(self, mapped, offsets, encoding):
+        self.mapped = mapped
+        self.offsets = offsets
+        self.encoding = encoding
+        self.update_scrollbars()
+
+    def line_count(self):
+        return len(self.offsets) if self.mapped is not None else 0
+
+    def line_height(self):
+        return self.fontMetrics().height()
+
+    def visible_line_count(self):
+        return max(1, self.viewport().height() // self.line_height())
+
+    def gutter_width(self):
+        digits = len(str(max(1, self.line_count())))
+        return self.fontMetrics().horizontalAdvance('9') * (digits + 2)
+
+    def line_bytes(self, line):
+        start = self.offsets[line]
+        if line + 1 < len(self.offsets):
+            end = self.offsets[line + 1]
+        else:
+            end = len(self.mapped)
+        return start, self.mapped[start:min(end, start + self.MAX_RENDERED_CHARS * 4)]
+
+    def line_text(self, line):
+        _, raw = self.line_bytes(line)
+        text = raw.decode(self.encoding, errors='replace')
+        return text.rstrip('\r\n')[:self.MAX_RENDERED_CHARS]
+
+    def line_for_offset(self, byte_offset):
+        return max(0, bisect.bisect_right(self.offsets, byte_offset) - 1)
+
+    def update_scrollbars(self):
+        visible = self.visible_line_count()
+        self.verticalScrollBar().setRange(
+            0, max(0, self.line_count() - visible))
+        self.verticalScrollBar().setPageStep(visible)
+        char_width = self.fontMetrics().horizontalAdvance(' ')
+        self.horizontalScrollBar().setRange(
+            0, char_width * self.MAX_RENDERED_CHARS)
+        self.horizontalScrollBar().setPageStep(self.viewport().width())
+        self.viewport().update()
+
+    def go_to_line(self, line):
+        """Centraliza a linha (base 0) na área visível"""
+        self.verticalScrollBar().setValue(
+            max(0, line - self.visible_line_count() // 2))
+        self.viewport().update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_scrollbars()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        painter.fillRect(event.rect(), self.palette().base())
+        if self.mapped is None:
+            return
+
+        painter.setFont(self.font())
+        metrics = self.fontMetrics()
+        line_height = self.line_height()
+        gutter = self.gutter_width()
+        x_offset = gutter - self.horizontalScrollBar().value()
+        first = self.verticalScrollBar().value()
+        last = min(self.line_count(), first + self.visible_line_count() + 1)
+
+        for row, line in enumerate(range(first, last)):
+            top = row * line_height
+            start, raw = self.line_bytes(line)
+            text = self.line_text(line)
+
+            if self.match_range and start <= self.match_range[0] < start + len(raw):
+                prefix = raw[:self.match_range[0] - start].decode(
+                    self.encoding, errors='replace')
+                match = self.mapped[self.match_range[0]:self.match_range[1]].decode(
+                    self.encoding, errors='replace')
+                painter.fillRect(
+                    x_offset + metrics.horizontalAdvance(prefix), top,
+                    metrics.horizontalAdvance(match), line_height,
+                    QColor(255, 200, 0, 120))
+
+            painter.setPen(self.palette().text().color())
+            painter.drawText(x_offset, top + metrics.ascent(), text)
+
+        # Gutter com números de linha (desenhado por cima do texto rolado)
+        painter.fillRect(0, 0, gutter, self.viewport().height(),
+                         self.palette().alternateBase())
+        painter.setPen(QColor(150, 150, 150))
+        for row, line in enumerate(range(first, last)):
+            painter.drawText(0, row * line_height, gutter - metrics.horizontalAdvance('9'),
+                             line_height, Qt.AlignRight, str(line + 1))
+
+
+class LargeFileViewerTab(QWidget):
+    """Aba somente leitura para arquivos enormes, baseada em mmap"""
+    # Arquivos acima deste tamanho são abertos no visualizador automaticamente
+    AUTO_OPEN_THRESHOLD = 50 * 1024 * 1024
+    # BOM -> codec sem BOM: fatias do mmap são decodificadas (e a busca
+    # codificada) isoladamente, então o codec não pode emitir/esperar BOM.
+    # UTF-32 antes de UTF-16, pois compartilham o prefixo
+    BOM_CODECS = (
+        (codecs.BOM_UTF32_LE, 'utf-32-le'),
+        (codecs.BOM_UTF32_BE, 'utf-32-be'),
+        (codecs.BOM_UTF8, 'utf-8'),
+        (codecs.BOM_UTF16_LE, 'utf-16-le'),
+        (codecs.BOM_UTF16_BE, 'utf-16-be'),
+    )
+
+    def __init__(self, file_path, parent=None):
+        super().__init__(parent)
+        self.file_path = file_path
+        self.encoding = detect_file_encoding(file_path)
+        self.file_handle = None
+        self.mapped = None
+        self.offsets = array('Q', [0])
+        self.data_start = 0  # primeiro byte após o BOM
+        self.code_unit = 1  # bytes por unidade do encoding (\n codificado)
+        self.index_worker = None
+        self.is_indexing = False
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        search_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Buscar no arquivo...")
+        self.search_input.returnPressed.connect(self.find_next)
+        search_layout.addWidget(self.search_input)
+
+        prev_button = QPushButton("◀ Anterior")
+        prev_button.clicked.connect(self.find_previous)
+        search_layout.addWidget(prev_button)
+        next_button = QPushButton("Próximo ▶")
+        next_button.clicked.connect(self.find_next)
+        search_layout.addWidget(next_button)
+        goto_button = QPushButton("Ir para linha")
+        goto_button.clicked.connect(self.go_to_line_dialog)
+        search_layout.addWidget(goto_button)
+
+        self.status_label = QLabel()
+        search_layout.addWidget(self.status_label)
+        layout.addLayout(search_layout)
+
+        self.view = MappedTextView(self)
+        layout.addWidget(self.view)
+
+        self.open_mapping()
+
+    def open_mapping(self):
+        """Mapeia o arquivo e inicia a indexação de linhas"""
+        self.file_handle = open(self.file_path, 'rb')
+        if os.path.getsize(self.file_path) == 0:
+            self.status_label.setText("Arquivo vazio")
+            return
+
+        self.mapped = mmap.mmap(
+            self.file_handle.fileno(), 0, access=mmap.ACCESS_READ)
+        for bom, codec in self.BOM_CODECS:
+            if self.mapped[:len(bom)] == bom:
+                self.encoding, self.data_start = codec, len(bom)
+                break
+        newline = '\n'.encode(self.encoding)
+        self.code_unit = len(newline)
+        self.offsets[0] = self.data_start
+        self.view.set_source(self.mapped, self.offsets, self.encoding)
+
+        self.is_indexing = True
+        self.index_worker = LineIndexWorker(
+            self.mapped, self.offsets, newline, self.data_start)
+        self.index_worker.progress.connect(self.on_index_progress)
+        self.index_worker.indexing_finished.connect(self.on_index_finished)
+        self.index_worker.start()
+
+    def on_index_progress(self, line_count):
+        self.status_label.setText(f"⏳ Indexando... {line_count:,} linhas")
+        self.view.update_scrollbars()
+
+    def on_index_finished(self, line_count):
+        self.is_indexing = False
+        self.status_label.setText(
+            f"📄 {line_count:,} linhas ({self.encoding.upper()}, somente leitura)")
+        self.view.update_scrollbars()
+
+    def find_next(self):
+        self.find_text(forward=True)
+
+    def find_previous(self):
+        self.find_text(forward=False)
+
+    def find_text(self, forward=True):
+        """Busca diretamente nos bytes mapeados a partir da ocorrência atual"""
+        text = self.search_input.text()
+        if not text or self.mapped is None:
+            return
+
+        needle = text.encode(self.encoding, errors='replace')
+        current = self.view.match_range
+        size = len(self.mapped)
+
+        def find(start, end, reverse=False):
+            return find_aligned(self.mapped, needle, start, end,
+                                self.data_start, self.code_unit, reverse)
+
+        if forward:
+            start = current[0] + 1 if current else self.data_start
+            position = find(start, size)
+            if position == -1 and start > self.data_start:
+                position = find(self.data_start, size)
+        else:
+            end = current[0] if current else size
+            position = find(self.data_start, end, reverse=True)
+            if position == -1 and end < size:
+                position = find(self.data_start, size, reverse=True)
+
+        if position == -1:
+            self.view.match_range = None
+            self.status_label.setText(f"❌ '{text}' não encontrado")
+            self.view.viewport().update()
+            return
+
+        self.view.match_range = (position, position + len(needle))
+        line = self.view.line_for_offset(position)
+        if self.is_indexing and line == len(self.offsets) - 1:
+            self.status_label.setText(
+                "⏳ Ocorrência além da parte já indexada, aguarde a indexação")
+        else:
+            self.status_label.setText(f"🔍 Linha {line + 1:,}")
+        self.view.go_to_line(line)
+
+    def go_to_line_dialog(self):
+        line_count = self.view.line_count()
+        if not line_count:
+            return
+        line, ok = QInputDialog.getInt(
+            self, "Ir para linha", f"Linha (1 - {line_count:,}):",
+            1, 1, line_count)
+        if ok:
+            self.view.go_to_line(line - 1)
+
+    def close_file(self):
+        """Encerra a indexação e libera o mapeamento"""
+        if self.index_worker and self.index_worker.isRunning():
+            self.index_worker.stop()
+        self.view.set_source(None, array('Q', [0]), self.encoding)
+        if self.mapped is not None:
+            self.mapped.close()
+            self.mapped = None
+        if self.file_handle:
+            self.file_handle.close()
+            self.file_handle = None
+
+
+# Intervalo de amostragem de "Executar com Profiler"
+PROFILER_INTERVAL_S = 0.005
+
+# Executado no interpretador do projeto com `python -c`: roda o script com
+# runpy enquanto uma thread amostra a pilha da thread principal e grava as
+# pilhas agregadas em JSON ao terminar
+PROFILER_BOOTSTRAP = textwrap.dedent('''
+    import json, os, runpy, sys, threading, time
+    output_path, interval = sys.argv[1], float(sys.argv[2])
+    script = os.path.abspath(sys.argv[3])
+    sys.argv = sys.argv[3:]
+    sys.path[0] = os.path.dirname(script)
+    main_id = threading.get_ident()
+    stacks, lines = {}, {}
+    done = threading.Event()
+
+    def sample():
+        while not done.wait(interval):
+            frame = sys._current_frames().get(main_id)
+            stack, leaf, in_script = [], None, False
+            while frame is not None:
+                code = frame.f_code
+                if leaf is None:
+                    leaf = (code.co_filename, code.co_firstlineno, code.co_name, frame.f_lineno)
+                stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                if code.co_filename == script and code.co_name == '<module>':
+                    in_script = True
+                    break
+                frame = frame.f_back
+            if not in_script:
+                continue
+            stack = tuple(reversed(stack))
+            stacks[stack] = stacks.get(stack, 0) + 1
+            lines[leaf] = lines.get(leaf, 0) + 1
+
+    started = time.perf_counter()
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        runpy.run_path(script, run_name='__main__')
+    finally:
+        done.set()
+        sampler.join()
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'interval': interval,
+                'duration': time.perf_counter() - started,
+                'stacks': [[[list(frame) for frame in stack], count]
+                           for stack, count in stacks.items()],
+                'lines': [list(leaf) + [count] for leaf, count in lines.items()],
+            }, f)
+''')
+
+
+class FlameNode:
+    """Nó da árvore de chamadas amostradas"""
+    __slots__ = ('function', 'count', 'children')
+
+    def __init__(self, function):
+        self.function = function  # (arquivo, primeira linha, nome) ou None na raiz
+        self.count = 0
+        self.children = {}
+
+    def add(self, stack, count):
+        node = self
+        node.count += count
+        for function in stack:
+            child = node.children.get(function)
+            if child is None:
+                child = node.children[function] = FlameNode(function)
+            child.count += count
+            node = child
+
+    def label(self):
+        if self.function is None:
+            return "todas as amostras"
+        filename, first_line, name = self.function
+        return f"{name} ({os.path.basename(filename)}:{first_line})"
+
+
+class SamplingProfile:
+    """Perfil gravado pelo PROFILER_BOOTSTRAP"""
+
+    def __init__(self, data):
+        self.interval = data.get('interval', PROFILER_INTERVAL_S)
+        self.duration = data.get('duration', 0.0)
+        self.root = FlameNode(None)
+        # (arquivo, primeira linha, nome) -> [amostras próprias, amostras totais]
+        self.functions = {}
+        for frames, count in data.get('stacks', []):
+            stack = [tuple(frame) for frame in frames]
+            self.root.add(stack, count)
+            for function in set(stack):
+                self.functions.setdefault(function, [0, 0])[1] += count
+            if stack:
+                self.functions.setdefault(stack[-1], [0, 0])[0] += count
+
+        # Linha mais amostrada de cada função, para a navegação
+        self.hot_lines = {}
+        for filename, first_line, name, line, count in data.get('lines', []):
+            function = (filename, first_line, name)
+            if count > self.hot_lines.get(function, (0, 0))[1]:
+                self.hot_lines[function] = (line, count)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    @property
+    def total_samples(self):
+        return self.root.count
+
+    def to_ms(self, samples):
+        """Tempo estimado, proporcional à duração real da execução"""
+        if not self.total_samples:
+            return 0.0
+        return self.duration * 1000 * samples / self.total_samples
+
+    def source_line(self, function):
+        return self.hot_lines.get(function, (function[1], 0))[0]
+
+
+class FlameGraphWidget(QWidget):
+    """Flame graph do SamplingProfile, com a raiz no topo.
+
+    Clique amplia o quadro (clicar na primeira linha volta à raiz) e clique
+    duplo abre o código da função.
+    """
+    ROW_HEIGHT = 18
+    MAX_DEPTH = 200
+    source_requested = QSignal(str, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.profile = None
+        self.zoom = None
+        self.frames = []  # (QRectF, nó) do último paint, para cliques e dicas
+        self.pressed_node = None
+
+    def set_profile(self, profile):
+        self.profile = profile
+        self.set_zoom(profile.root)
+
+    def set_zoom(self, node):
+        self.zoom = node
+        depth = 0
+        pending = [(node, 1)]
+        while pending:
+            current, level = pending.pop()
+            depth = max(depth, level)
+            if level < self.MAX_DEPTH:
+                pending.extend((child, level + 1) for child in current.children.values())
+        self.setMinimumHeight(depth * self.ROW_HEIGHT)
+        self.update()
+
+    @staticmethod
+    def frame_color(node):
+        if node.function is None:
+            return QColor(90, 90, 90)
+        filename, _first_line, name = node.function
+        return QColor.fromHsv(hash(name) % 50, 140 + hash(filename) % 80, 225)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), QColor(30, 30, 30))
+        self.frames = []
+        if self.profile is None or not self.zoom.count:
+            return
+
+        dirty = QRectF(event.rect())
+        metrics = painter.fontMetrics()
+        pending = [(self.zoom, 0.0, float(self.width()), 0)]
+        while pending:
+            node, x, width, depth = pending.pop()
+            rect = QRectF(x, depth * self.ROW_HEIGHT, width, self.ROW_HEIGHT - 1)
+            self.frames.append((rect, node))
+            if rect.intersects(dirty):
+                painter.fillRect(rect, self.frame_color(node))
+                if width > 30:
+                    painter.setPen(QColor(20, 20, 20))
+                    text_rect = rect.adjusted(3, 0, -3, 0)
+                    painter.drawText(
+                        text_rect, Qt.AlignVCenter | Qt.AlignLeft,
+                        metrics.elidedText(node.label(), Qt.ElideRight, int(text_rect.width())))
+            if depth + 1 >= self.MAX_DEPTH:
+                continue
+            child_x = x
+            for child in sorted(node.children.values(), key=FlameNode.label):
+                child_width = width * child.count / node.count
+                # Quadros com menos de um pixel não são desenhados
+                if child_width >= 1:
+                    pending.append((child, child_x, child_width, depth + 1))
+                child_x += child_width
+
+    def node_at(self, position):
+        for rect, node in reversed(self.frames):
+            if rect.contains(position):
+                return node
+        return None
+
+    def mousePressEvent(self, event):
+        if event.button() != Qt.LeftButton or self.profile is None:
+            return
+        node = self.pressed_node = self.node_at(event.position())
+        if node is not None:
+            self.set_zoom(self.profile.root if node is self.zoom else node)
+
+    def mouseDoubleClickEvent(self, event):
+        node = self.pressed_node
+        if node is not None and node.function is not None:
+            self.source_requested.emit(
+                node.function[0], self.profile.source_line(node.function))
+
+    def event(self, event):
+        if event.type() == QEvent.ToolTip and self.profile is not None:
+            node = self.node_at(QPointF(event.pos()))
+            if node is None:
+                QToolTip.hideText()
+            else:
+                share = node.count * 100 / self.profile.total_samples
+                QToolTip.showText(
+                    event.globalPos(),
+                    f"{node.label()}\n{node.count} amostras ({share:.1f}%, "
+                    f"{self.profile.to_ms(node.count):.0f} ms)",
+                    self)
+            return True
+        return super().event(event)
+
+
+class ProfilerResultsTab(QWidget):
+    """Resultado de "Executar com Profiler": hotspots e flame graph"""
+    COLUMNS = ["Função", "Local", "Próprio (ms)", "Próprio %", "Total (ms)", "Total %"]
+    MAX_ROWS = 500
+    source_requested = QSignal(str, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        self.views = QTabWidget()
+        self.table = QTableWidget()
+        self.table.setColumnCount(len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSortingEnabled(True)
+        self.table.itemDoubleClicked.connect(self.on_item_double_clicked)
+        self.views.addTab(self.table, "Hotspots")
+
+        self.flame_graph = FlameGraphWidget()
+        self.flame_graph.source_requested.connect(self.source_requested)
+        flame_scroll = QScrollArea()
+        flame_scroll.setWidgetResizable(True)
+        flame_scroll.setWidget(self.flame_graph)
+        self.views.addTab(flame_scroll, "Flame Graph")
+        layout.addWidget(self.views)
+
+    def set_profile(self, profile, script_path):
+        self.summary_label.setText(
+            f"🔥 {os.path.basename(script_path)}: {profile.total_samples} amostras da "
+            f"thread principal em {profile.duration:.2f} s "
+            f"(a cada {profile.interval * 1000:.0f} ms). Clique duplo abre o código.")
+
+        total = profile.total_samples
+        hotspots = sorted(profile.functions.items(),
+                          key=lambda entry: (entry[1][0], entry[1][1]),
+                          reverse=True)[:self.MAX_ROWS]
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(hotspots))
+        for row, (function, (own, cumulative)) in enumerate(hotspots):
+            filename, first_line, name = function
+            values = [name, f"{os.path.basename(filename)}:{first_line}",
+                      round(profile.to_ms(own), 1), round(own * 100 / total, 1),
+                      round(profile.to_ms(cumulative), 1), round(cumulative * 100 / total, 1)]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem()
+                item.setData(Qt.DisplayRole, value)
+                if column == 0:
+                    item.setData(Qt.UserRole, [filename, profile.source_line(function)])
+                if column == 1:
+                    item.setToolTip(filename)
+                self.table.setItem(row, column, item)
+        self.table.setSortingEnabled(True)
+        self.table.resizeColumnsToContents()
+
+        self.flame_graph.set_profile(profile)
+
+    def on_item_double_clicked(self, item):
+        filename, line = self.table.item(item.row(), 0).data(Qt.UserRole)
+        self.source_requested.emit(filename, line)
+
+
+# Intervalo entre snapshots de "Executar com Profiler de Memória"
+MEMORY_SNAPSHOT_INTERVAL_S = 1.0
+
+# Executado no interpretador do projeto com `python -c`: liga o tracemalloc,
+# roda o script com runpy e envia snapshots periódicos (maiores alocações e
+# crescimento) como JSON pelo canal local aberto pelo IDE
+MEMORY_PROFILER_BOOTSTRAP = textwrap.dedent('''
+    import json, os, runpy, socket, sys, threading, time, tracemalloc
+    address, interval = sys.argv[1], float(sys.argv[2])
+    script = os.path.abspath(sys.argv[3])
+    sys.argv = sys.argv[3:]
+    sys.path[0] = os.path.dirname(script)
+
+    if os.name == 'nt':
+        channel = open(address, 'wb', buffering=0)
+    else:
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(address)
+        channel = connection.makefile('wb', buffering=0)
+
+    TOP = 50
+    IGNORED = [tracemalloc.Filter(False, tracemalloc.__file__),
+               tracemalloc.Filter(False, '<string>'),
+               tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+               tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+               tracemalloc.Filter(False, '<unknown>')]
+    first = previous = None
+    count = 0
+    started = time.perf_counter()
+
+    def rows(statistics):
+        return [[stat.traceback[0].filename, stat.traceback[0].lineno, stat.size, stat.count]
+                for stat in statistics[:TOP]]
+
+    def diff_rows(statistics):
+        changed = [stat for stat in statistics if stat.size_diff][:TOP]
+        return [[stat.traceback[0].filename, stat.traceback[0].lineno,
+                 stat.size_diff, stat.count_diff, stat.size] for stat in changed]
+
+    def send_snapshot(final=False):
+        global first, previous, count
+        snapshot = tracemalloc.take_snapshot().filter_traces(IGNORED)
+        current, peak = tracemalloc.get_traced_memory()
+        message = {
+            'index': count,
+            'time': time.perf_counter() - started,
+            'current': current,
+            'peak': peak,
+            'final': final,
+            'top': rows(snapshot.statistics('lineno')),
+            'growth': diff_rows(snapshot.compare_to(previous, 'lineno')) if previous else [],
+            'growth_total': diff_rows(snapshot.compare_to(first, 'lineno')) if first else [],
+        }
+        if first is None:
+            first = snapshot
+        previous = snapshot
+        count += 1
+        channel.write((json.dumps(message) + '\\n').encode('utf-8'))
+
+    done = threading.Event()
+
+    def snapshot_loop():
+        while not done.wait(interval):
+            try:
+                send_snapshot()
+            except (OSError, ValueError):
+                return  # IDE fechou o canal
+
+    tracemalloc.start()
+    sender = threading.Thread(target=snapshot_loop, daemon=True)
+    sender.start()
+    try:
+        runpy.run_path(script, run_name='__main__')
+    finally:
+        done.set()
+        sender.join()
+        try:
+            send_snapshot(final=True)
+            channel.close()
+        except (OSError, ValueError):
+            pass
+        tracemalloc.stop()
+''')
+
+
+class MemoryProfilerSession(QObject):
+    """Canal local (QLocalServer) que recebe os snapshots do MEMORY_PROFILER_BOOTSTRAP"""
+    snapshot_received = QSignal(dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.server = QLocalServer(self)
+        self.server.newConnection.connect(self.on_new_connection)
+        self.sockets = []
+        self.buffers = {}
+
+    def listen(self):
+        """Abre o canal; devolve o endereço para o processo ou None"""
+        name = f"py_dragon_memprof_{os.getpid()}_{id(self)}"
+        QLocalServer.removeServer(name)
+        if not self.server.listen(name):
+            print(f"Erro ao abrir canal do profiler de memória: {self.server.errorString()}")
+            return None
+        return self.server.fullServerName()
+
+    def on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self.sockets.append(socket)
+            socket.readyRead.connect(
+                lambda socket=socket: self.read_socket(socket))
+
+    def read_socket(self, socket):
+        buffer = self.buffers.get(id(socket), b'') + bytes(socket.readAll())
+        *lines, self.buffers[id(socket)] = buffer.split(b'\n')
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                self.snapshot_received.emit(json.loads(line))
+            except ValueError:
+                print(f"Snapshot de memória inválido: {line[:200]!r}")
+
+    def close(self):
+        # Lê o que ainda estiver no canal antes de fechar
+        for socket in self.sockets:
+            self.read_socket(socket)
+            socket.abort()
+        self.sockets.clear()
+        self.server.close()
+
+
+class MemoryProfilerTab(QWidget):
+    """Snapshots de "Executar com Profiler de Memória": maiores alocações e
+    crescimento entre snapshots; clique duplo abre o código"""
+    VIEWS = (
+        ('top', "Maiores alocações", ["Local", "Tamanho (KB)", "Blocos"]),
+        ('growth', "Crescimento desde o anterior",
+         ["Local", "Δ Tamanho (KB)", "Δ Blocos", "Tamanho (KB)"]),
+        ('growth_total', "Crescimento desde o início",
+         ["Local", "Δ Tamanho (KB)", "Δ Blocos", "Tamanho (KB)"]),
+    )
+    source_requested = QSignal(str, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.snapshots = []
+        self.script_path = ""
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        splitter = QSplitter(Qt.Horizontal)
+        self.snapshot_list = QListWidget()
+        self.snapshot_list.currentRowChanged.connect(self.show_snapshot)
+        splitter.addWidget(self.snapshot_list)
+
+        self.views = QTabWidget()
+        self.tables = {}
+        for key, title, columns in self.VIEWS:
+            table = QTableWidget()
+            table.setColumnCount(len(columns))
+            table.setHorizontalHeaderLabels(columns)
+            table.setEditTriggers(QTableWidget.NoEditTriggers)
+            table.setSelectionBehavior(QTableWidget.SelectRows)
+            table.setSortingEnabled(True)
+            table.itemDoubleClicked.connect(
+                lambda item, table=table: self.on_item_double_clicked(table, item))
+            self.tables[key] = table
+            self.views.addTab(table, title)
+        splitter.addWidget(self.views)
+        splitter.setSizes([220, 700])
+        layout.addWidget(splitter)
+
+    def start_session(self, script_path):
+        self.script_path = script_path
+        self.snapshots = []
+        self.snapshot_list.clear()
+        for table in self.tables.values():
+            table.setRowCount(0)
+        self.summary_label.setText(
+            f"🧠 {os.path.basename(script_path)}: aguardando o primeiro snapshot...")
+
+    def add_snapshot(self, snapshot):
+        following = self.snapshot_list.currentRow() in (-1, len(self.snapshots) - 1)
+        self.snapshots.append(snapshot)
+        label = (f"#{snapshot['index']}  {snapshot['time']:.1f} s  "
+                 f"{snapshot['current'] / 1048576:.1f} MB")
+        if snapshot.get('final'):
+            label += "  (final)"
+        self.snapshot_list.addItem(label)
+        # Acompanha o snapshot mais recente, a menos que outro esteja selecionado
+        if following:
+            self.snapshot_list.setCurrentRow(len(self.snapshots) - 1)
+
+        self.summary_label.setText(
+            f"🧠 {os.path.basename(self.script_path)}: {len(self.snapshots)} snapshot(s), "
+            f"memória rastreada {snapshot['current'] / 1048576:.1f} MB, "
+            f"pico {snapshot['peak'] / 1048576:.1f} MB")
+
+    def show_snapshot(self, row):
+        if not 0 <= row < len(self.snapshots):
+            return
+        snapshot = self.snapshots[row]
+        for key, _title, _columns in self.VIEWS:
+            self.fill_table(self.tables[key], snapshot.get(key, []), key != 'top')
+
+    @staticmethod
+    def fill_table(table, rows, is_diff):
+        table.setSortingEnabled(False)
+        table.setRowCount(len(rows))
+        for row, entry in enumerate(rows):
+            filename, line = entry[0], entry[1]
+            if is_diff:
+                size_diff, count_diff, size = entry[2:5]
+                values = [f"{os.path.basename(filename)}:{line}",
+                          round(size_diff / 1024, 1), count_diff, round(size / 1024, 1)]
+            else:
+                size, count = entry[2:4]
+                values = [f"{os.path.basename(filename)}:{line}",
+                          round(size / 1024, 1), count]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem()
+                item.setData(Qt.DisplayRole, value)
+                if column == 0:
+                    item.setData(Qt.UserRole, [filename, line])
+                    item.setToolTip(filename)
+                if is_diff and column == 1 and size_diff > 0:
+                    item.setForeground(QColor("#f48771"))
+                table.setItem(row, column, item)
+        table.setSortingEnabled(True)
+        table.resizeColumnsToContents()
+
+    def on_item_double_clicked(self, table, item):
+        filename, line = table.item(item.row(), 0).data(Qt.UserRole)
+        self.source_requested.emit(filename, line)
+
+
+class ProblemsDelegate(QStyledItemDelegate):
+    def paint(self, painter: QPainter, option, index):
+        super().paint(painter, option, index)
+        data = index.data(Qt.UserRole)
+        if data:
+            error_type = data.get('type', 'info')
+            color = QColor("red") if error_type == 'error' else QColor("yellow") if error_type == 'warning' else QColor(
+                "blue")
+            painter.setPen(color)
+            painter.drawText(
+                option.rect.x() + 5, option.rect.bottom() - 5, "●")
+
+
+class FontSelectionDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Select Font")
+        self.layout = QVBoxLayoutDialog(self)
+        self.label = QLabel("Choose a font:")
+        self.layout.addWidget(self.label)
+        self.font_combo = QComboBox()
+        self.available_fonts = QFontDatabase.families()
+        self.font_combo.addItems(self.available_fonts)
+        self.layout.addWidget(self.font_combo)
+        self.apply_button = QPushButton("Apply")
+        self.apply_button.clicked.connect(self.accept)
+        self.layout.addWidget(self.apply_button)
+        self.setLayout(self.layout)
+
+    def get_selected_font(self):
+        return self.font_combo.currentText()
+
+
+class PackageDialog(QDialog):
+    def __init__(self, parent, project_path, main_file):
+        super().__init__(parent)
+        self.project_path = project_path
+        self.main_file = main_file
+        self.setWindowTitle("Empacotar Projeto")
+        self.setFixedSize(400, 200)
+
+        layout = QVBoxLayout(self)
+
+        info_label = QLabel(f"Projeto: {os.path.basename(project_path)}\n"
+                            f"Arquivo principal: {main_file}\n\n"
+                            "Deseja empacotar como executável?")
+        info_label.setWordWrap(True)
+        layout.addWidget(info_label)
+
+        btn_layout = QHBoxLayout()
+        self.yes_btn = QPushButton("Sim, Empacotar")
+        self.yes_btn.clicked.connect(self.package_project)
+        self.no_btn = QPushButton("Cancelar")
+        self.no_btn.clicked.connect(self.reject)
+
+        btn_layout.addWidget(self.yes_btn)
+        btn_layout.addWidget(self.no_btn)
+        layout.addLayout(btn_layout)
+
+        self.setLayout(layout)
+
+    def package_project(self):
+        """Simula o empacotamento (expanda para PyInstaller real)"""
+        try:
+            # Exemplo simples: cria um ZIP ou use
+            # subprocess para PyInstaller
+            output_dir = os.path.join(
+                self.project_path, "dist")
+            os.makedirs(output_dir, exist_ok=True)
+
+            # Comando exemplo com PyInstaller
+            # (ajuste conforme necessário)
+            pyinstaller_cmd = [
+                sys.executable, "-m", "PyInstaller",
+                "--onefile",
+                "--distpath", output_dir,
+                os.path.join(
+                    self.project_path, self.main_file)
+            ]
+            result = subprocess.run(
+                pyinstaller_cmd, cwd=self.project_path, capture_output=True, text=True)
+
+            if result.returncode == 0:
+                QMessageBox.information(
+                    self, "Sucesso", f"Projeto empacotado em {output_dir}!")
+            else:
+                QMessageBox.warning(
+                    self, "Erro", f"Falha no empacotamento:\n{result.stderr}")
+        except Exception as e:
+            QMessageBox.critical(
+                self, "Erro", f"Erro ao empacotar: {str(e)}")
+
+        self.accept()
+
+
+class ProgressDialog(QDialog):
+    """Diálogo de progresso para mostrar o carregamento"""
+
+    def __init__(
+            self,
+            parent=None,
             title="Carregando",
             message="Carregando módulos..."):
         super().__init__(parent)
@@ -5723,73 +8859,1450 @@ class PackageManagerDialog(QDialog):
         except Exception as e:
             self.output_text.appendPlainText(f"💥 Erro na instalação: {str(e)}")
 
-    def uninstall_package(self):
-        """Desinstala pacote selecionado"""
-        current_item = self.packages_list.currentItem()
-        if not current_item:
-            QMessageBox.warning(self, "Aviso", "Selecione um pacote da lista!")
-            return
+    def uninstall_package(self):
+        """Desinstala pacote selecionado"""
+        current_item = self.packages_list.currentItem()
+        if not current_item:
+            QMessageBox.warning(self, "Aviso", "Selecione um pacote da lista!")
+            return
+
+        package_data = current_item.data(Qt.UserRole)
+        package_name = package_data['name']
+
+        reply = QMessageBox.question(
+            self, "Confirmar",
+            f"Desinstalar o pacote {package_name}?"
+        )
+        if reply == QMessageBox.Yes:
+            self.output_text.append(f"🗑️ Desinstalando {package_name}")
+            self.thread = PackageManagerThread("uninstall", package_name)
+            self.thread.finished_signal.connect(self.on_operation_finished)
+            self.thread.progress_signal.connect(self.update_progress_text)
+            self.thread.start()
+
+    def upgrade_package(self):
+        """Atualiza pacote selecionado"""
+        current_item = self.packages_list.currentItem()
+        if not current_item:
+            QMessageBox.warning(self, "Aviso", "Selecione um pacote da lista!")
+            return
+
+        package_data = current_item.data(Qt.UserRole)
+        package_name = package_data['name']
+
+        self.output_text.append(f"🔄 Atualizando {package_name}")
+        self.thread = PackageManagerThread("upgrade", package_name)
+        self.thread.finished_signal.connect(self.on_operation_finished)
+        self.thread.progress_signal.connect(self.update_progress_text)
+        self.thread.start()
+
+    def package_selected(self, item):
+        """Quando um pacote é selecionado na lista"""
+        package_data = item.data(Qt.UserRole)
+        self.package_input.setText(package_data['name'])
+
+        info_text = f"<b>{package_data['name']}</b> (v{package_data['version']})"
+        self.package_info.setText(info_text)
+
+    def on_operation_finished(self, success, message):
+        """Quando uma operação é finalizada"""
+        self.progress_bar.setVisible(False)
+
+        if success:
+            self.output_text.append("✅ " + message)
+            self.refresh_packages()  # Atualiza lista após operação
+        else:
+            self.output_text.append("❌ " + message)
+
+    def update_progress_text(self, message):
+        """Atualiza texto de progresso"""
+        self.output_text.append("➡️ " + message)
+
+class GitIgnoreMatcher:
+    """Regras de um arquivo .gitignore compiladas uma única vez"""
+
+    def __init__(self, base_dir="", lines=()):
+        self.base_dir = base_dir  # relativo à raiz do projeto ('' = raiz)
+        self.rules = []
+        for line in lines:
+            rule = self.compile_rule(line)
+            if rule:
+                self.rules.append(rule)
+
+    @classmethod
+    def from_file(cls, path, base_dir=""):
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                return cls(base_dir, f.read().splitlines())
+        except OSError:
+            return cls(base_dir)
+
+    @staticmethod
+    def compile_rule(line):
+        """Converte uma linha do .gitignore em (regex, negada, só_diretório)"""
+        line = line.rstrip()
+        if not line or line.startswith('#'):
+            return None
+
+        negated = line.startswith('!')
+        if negated:
+            line = line[1:]
+        dir_only = line.endswith('/')
+        # Só a barra final indica diretório; a inicial ainda ancora o padrão
+        line = line.rstrip('/')
+        anchored = '/' in line
+        line = line.lstrip('/')
+
+        regex = ''
+        i = 0
+        while i < len(line):
+            if line.startswith('**/', i):
+                regex += '(?:.*/)?'
+                i += 3
+            elif line.startswith('**', i):
+                regex += '.*'
+                i += 2
+            elif line[i] == '*':
+                regex += '[^/]*'
+                i += 1
+            elif line[i] == '?':
+                regex += '[^/]'
+                i += 1
+            elif line[i] == '[':
+                end = line.find(']', i + 1)
+                if end == -1:
+                    regex += re.escape(line[i])
+                    i += 1
+                else:
+                    regex += '[' + line[i + 1:end].replace('!', '^', 1) + ']'
+                    i = end + 1
+            else:
+                regex += re.escape(line[i])
+                i += 1
+
+        prefix = '' if anchored else '(?:.*/)?'
+        return re.compile(prefix + regex + '$'), negated, dir_only
+
+    def match(self, rel_path, is_dir):
+        """None se nenhuma regra casa; senão True (ignorado) ou False (re-incluído)"""
+        if self.base_dir:
+            if not rel_path.startswith(self.base_dir + '/'):
+                return None
+            rel_path = rel_path[len(self.base_dir) + 1:]
+        result = None
+        for regex, negated, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                result = not negated
+        return result
+
+
+# Entrada de diretório em cache; is_dir/is_file seguem links simbólicos
+WalkEntry = namedtuple('WalkEntry', 'name path is_dir is_file is_symlink')
+
+
+class ProjectWalker:
+    """Percorre o projeto com os.scandir respeitando .gitignore e exclusões padrão.
+
+    Use ProjectWalker.shared(raiz) para reaproveitar, entre todos os recursos
+    que percorrem o projeto, as regras .gitignore compiladas e as listagens
+    de diretórios (válidas enquanto o mtime do diretório não muda).
+    """
+    # Só pastas que nunca são código do usuário; ambientes virtuais são
+    # detectados pelo pyvenv.cfg (qualquer nome), e build/dist ficam a
+    # cargo do .gitignore
+    DEFAULT_EXCLUDES = (
+        '.git', '.hg', '.svn', '__pycache__', 'node_modules',
+        '.tox', '.mypy_cache', '.pytest_cache', '*.egg-info',
+    )
+    # Diretórios alterados há menos que isso não entram no cache, pois uma
+    # nova mudança no mesmo instante não mudaria o mtime
+    RACY_INTERVAL_NS = 2 * 10**9
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, root, excludes=DEFAULT_EXCLUDES):
+        self.root = os.path.abspath(root)
+        self.excludes = GitIgnoreMatcher('', [f"{pattern}/" for pattern in excludes])
+        self.listing_cache = {}  # dir absoluto -> (mtime_ns, [WalkEntry])
+        self.gitignore_cache = {}  # .gitignore -> (mtime_ns, GitIgnoreMatcher)
+
+    @classmethod
+    def shared(cls, root):
+        """Instância compartilhada por raiz de projeto"""
+        root = os.path.abspath(root)
+        with cls._shared_lock:
+            walker = cls._shared.get(root)
+            if walker is None:
+                walker = cls._shared[root] = cls(root)
+            return walker
+
+    @staticmethod
+    def is_virtualenv(abs_dir):
+        return os.path.isfile(os.path.join(abs_dir, 'pyvenv.cfg'))
+
+    def is_ignored(self, rel_path, is_dir, matchers):
+        if is_dir and self.excludes.match(rel_path, True):
+            return True
+        ignored = False
+        for matcher in matchers:
+            result = matcher.match(rel_path, is_dir)
+            if result is not None:
+                ignored = result
+        return ignored
+
+    def list_directory(self, abs_dir, dir_stat=None):
+        """Entradas de um diretório, reaproveitando a listagem em cache"""
+        dir_stat = dir_stat or os.stat(abs_dir)
+        cached = self.listing_cache.get(abs_dir)
+        if cached is not None and cached[0] == dir_stat.st_mtime_ns:
+            return cached[1]
+
+        entries = []
+        with os.scandir(abs_dir) as iterator:
+            for entry in iterator:
+                try:
+                    entries.append(WalkEntry(
+                        entry.name, entry.path, entry.is_dir(),
+                        entry.is_file(), entry.is_symlink()))
+                except OSError:
+                    continue
+        if time.time_ns() - dir_stat.st_mtime_ns > self.RACY_INTERVAL_NS:
+            self.listing_cache[abs_dir] = (dir_stat.st_mtime_ns, entries)
+        return entries
+
+    def load_gitignore(self, abs_dir, rel_dir):
+        """Regras do .gitignore do diretório, recompiladas só se o arquivo mudar"""
+        path = os.path.join(abs_dir, '.gitignore')
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        cached = self.gitignore_cache.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = self.gitignore_cache[path] = (
+                mtime, GitIgnoreMatcher.from_file(path, rel_dir))
+        return cached[1]
+
+    def visible_entries(self, entries, rel_dir, matchers, follow_symlinks=False):
+        """Filtra as entradas ignoradas (e os links simbólicos, se não seguidos)"""
+        visible = []
+        for entry in entries:
+            if entry.is_symlink and not follow_symlinks:
+                continue
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if not self.is_ignored(rel_path, entry.is_dir, matchers):
+                visible.append(entry)
+        return visible
+
+    def iter_directories(self, cancel_event=None, start=('', ()), follow_symlinks=False):
+        """Gera (dir absoluto, dir relativo, matchers, entradas não ignoradas)
+
+        start permite continuar a partir de um subdiretório com os matchers
+        .gitignore herdados dos diretórios pais. Ao seguir links simbólicos,
+        diretórios já visitados (mesmo dispositivo e inode) são pulados,
+        evitando ciclos.
+        """
+        visited = set()
+        stack = [(start[0], list(start[1]))]
+        while stack:
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            rel_dir, matchers = stack.pop()
+            abs_dir = os.path.join(self.root, rel_dir) if rel_dir else self.root
+
+            try:
+                dir_stat = os.stat(abs_dir)
+                entries = self.list_directory(abs_dir, dir_stat)
+            except OSError:
+                continue
+            identity = (dir_stat.st_dev, dir_stat.st_ino)
+            if identity in visited:
+                continue
+            visited.add(identity)
+            # Ambiente virtual dentro do projeto (a raiz sempre é percorrida)
+            if rel_dir and any(entry.name == 'pyvenv.cfg' and entry.is_file for entry in entries):
+                continue
+
+            if any(entry.name == '.gitignore' and entry.is_file for entry in entries):
+                matcher = self.load_gitignore(abs_dir, rel_dir)
+                if matcher is not None:
+                    matchers = matchers + [matcher]
+
+            visible = self.visible_entries(entries, rel_dir, matchers, follow_symlinks)
+            for entry in visible:
+                if entry.is_dir:
+                    rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    stack.append((rel_path, matchers))
+            yield abs_dir, rel_dir, matchers, visible
+
+    def iter_files(self, cancel_event=None, follow_symlinks=False):
+        """Gera (caminho absoluto, tamanho) de cada arquivo não ignorado"""
+        for _abs_dir, _rel_dir, _matchers, entries in self.iter_directories(
+                cancel_event, follow_symlinks=follow_symlinks):
+            for entry in entries:
+                if entry.is_file:
+                    try:
+                        yield entry.path, os.stat(entry.path).st_size
+                    except OSError:
+                        continue
+
+
+def list_directory_entries(entries):
+    """Resumo de uma listagem: nome -> (inode, mtime_ns, tamanho, é diretório)"""
+    listing = {}
+    for entry in entries:
+        try:
+            stat = os.stat(entry.path, follow_symlinks=False)
+        except OSError:
+            continue
+        listing[entry.name] = (stat.st_ino, stat.st_mtime_ns, stat.st_size, entry.is_dir)
+    return listing
+
+
+class ProjectWatchWorker(QThread):
+    """Percorre o projeto em background e monta as listagens iniciais"""
+    listings_ready = QSignal(dict)
+
+    def __init__(self, walker, start=('', ())):
+        super().__init__()
+        self.walker = walker
+        self.start_point = start
+        self.cancel_event = threading.Event()
+
+    def run(self):
+        listings = {}
+        for abs_dir, rel_dir, matchers, entries in self.walker.iter_directories(
+                self.cancel_event, self.start_point):
+            listings[abs_dir] = (rel_dir, matchers, list_directory_entries(entries))
+        if not self.cancel_event.is_set():
+            self.listings_ready.emit(listings)
+
+    def stop(self):
+        self.cancel_event.set()
+        self.wait(2000)
+
+
+class FileWatcherService(QObject):
+    """Observa o projeto e publica mudanças de arquivos em lote.
+
+    Os diretórios não ignorados são observados com QFileSystemWatcher; cada
+    notificação apenas agenda o diretório e, após COALESCE_MS, a listagem
+    atual é comparada com a anterior. Um arquivo removido e outro criado com o
+    mesmo inode no mesmo lote viram um evento 'renamed'. Escritas in-place não
+    alteram o diretório, por isso arquivos abertos em abas também são
+    observados diretamente (watch_file).
+
+    files_changed emite [(tipo, caminho, caminho antigo)], com tipo em
+    'created', 'modified', 'deleted' ou 'renamed'.
+    """
+    COALESCE_MS = 200
+    files_changed = QSignal(list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root = None
+        self.walker = None
+        self.scan_worker = None
+        self.subtree_workers = []
+        # dir absoluto -> (dir relativo, matchers, listagem)
+        self.directories = {}
+        self.watched_files = set()
+        self.pending_dirs = set()
+        self.pending_files = set()
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+        self.watcher.fileChanged.connect(self.on_file_changed)
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self.flush)
+
+    def set_root(self, root):
+        """Passa a observar um novo projeto (varredura em background)"""
+        self.stop()
+        self.root = os.path.abspath(root)
+        self.walker = ProjectWalker.shared(self.root)
+        self.scan_worker = ProjectWatchWorker(self.walker)
+        self.scan_worker.listings_ready.connect(self.on_listings_ready)
+        self.scan_worker.start()
+
+    def stop(self):
+        """Interrompe a varredura e remove as observações de diretórios"""
+        for worker in [self.scan_worker] + self.subtree_workers:
+            if worker and worker.isRunning():
+                worker.stop()
+        self.scan_worker = None
+        self.subtree_workers = []
+        if self.directories:
+            self.watcher.removePaths(list(self.directories))
+        self.directories = {}
+        self.pending_dirs.clear()
+
+    def watch_file(self, file_path):
+        """Observa o conteúdo de um arquivo específico (ex.: aba aberta)"""
+        file_path = os.path.abspath(file_path)
+        self.watched_files.add(file_path)
+        if os.path.exists(file_path):
+            self.watcher.addPath(file_path)
+
+    def unwatch_file(self, file_path):
+        file_path = os.path.abspath(file_path)
+        self.watched_files.discard(file_path)
+        self.watcher.removePath(file_path)
+
+    def on_listings_ready(self, listings):
+        worker = self.sender()
+        if worker is not self.scan_worker and worker not in self.subtree_workers:
+            return  # varredura de um projeto anterior
+        if worker in self.subtree_workers:
+            self.subtree_workers.remove(worker)
+            # Diretório novo: todo arquivo já presente nele foi criado
+            changes = [
+                ('created', os.path.join(abs_dir, name), '')
+                for abs_dir, (_rel, _matchers, listing) in listings.items()
+                for name, info in listing.items() if not info[3]]
+            if changes:
+                self.files_changed.emit(changes)
+        self.directories.update(listings)
+        if listings:
+            self.watcher.addPaths(list(listings))
+
+    def on_directory_changed(self, path):
+        self.pending_dirs.add(path)
+        self.flush_timer.start(self.COALESCE_MS)
+
+    def on_file_changed(self, path):
+        self.pending_files.add(path)
+        self.flush_timer.start(self.COALESCE_MS)
+
+    def forget_directory(self, abs_dir, deleted):
+        """Remove um diretório (e subdiretórios) apagado ou movido"""
+        prefix = abs_dir + os.sep
+        for known in [d for d in self.directories if d == abs_dir or d.startswith(prefix)]:
+            _rel, _matchers, listing = self.directories.pop(known)
+            self.watcher.removePath(known)
+            for name, info in listing.items():
+                if not info[3]:
+                    deleted[os.path.join(known, name)] = info[0]
+
+    def watch_new_directory(self, abs_dir, rel_dir, matchers):
+        """Varre um diretório recém-criado em background e passa a observá-lo"""
+        worker = ProjectWatchWorker(self.walker, (rel_dir, matchers))
+        worker.listings_ready.connect(self.on_listings_ready)
+        self.subtree_workers.append(worker)
+        worker.start()
+
+    def flush(self):
+        """Compara as listagens dos diretórios agendados e publica o lote"""
+        dirs, self.pending_dirs = self.pending_dirs, set()
+        files, self.pending_files = self.pending_files, set()
+        created, deleted, changes = {}, {}, []
+
+        for abs_dir in sorted(dirs):
+            known = self.directories.get(abs_dir)
+            if known is None:
+                continue
+            rel_dir, matchers, old_listing = known
+            try:
+                entries = self.walker.visible_entries(
+                    self.walker.list_directory(abs_dir), rel_dir, matchers)
+            except OSError:
+                self.forget_directory(abs_dir, deleted)
+                continue
+            listing = list_directory_entries(entries)
+            self.directories[abs_dir] = (rel_dir, matchers, listing)
+
+            for name, info in listing.items():
+                path = os.path.join(abs_dir, name)
+                previous = old_listing.get(name)
+                if previous is not None and previous[3] == info[3]:
+                    if not info[3] and previous[1:3] != info[1:3]:
+                        changes.append(('modified', path, ''))
+                    continue
+                if info[3]:
+                    child_rel = f"{rel_dir}/{name}" if rel_dir else name
+                    self.watch_new_directory(path, child_rel, matchers)
+                else:
+                    created[path] = info[0]
+
+            for name, previous in old_listing.items():
+                info = listing.get(name)
+                if info is not None and info[3] == previous[3]:
+                    continue
+                path = os.path.join(abs_dir, name)
+                if previous[3]:
+                    self.forget_directory(path, deleted)
+                else:
+                    deleted[path] = previous[0]
+
+        # Mesmo inode removido e criado no mesmo lote = renomeação
+        deleted_by_inode = {inode: path for path, inode in deleted.items() if inode}
+        for path, inode in created.items():
+            old_path = deleted_by_inode.pop(inode, None) if inode else None
+            if old_path is not None:
+                del deleted[old_path]
+                changes.append(('renamed', path, old_path))
+            else:
+                changes.append(('created', path, ''))
+        changes.extend(('deleted', path, '') for path in deleted)
+
+        # Arquivos observados diretamente (abas abertas)
+        reported = {path for _kind, path, _old in changes}
+        for path in sorted(files):
+            if path in reported:
+                continue
+            if os.path.exists(path):
+                changes.append(('modified', path, ''))
+                # Salvamentos atômicos substituem o arquivo e removem a observação
+                if path in self.watched_files and path not in self.watcher.files():
+                    self.watcher.addPath(path)
+            else:
+                changes.append(('deleted', path, ''))
+
+        if changes:
+            self.files_changed.emit(changes)
+
+
+class ProjectExplorerProxyModel(QSortFilterProxyModel):
+    """Esconde do explorador .git, __pycache__, node_modules e ambientes virtuais
+
+    Só filtra abaixo da raiz do projeto, e a ordenação é delegada ao
+    QFileSystemModel, que ordena cada pasta ao carregá-la em sua própria
+    thread, em vez de reordenar pastas gigantes na thread da GUI.
+    """
+    HIDDEN_DIRS = ('.git', '__pycache__', 'node_modules')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.root_path = ""
+        self.setDynamicSortFilter(False)
+
+    def set_root_path(self, root_path):
+        self.root_path = root_path.rstrip('/')
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self.root_path:
+            return True
+        model = self.sourceModel()
+        index = model.index(source_row, 0, source_parent)
+        if not model.isDir(index):
+            return True
+        path = model.filePath(index)
+        if not path.startswith(self.root_path + '/'):
+            return True
+        return (model.fileName(index) not in self.HIDDEN_DIRS
+                and not ProjectWalker.is_virtualenv(path))
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sourceModel().sort(column, order)
+
+
+def read_text_file(file_path, max_file_size=5 * 1024 * 1024):
+    """Lê um arquivo de texto; None se for binário, grande demais ou ilegível"""
+    try:
+        with open(file_path, 'rb') as f:
+            # Binários são descartados pelo prefixo, sem ler o resto
+            raw = f.read(8192)
+            if b'\0' in raw:
+                return None
+            raw += f.read(max(0, max_file_size + 1 - len(raw)))
+    except OSError:
+        return None
+    if len(raw) > max_file_size:
+        return None
+    return raw.decode('utf-8', errors='replace')
+
+
+def search_file_contents(file_path, regex, literal, cancel_event,
+                         max_file_size=5 * 1024 * 1024):
+    """Busca em um arquivo; retorna [(linha, coluna, texto da linha)]"""
+    if cancel_event.is_set():
+        return []
+    # Ignora arquivos binários e grandes demais
+    text = read_text_file(file_path, max_file_size)
+    if text is None:
+        return []
+
+    # Pré-filtros em C: a maioria dos arquivos é descartada por uma única
+    # busca no texto inteiro, sem dividir em linhas
+    if literal is not None and literal not in text:
+        return []
+    text = text.replace('\r\n', '\n')
+    first = regex.search(text)
+    if first is None:
+        return []
+
+    line_starts = [0]
+    position = text.find('\n')
+    while position != -1:
+        line_starts.append(position + 1)
+        position = text.find('\n', position + 1)
+
+    matches = []
+    last_line = -1
+    for match in regex.finditer(text, first.start()):
+        line_index = bisect.bisect_right(line_starts, match.start()) - 1
+        if line_index == last_line:  # uma ocorrência por linha
+            continue
+        last_line = line_index
+        line_start = line_starts[line_index]
+        line_end = (line_starts[line_index + 1] - 1
+                    if line_index + 1 < len(line_starts) else len(text))
+        matches.append((line_index + 1, match.start() - line_start,
+                        text[line_start:line_end].strip()[:300]))
+    return matches
+
+
+def extract_trigrams(text):
+    """Trigramas (minúsculos) distintos de um texto"""
+    text = text.lower()
+    return {''.join(gram) for gram in set(zip(text, text[1:], text[2:]))}
+
+
+def required_regex_literals(pattern):
+    """Trechos literais que toda ocorrência do regex obrigatoriamente contém"""
+    try:
+        import re._parser as sre_parse
+    except ImportError:
+        import sre_parse
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        return []
+
+    literals = []
+    current = []
+    for op, value in parsed:
+        if op is sre_parse.LITERAL:
+            current.append(chr(value))
+            continue
+        if current:
+            literals.append(''.join(current))
+            current = []
+    if current:
+        literals.append(''.join(current))
+    return [literal for literal in literals if len(literal) >= 3]
+
+
+class TrigramIndex:
+    """Índice persistente de trigramas do projeto para reduzir arquivos candidatos.
+
+    Remoções e alterações não limpam postings antigos: o índice só pode
+    gerar falsos positivos (que a busca verifica), nunca falsos negativos.
+    """
+    FORMAT_VERSION = 1
+
+    def __init__(self, project_path):
+        self.project_path = os.path.abspath(project_path)
+        self.files = {}  # caminho -> [id, mtime, tamanho]
+        self.paths = []  # id -> caminho (None se removido)
+        self.postings = {}  # trigrama -> set(ids)
+        self.is_ready = False
+        self.is_dirty = False
+        self.lock = threading.Lock()
+        digest = hashlib.md5(self.project_path.encode('utf-8')).hexdigest()
+        self.cache_path = os.path.join(CACHE_DIR, f"trigram_{digest}.json")
+
+    def load(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get('version') != self.FORMAT_VERSION:
+            return False
+        with self.lock:
+            self.files = data['files']
+            self.paths = data['paths']
+            self.postings = {gram: set(ids) for gram, ids in data['postings'].items()}
+        return True
+
+    def save(self):
+        # Cópias feitas sob o lock: o json.dump roda fora dele enquanto
+        # outras threads podem continuar atualizando o índice
+        with self.lock:
+            data = {
+                'version': self.FORMAT_VERSION,
+                'files': {path: list(entry) for path, entry in self.files.items()},
+                'paths': list(self.paths),
+                'postings': {gram: list(ids) for gram, ids in self.postings.items()},
+            }
+            self.is_dirty = False
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        temp_path = self.cache_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.cache_path)
+
+    def update_file(self, file_path, stat=None):
+        """(Re)indexa um arquivo; chamado no build, ao salvar e por eventos de arquivo"""
+        file_path = os.path.abspath(file_path)
+        try:
+            stat = stat or os.stat(file_path)
+        except OSError:
+            self.remove_file(file_path)
+            return
+        text = read_text_file(file_path)
+        # Binários e arquivos grandes demais ficam registrados sem trigramas:
+        # contam como atualizados e não são relidos a cada busca
+        grams = extract_trigrams(text) if text is not None else ()
+
+        with self.lock:
+            entry = self.files.get(file_path)
+            if entry is None:
+                entry = [len(self.paths), 0, 0]
+                self.paths.append(file_path)
+                self.files[file_path] = entry
+            entry[1], entry[2] = stat.st_mtime, stat.st_size
+            file_id = entry[0]
+            for gram in grams:
+                self.postings.setdefault(gram, set()).add(file_id)
+            self.is_dirty = True
+
+    def remove_file(self, file_path):
+        file_path = os.path.abspath(file_path)
+        with self.lock:
+            entry = self.files.pop(file_path, None)
+            if entry is not None:
+                self.paths[entry[0]] = None
+                self.is_dirty = True
+
+    def is_current(self, file_path, stat):
+        entry = self.files.get(file_path)
+        return entry is not None and entry[1] == stat.st_mtime and entry[2] == stat.st_size
+
+    def candidates(self, pattern, use_regex=False):
+        """Arquivos que podem conter o padrão, ou None se o índice não ajuda"""
+        if not self.is_ready:
+            return None
+        literals = required_regex_literals(pattern) if use_regex else [pattern]
+        grams = set()
+        for literal in literals:
+            grams |= extract_trigrams(literal)
+        if not grams:
+            return None
+
+        with self.lock:
+            ids = None
+            for gram in sorted(grams, key=lambda g: len(self.postings.get(g, ()))):
+                posting = self.postings.get(gram)
+                if not posting:
+                    return []
+                ids = set(posting) if ids is None else ids & posting
+                if not ids:
+                    return []
+            return [self.paths[i] for i in ids if self.paths[i] is not None]
+
+
+class TrigramIndexWorker(QThread):
+    """Carrega o índice salvo, o sincroniza com o disco e o grava em background
+
+    Depois de pronto, continua vivo gravando as atualizações (watcher e
+    escritas do IDE) a cada SAVE_INTERVAL_S e uma última vez ao parar, para
+    que a serialização nunca rode na thread da GUI.
+    """
+    index_ready = QSignal(int)  # arquivos indexados
+    SAVE_INTERVAL_S = 60
+
+    def __init__(self, index):
+        super().__init__()
+        self.index = index
+        self.cancel_event = threading.Event()
+
+    def stop(self):
+        self.cancel_event.set()
+        self.wait()
+
+    def save_if_dirty(self):
+        if not self.index.is_dirty:
+            return
+        try:
+            self.index.save()
+        except OSError as e:
+            print(f"Erro ao salvar índice de trigramas: {e}")
+
+    def run(self):
+        index = self.index
+        index.load()
+        seen = set()
+        for file_path, _size in ProjectWalker.shared(index.project_path).iter_files(self.cancel_event):
+            seen.add(file_path)
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            if not index.is_current(file_path, stat):
+                index.update_file(file_path, stat)
+
+        if self.cancel_event.is_set():
+            return
+        for file_path in list(index.files):
+            if file_path not in seen:
+                index.remove_file(file_path)
+
+        index.is_ready = True
+        self.save_if_dirty()
+        self.index_ready.emit(len(index.files))
+
+        while not self.cancel_event.wait(self.SAVE_INTERVAL_S):
+            self.save_if_dirty()
+        self.save_if_dirty()
+
+
+def compile_search_regex(pattern, case_sensitive=False, whole_word=False, use_regex=False):
+    """Compila o padrão de busca conforme as opções (pode lançar re.error)
+
+    MULTILINE: a busca roda no texto inteiro, e ^/$ continuam valendo por linha.
+    """
+    pattern = pattern if use_regex else re.escape(pattern)
+    if whole_word:
+        pattern = r'\b' + pattern + r'\b'
+    return re.compile(
+        pattern, re.MULTILINE | (0 if case_sensitive else re.IGNORECASE))
+
+
+class FindInFilesWorker(QThread):
+    """Busca texto no projeto em paralelo, emitindo resultados à medida que chegam"""
+    matches_found = QSignal(list)  # [(caminho, linha, coluna, texto)]
+    search_finished = QSignal(int, int)  # arquivos pesquisados, total de ocorrências
+    MAX_RESULTS = 20000
+    MAX_IN_FLIGHT = 256
+
+    def __init__(self, root, pattern, case_sensitive=False, whole_word=False,
+                 use_regex=False, trigram_index=None):
+        super().__init__()
+        self.root = root
+        self.trigram_index = trigram_index
+        self.pattern = pattern
+        self.case_sensitive = case_sensitive
+        self.whole_word = whole_word
+        self.use_regex = use_regex
+        self.cancel_event = threading.Event()
+
+    def stop(self):
+        self.cancel_event.set()
+        self.wait(2000)
+
+    def run(self):
+        try:
+            regex = compile_search_regex(
+                self.pattern, self.case_sensitive, self.whole_word, self.use_regex)
+        except re.error:
+            self.search_finished.emit(0, 0)
+            return
+
+        # Pré-filtro literal só é seguro sem regex e com diferenciação de caixa
+        literal = self.pattern if not self.use_regex and self.case_sensitive else None
+        candidates = None
+        if self.trigram_index is not None:
+            candidates = self.trigram_index.candidates(self.pattern, self.use_regex)
+        if candidates is not None:
+            files = self.iter_index_candidates(candidates)
+        else:
+            files = ProjectWalker.shared(self.root).iter_files(self.cancel_event)
+        self.total = 0
+        self.searched = 0
+        self.batch = []
+        self.last_emit = time.monotonic()
+
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(16, (os.cpu_count() or 2) * 2)) as executor:
+            pending = {}
+            # Submete enquanto percorre, limitando as tarefas em voo para que
+            # os resultados comecem a chegar antes do fim da varredura
+            for file_path, _size in files:
+                if self.cancel_event.is_set():
+                    break
+                pending[executor.submit(
+                    search_file_contents, file_path, regex, literal,
+                    self.cancel_event)] = file_path
+                if len(pending) >= self.MAX_IN_FLIGHT:
+                    done, _ = concurrent.futures.wait(
+                        pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    self.collect(done, pending)
+
+            while pending and not self.cancel_event.is_set():
+                done, _ = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                self.collect(done, pending)
+
+            for future in pending:
+                future.cancel()
+
+        if self.batch:
+            self.matches_found.emit(self.batch)
+        self.search_finished.emit(self.searched, self.total)
+
+    def iter_index_candidates(self, candidates):
+        """Candidatos do índice, seguidos dos arquivos que o índice ainda não reflete
+
+        Arquivos novos ou alterados depois da indexação (evento perdido,
+        índice em construção) não estão nos postings e são verificados direto.
+        """
+        for file_path in candidates:
+            yield file_path, 0
+        candidates = set(candidates)
+        for file_path, size in ProjectWalker.shared(self.root).iter_files(self.cancel_event):
+            if file_path in candidates:
+                continue
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            if not self.trigram_index.is_current(file_path, stat):
+                yield file_path, size
+
+    def collect(self, done, pending):
+        """Recolhe tarefas concluídas e emite lotes de resultados"""
+        for future in done:
+            file_path = pending.pop(future)
+            self.searched += 1
+            for line_number, column, line_text in future.result():
+                self.batch.append((file_path, line_number, column, line_text))
+                self.total += 1
+
+        if self.total >= self.MAX_RESULTS:
+            self.cancel_event.set()
+        if self.batch and (len(self.batch) >= 200 or time.monotonic() - self.last_emit > 0.1):
+            self.matches_found.emit(self.batch)
+            self.batch = []
+            self.last_emit = time.monotonic()
+
+
+def replace_in_file(file_path, regex, replacement, line_numbers=None):
+    """Substitui em um arquivo no disco (escrita atômica); retorna a quantidade"""
+    encoding = detect_file_encoding(file_path)
+    with open(file_path, 'r', encoding=encoding, newline='') as f:
+        text = f.read()
+    new_text, count = replace_in_lines(text, regex, replacement, line_numbers)
+    if count:
+        temp_path = file_path + '.pydragon-tmp'
+        with open(temp_path, 'w', encoding=encoding, newline='') as f:
+            f.write(new_text)
+        shutil.copymode(file_path, temp_path)
+        os.replace(temp_path, file_path)
+    return count
+
+
+class ProjectReplaceWorker(QThread):
+    """Aplica a substituição em vários arquivos do disco em paralelo"""
+    replace_finished = QSignal(int, int, list)  # arquivos, ocorrências, erros
+
+    def __init__(self, files, regex, replacement, trigram_index=None):
+        super().__init__()
+        self.files = files  # caminho -> linhas escolhidas na prévia
+        self.regex = regex
+        self.replacement = replacement
+        self.trigram_index = trigram_index
+
+    def run(self):
+        changed_files = 0
+        replacements = 0
+        errors = []
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(16, (os.cpu_count() or 2) * 2)) as executor:
+            futures = {
+                executor.submit(replace_in_file, file_path, self.regex,
+                                self.replacement, line_numbers): file_path
+                for file_path, line_numbers in self.files.items()
+            }
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    count = future.result()
+                except Exception as e:
+                    errors.append(f"{futures[future]}: {e}")
+                    continue
+                if count:
+                    changed_files += 1
+                    replacements += count
+                    if self.trigram_index is not None:
+                        self.trigram_index.update_file(futures[future])
+        self.replace_finished.emit(changed_files, replacements, errors)
+
+
+class FindInFilesModel(QAbstractListModel):
+    """Modelo de resultados: a view só renderiza as linhas visíveis"""
+
+    def __init__(self, root, parent=None):
+        super().__init__(parent)
+        self.root = root
+        self.results = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.results)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        file_path, line_number, _column, line_text = self.results[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{os.path.relpath(file_path, self.root)}:{line_number}:  {line_text}"
+        if role == Qt.UserRole:
+            return file_path, line_number
+        return None
+
+    def append_results(self, results):
+        first = len(self.results)
+        self.beginInsertRows(QModelIndex(), first, first + len(results) - 1)
+        self.results.extend(results)
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.results = []
+        self.endResetModel()
+
+
+class ReplacePreviewDialog(QDialog):
+    """Prévia da substituição em arquivos: cada linha antes/depois, marcável"""
+    COLUMNS = ["Linha", "Antes", "Depois"]
+    MAX_PREVIEW_CHARS = 200
+
+    def __init__(self, parent, root, previews, pattern, replacement):
+        super().__init__(parent)
+        self.setWindowTitle("🔁 Prévia da Substituição")
+        self.resize(1000, 600)
+
+        layout = QVBoxLayout()
+        total = sum(len(lines) for lines in previews.values())
+        info_label = QLabel(
+            f"Substituir '{pattern}' por '{replacement}' em {total} linha(s) de "
+            f"{len(previews)} arquivo(s). Desmarque arquivos ou linhas para mantê-los.")
+        info_label.setWordWrap(True)
+        layout.addWidget(info_label)
+
+        self.tree = QTreeWidget()
+        self.tree.setColumnCount(len(self.COLUMNS))
+        self.tree.setHeaderLabels(self.COLUMNS)
+        self.tree.setUniformRowHeights(True)
+        for file_path, lines in previews.items():
+            file_item = QTreeWidgetItem(
+                self.tree, [f"{os.path.relpath(file_path, root)} ({len(lines)})"])
+            file_item.setFlags(
+                file_item.flags() | Qt.ItemIsUserCheckable | Qt.ItemIsAutoTristate)
+            file_item.setCheckState(0, Qt.Checked)
+            file_item.setData(0, Qt.UserRole, file_path)
+            file_item.setFirstColumnSpanned(True)
+            for line_number, before, after in lines:
+                item = QTreeWidgetItem(
+                    file_item, [str(line_number), self.clip(before), self.clip(after)])
+                item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+                item.setCheckState(0, Qt.Checked)
+                item.setData(0, Qt.UserRole, line_number)
+                item.setForeground(1, QColor(200, 80, 80))
+                item.setForeground(2, QColor(70, 160, 70))
+        self.tree.expandAll()
+        self.tree.resizeColumnToContents(0)
+        layout.addWidget(self.tree)
+
+        buttons = QHBoxLayout()
+        apply_btn = QPushButton("🔁 Substituir Marcadas")
+        apply_btn.clicked.connect(self.accept)
+        cancel_btn = QPushButton("Cancelar")
+        cancel_btn.clicked.connect(self.reject)
+        buttons.addStretch()
+        buttons.addWidget(apply_btn)
+        buttons.addWidget(cancel_btn)
+        layout.addLayout(buttons)
+
+        self.setLayout(layout)
+
+    def clip(self, text):
+        text = text.strip()
+        if len(text) > self.MAX_PREVIEW_CHARS:
+            text = text[:self.MAX_PREVIEW_CHARS] + "..."
+        return text
+
+    def selected_lines(self):
+        """caminho -> linhas marcadas (arquivos sem nenhuma ficam de fora)"""
+        selected = {}
+        for i in range(self.tree.topLevelItemCount()):
+            file_item = self.tree.topLevelItem(i)
+            lines = {
+                file_item.child(j).data(0, Qt.UserRole)
+                for j in range(file_item.childCount())
+                if file_item.child(j).checkState(0) == Qt.Checked}
+            if lines:
+                selected[file_item.data(0, Qt.UserRole)] = lines
+        return selected
+
+
+class FindInFilesDialog(QDialog):
+    """Busca de texto em todos os arquivos do projeto (Find in Files)"""
+
+    def __init__(self, workspace_path, parent=None):
+        super().__init__(parent)
+        self.workspace_path = workspace_path
+        self.search_worker = None
+        self.setWindowTitle("Buscar em Arquivos")
+        self.setGeometry(250, 250, 900, 600)
+
+        # Debounce: cada nova consulta cancela a anterior
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self.start_search)
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout()
+
+        search_layout = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Texto ou expressão regular...")
+        self.search_input.textChanged.connect(self.schedule_search)
+        search_layout.addWidget(QLabel("Buscar:"))
+        search_layout.addWidget(self.search_input)
+        layout.addLayout(search_layout)
+
+        options_layout = QHBoxLayout()
+        self.case_sensitive = QCheckBox("Diferenciar maiúsculas/minúsculas")
+        self.whole_word = QCheckBox("Palavra inteira")
+        self.regex_mode = QCheckBox("Expressão regular")
+        for checkbox in (self.case_sensitive, self.whole_word, self.regex_mode):
+            checkbox.stateChanged.connect(self.schedule_search)
+            options_layout.addWidget(checkbox)
+        options_layout.addStretch()
+        layout.addLayout(options_layout)
+
+        replace_layout = QHBoxLayout()
+        self.replace_input = QLineEdit()
+        self.replace_input.setPlaceholderText("Substituir por...")
+        replace_layout.addWidget(QLabel("Substituir:"))
+        replace_layout.addWidget(self.replace_input)
+        self.replace_button = QPushButton("Substituir em Arquivos...")
+        self.replace_button.clicked.connect(self.replace_in_files)
+        replace_layout.addWidget(self.replace_button)
+        layout.addLayout(replace_layout)
+
+        self.status_label = QLabel("Digite para buscar no projeto")
+        layout.addWidget(self.status_label)
+
+        self.results_model = FindInFilesModel(self.workspace_path, self)
+        self.results_view = QListView()
+        self.results_view.setUniformItemSizes(True)
+        self.results_view.setModel(self.results_model)
+        self.results_view.doubleClicked.connect(self.open_result)
+        layout.addWidget(self.results_view)
+
+        self.setLayout(layout)
+
+    def schedule_search(self):
+        self.search_timer.start(300)
+
+    def cancel_search(self):
+        if self.search_worker and self.search_worker.isRunning():
+            self.search_worker.matches_found.disconnect(self.results_model.append_results)
+            self.search_worker.stop()
+        self.search_worker = None
+
+    def start_search(self):
+        self.cancel_search()
+        self.results_model.clear()
+
+        pattern = self.search_input.text()
+        if not pattern:
+            self.status_label.setText("Digite para buscar no projeto")
+            return
+
+        self.status_label.setText("⏳ Buscando...")
+        self.search_started_at = time.monotonic()
+
+        self.search_worker = FindInFilesWorker(
+            self.workspace_path, pattern,
+            case_sensitive=self.case_sensitive.isChecked(),
+            whole_word=self.whole_word.isChecked(),
+            use_regex=self.regex_mode.isChecked(),
+            trigram_index=self.project_trigram_index())
+        self.search_worker.matches_found.connect(self.results_model.append_results)
+        self.search_worker.search_finished.connect(self.on_search_finished)
+        self.search_worker.start()
+
+    def project_trigram_index(self):
+        """Índice de trigramas do IDE, se for do projeto desta busca"""
+        index = getattr(self.parent(), 'trigram_index', None)
+        if index is not None and index.project_path == os.path.abspath(self.workspace_path):
+            return index
+        return None
+
+    def on_search_finished(self, searched, total):
+        if self.sender() is not self.search_worker:
+            return
+        elapsed = time.monotonic() - self.search_started_at
+        limit = " (limite atingido)" if total >= FindInFilesWorker.MAX_RESULTS else ""
+        self.status_label.setText(
+            f"✅ {total} ocorrência(s) em {searched} arquivo(s) — {elapsed:.2f}s{limit}")
+
+    def replace_in_files(self):
+        """Mostra a prévia da substituição e aplica nos arquivos encontrados"""
+        pattern = self.search_input.text()
+        if not pattern or not self.results_model.results:
+            return
+        if self.search_worker and self.search_worker.isRunning():
+            self.status_label.setText("⏳ Aguarde o fim da busca para substituir")
+            return
+
+        replacement = self.replace_input.text()
+        regex = compile_search_regex(
+            pattern, self.case_sensitive.isChecked(),
+            self.whole_word.isChecked(), self.regex_mode.isChecked())
+
+        # Arquivos abertos são alterados no editor (desfazível); os demais no disco
+        open_tabs = {}
+        ide = self.parent()
+        if hasattr(ide, 'tab_widget'):
+            for i in range(ide.tab_widget.count()):
+                widget = ide.tab_widget.widget(i)
+                if isinstance(widget, EditorTab) and widget.file_path:
+                    open_tabs[os.path.abspath(widget.file_path)] = widget
+
+        # Prévia por linha, sobre o conteúdo atual (o do editor, se aberto)
+        previews = {}
+        for file_path in dict.fromkeys(path for path, *_ in self.results_model.results):
+            tab = open_tabs.get(os.path.abspath(file_path))
+            text = tab.editor.snapshot().text() if tab is not None else read_text_file(file_path)
+            if text is None:
+                continue
+            lines = preview_line_replacements(text, regex, replacement)
+            if lines:
+                previews[file_path] = lines
+        if not previews:
+            self.status_label.setText("Nada a substituir")
+            return
+
+        dialog = ReplacePreviewDialog(
+            self, self.workspace_path, previews, pattern, replacement)
+        if not dialog.exec():
+            return
+        selected = dialog.selected_lines()
+        if not selected:
+            return
+
+        disk_files = {}
+        for file_path, line_numbers in selected.items():
+            tab = open_tabs.get(os.path.abspath(file_path))
+            if tab is not None:
+                old_text = tab.editor.snapshot().text()
+                new_text, _count = replace_in_lines(
+                    old_text, regex, replacement, line_numbers)
+                apply_text_minimal_edit(tab.editor, new_text, old_text)
+            else:
+                disk_files[file_path] = line_numbers
+
+        self.replace_button.setEnabled(False)
+        self.status_label.setText("⏳ Substituindo...")
+        self.replace_worker = ProjectReplaceWorker(
+            disk_files, regex, replacement, self.project_trigram_index())
+        self.replace_worker.replace_finished.connect(self.on_replace_finished)
+        self.replace_worker.start()
+
+    def on_replace_finished(self, changed_files, replacements, errors):
+        self.replace_button.setEnabled(True)
+        self.status_label.setText(
+            f"✅ {replacements} substituição(ões) em {changed_files} arquivo(s) no disco"
+            " (arquivos abertos foram alterados no editor)")
+        if errors:
+            QMessageBox.warning(
+                self, "Erros na substituição", '\n'.join(errors[:20]))
+        self.start_search()
+
+    def open_result(self, index):
+        file_path, line_number = self.results_model.data(index, Qt.UserRole)
+        if hasattr(self.parent(), 'open_file_at_line'):
+            self.parent().open_file_at_line(file_path, line_number)
+
+    def closeEvent(self, event):
+        self.cancel_search()
+        super().closeEvent(event)
+
+
+def fuzzy_score(query, path):
+    """Pontuação estilo fzf (query e path já em minúsculas); None se não casar"""
+    path_length = len(path)
+    name_start = path.rfind('/') + 1
+    score = 0
+    position = 0
+    previous = -2
+    for char in query:
+        found = path.find(char, position)
+        if found == -1:
+            return None
+        score += 16
+        if found == 0 or path[found - 1] in '/_-. ':
+            score += 10  # início de palavra/segmento
+        if found == previous + 1:
+            score += 8  # caracteres consecutivos
+        else:
+            score -= min(found - position, 10)  # penaliza lacunas
+        if found >= name_start:
+            score += 4  # casou no nome do arquivo
+        previous = found
+        position = found + 1
+    return score - path_length // 16
+
+
+class ProjectFileIndex:
+    """Lista de arquivos do projeto em memória para o localizador fuzzy.
+
+    Os caminhos ficam também concatenados em um único texto em minúsculas,
+    varrido por regex (em C) para achar candidatos; só eles são pontuados.
+    """
+    MAX_RESULTS = 200
+    SCAN_LIMIT = 1000  # candidatos pontuados por etapa de varredura
+    NARROW_LIMIT = 5000  # guarda os candidatos para refinar a próxima tecla
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.paths = []  # relativos, com '/', ordenados
+        self.is_ready = False
+        self.lock = threading.Lock()
+        self._blob = '\n'
+        self._by_lower = {}
+        self._last_query = None
+        self._last_blob = None
+
+    def build(self, cancel_event=None):
+        paths = sorted(
+            os.path.relpath(file_path, self.root).replace(os.sep, '/')
+            for file_path, _size in ProjectWalker.shared(self.root).iter_files(cancel_event))
+        with self.lock:
+            self.paths = paths
+            self._rebuild_blob()
+            self.is_ready = True
+
+    def _rebuild_blob(self):
+        lower_paths = [path.lower() for path in self.paths]
+        self._blob = '\n' + '\n'.join(lower_paths)
+        self._by_lower = dict(zip(lower_paths, self.paths))
+        self._last_query = None
+        self._last_blob = None
+
+    def add_path(self, file_path):
+        rel_path = os.path.relpath(file_path, self.root).replace(os.sep, '/')
+        with self.lock:
+            index = bisect.bisect_left(self.paths, rel_path)
+            if index < len(self.paths) and self.paths[index] == rel_path:
+                return
+            self.paths.insert(index, rel_path)
+            self._rebuild_blob()
+
+    def remove_path(self, file_path):
+        rel_path = os.path.relpath(file_path, self.root).replace(os.sep, '/')
+        with self.lock:
+            index = bisect.bisect_left(self.paths, rel_path)
+            if index < len(self.paths) and self.paths[index] == rel_path:
+                del self.paths[index]
+                self._rebuild_blob()
+
+    @staticmethod
+    def _scan(blob, pattern, limit):
+        lines = []
+        for match in re.finditer(pattern, blob):
+            lines.append(match.group(1))
+            if len(lines) >= limit:
+                break
+        return lines
+
+    @staticmethod
+    def _find_in_names(blob, query, limit):
+        """Caminhos cujo nome de arquivo contém a query literalmente"""
+        lines = []
+        position = 0
+        while len(lines) < limit:
+            found = blob.find(query, position)
+            if found == -1:
+                break
+            line_start = blob.rfind('\n', 0, found) + 1
+            line_end = blob.find('\n', found)
+            if line_end == -1:
+                line_end = len(blob)
+            if '/' not in blob[found:line_end]:
+                lines.append(blob[line_start:line_end])
+            position = line_end
+        return lines
+
+    def search(self, query, limit=MAX_RESULTS):
+        """Melhores caminhos relativos para a query, do mais relevante ao menos"""
+        query = query.strip().lower().replace('\\', '/').replace(' ', '')
+        if not query:
+            return []
+
+        with self.lock:
+            # Caractere inexistente no projeto: nenhum caminho pode casar
+            if any(char not in self._blob for char in set(query)):
+                return []
 
-        package_data = current_item.data(Qt.UserRole)
-        package_name = package_data['name']
+            # Ao digitar mais caracteres, só os candidatos anteriores podem casar
+            blob = self._blob
+            if (self._last_blob is not None and self._last_query
+                    and query.startswith(self._last_query)):
+                blob = self._last_blob
 
-        reply = QMessageBox.question(
-            self, "Confirmar",
-            f"Desinstalar o pacote {package_name}?"
-        )
-        if reply == QMessageBox.Yes:
-            self.output_text.append(f"🗑️ Desinstalando {package_name}")
-            self.thread = PackageManagerThread("uninstall", package_name)
-            self.thread.finished_signal.connect(self.on_operation_finished)
-            self.thread.progress_signal.connect(self.update_progress_text)
-            self.thread.start()
+            # Subsequência sem backtracking: cada classe negada para no
+            # primeiro caractere procurado
+            subsequence = ''.join(
+                f'[^\n{re.escape(char)}]*{re.escape(char)}' for char in query)
+            matches = self._scan(blob, f'\n({subsequence}[^\n]*)', self.NARROW_LIMIT)
+            self._last_query = query
+            self._last_blob = (
+                '\n' + '\n'.join(matches) if len(matches) < self.NARROW_LIMIT else None)
 
-    def upgrade_package(self):
-        """Atualiza pacote selecionado"""
-        current_item = self.packages_list.currentItem()
-        if not current_item:
-            QMessageBox.warning(self, "Aviso", "Selecione um pacote da lista!")
-            return
+            # Prioriza ocorrências contíguas no nome do arquivo
+            in_name = self._find_in_names(blob, query, self.SCAN_LIMIT)
+            candidates = dict.fromkeys(in_name + matches[:self.SCAN_LIMIT])
 
-        package_data = current_item.data(Qt.UserRole)
-        package_name = package_data['name']
+            best = heapq.nlargest(
+                limit, candidates, key=lambda path: fuzzy_score(query, path))
+            return [self._by_lower[path] for path in best]
 
-        self.output_text.append(f"🔄 Atualizando {package_name}")
-        self.thread = PackageManagerThread("upgrade", package_name)
-        self.thread.finished_signal.connect(self.on_operation_finished)
-        self.thread.progress_signal.connect(self.update_progress_text)
-        self.thread.start()
 
-    def package_selected(self, item):
-        """Quando um pacote é selecionado na lista"""
-        package_data = item.data(Qt.UserRole)
-        self.package_input.setText(package_data['name'])
+class FileIndexWorker(QThread):
+    """Constrói o ProjectFileIndex em background ao abrir um projeto"""
+    index_ready = QSignal(int)
 
-        info_text = f"<b>{package_data['name']}</b> (v{package_data['version']})"
-        self.package_info.setText(info_text)
+    def __init__(self, file_index):
+        super().__init__()
+        self.file_index = file_index
+        self.cancel_event = threading.Event()
 
-    def on_operation_finished(self, success, message):
-        """Quando uma operação é finalizada"""
-        self.progress_bar.setVisible(False)
+    def stop(self):
+        self.cancel_event.set()
+        self.wait(2000)
 
-        if success:
-            self.output_text.append("✅ " + message)
-            self.refresh_packages()  # Atualiza lista após operação
-        else:
-            self.output_text.append("❌ " + message)
+    def run(self):
+        self.file_index.build(self.cancel_event)
+        if not self.cancel_event.is_set():
+            self.index_ready.emit(len(self.file_index.paths))
 
-    def update_progress_text(self, message):
-        """Atualiza texto de progresso"""
-        self.output_text.append("➡️ " + message)
 
 class FindFilesDialog(QDialog):
-    def __init__(self, workspace_path, parent=None):
+    def __init__(self, workspace_path, parent=None, file_index=None):
         super().__init__(parent)
         self.workspace_path = workspace_path
+        self.file_index = file_index or ProjectFileIndex(workspace_path)
         self.setWindowTitle("Buscar Arquivos por Nome")
         self.setGeometry(300, 300, 700, 500)
         self.setup_ui()
 
+        if not self.file_index.is_ready:
+            self.results_label.setText("⏳ Indexando arquivos do projeto...")
+            worker = getattr(parent, 'file_index_worker', None)
+            if (worker is None or worker.file_index is not self.file_index
+                    or not worker.isRunning()):
+                worker = FileIndexWorker(self.file_index)
+                self.file_index_worker = worker
+                worker.index_ready.connect(self.on_index_ready)
+                worker.start()
+            else:
+                worker.index_ready.connect(self.on_index_ready)
+                # O build pode ter terminado antes da conexão
+                if self.file_index.is_ready:
+                    self.on_index_ready(len(self.file_index.paths))
+
     def setup_ui(self):
         layout = QVBoxLayout()
 
@@ -5798,36 +10311,43 @@ class FindFilesDialog(QDialog):
         self.filename_input = QLineEdit()
         self.filename_input.setPlaceholderText("Digite parte do nome do arquivo...")
         self.filename_input.textChanged.connect(self.search_files)
+        self.filename_input.returnPressed.connect(self.open_first_result)
         search_layout.addWidget(QLabel("Nome do arquivo:"))
         search_layout.addWidget(self.filename_input)
 
         layout.addLayout(search_layout)
 
-        # Lista de resultados
-        self.results_list = QListWidget()
-        self.results_list.itemDoubleClicked.connect(self.open_file)
-        layout.addWidget(QLabel("Arquivos Encontrados:"))
+        # Lista de resultados (model/view)
+        self.results_model = QStringListModel(self)
+        self.results_list = QListView()
+        self.results_list.setUniformItemSizes(True)
+        self.results_list.setModel(self.results_model)
+        self.results_list.doubleClicked.connect(self.open_file)
+        self.results_label = QLabel("Arquivos Encontrados:")
+        layout.addWidget(self.results_label)
         layout.addWidget(self.results_list)
 
         self.setLayout(layout)
 
-    def search_files(self):
-        search_text = self.filename_input.text().strip().lower()
-        self.results_list.clear()
+    def on_index_ready(self, count):
+        self.results_label.setText(f"Arquivos Encontrados ({count} no projeto):")
+        self.search_files()
 
-        if not search_text:
+    def search_files(self):
+        search_text = self.filename_input.text().strip()
+        if not search_text or not self.file_index.is_ready:
+            self.results_model.setStringList([])
             return
 
-        for root, dirs, files in os.walk(self.workspace_path):
-            for file in files:
-                if search_text in file.lower():
-                    full_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(full_path, self.workspace_path)
-                    self.results_list.addItem(relative_path)
+        self.results_model.setStringList(self.file_index.search(search_text))
 
-    def open_file(self, item):
+    def open_first_result(self):
+        if self.results_model.rowCount():
+            self.open_file(self.results_model.index(0))
+
+    def open_file(self, index):
         """Abre o arquivo selecionado no IDE pai"""
-        file_path = os.path.join(self.workspace_path, item.text())
+        file_path = os.path.join(self.workspace_path, index.data())
         if os.path.exists(file_path):
             # Emitir sinal ou chamar método para abrir o arquivo
             if hasattr(self.parent(), 'open_file'):
@@ -5836,6 +10356,12 @@ class FindFilesDialog(QDialog):
         else:
             print(f"Arquivo não encontrado: {file_path}")  # Log para debug
 
+    def closeEvent(self, event):
+        worker = getattr(self, 'file_index_worker', None)
+        if worker and worker.isRunning():
+            worker.stop()
+        super().closeEvent(event)
+
 class SymbolCollector(ast.NodeVisitor):
     """Coletor de símbolos via AST - COMPLETA"""
 
@@ -6107,19 +10633,92 @@ class FindSimilarDialog(QDialog):
 class IDE(QMainWindow):
     def __init__(self):
         super().__init__()
-        self._initialize_variables()
-        self.setup_managers()
-        self.setup_ui()
-        self.setup_connections()
-        self.setup_shortcuts()
-		
-        # Inicializar plugins APÓS a UI estar completamente
-        # configurada
-        QTimer.singleShot(100, self.setup_plugin_system)
+        # Cada fase é medida no modo --profile-startup
+        for step in (self._initialize_variables, self.setup_managers,
+                     self.setup_ui, self.setup_connections,
+                     self.setup_shortcuts,
+                     # Sessão anterior: só a aba ativa é construída antes de exibir
+                     self.restore_session):
+            with startup_profiler.phase(step.__name__):
+                step()
+
+        # Shell, detecção de Python e plugins ficam para depois da
+        # primeira pintura (com um timer de segurança caso ela não ocorra)
+        self.tab_widget.installEventFilter(self)
+        QTimer.singleShot(1000, self.run_deferred_startup)
 
         # Configuração global de exceções
         sys.excepthook = self.exception_hook
 
+    def eventFilter(self, obj, event):
+        if (obj is self.tab_widget and event.type() == QEvent.Paint
+                and not self.deferred_startup_done):
+            QTimer.singleShot(0, self.run_deferred_startup)
+        return super().eventFilter(obj, event)
+
+    def run_deferred_startup(self):
+        """Inicia as tarefas adiadas, uma por iteração do loop de eventos"""
+        if self.deferred_startup_done:
+            return
+        self.deferred_startup_done = True
+        self.tab_widget.removeEventFilter(self)
+
+        startup_profiler.mark('first_paint')
+        if startup_profiler.enabled:
+            # Os módulos adiados não devem ser carregados antes da janela
+            eager = [name for name in LAZY_MODULES if name in sys.modules]
+            if eager:
+                startup_profiler.note(
+                    "Módulos adiados carregados antes da primeira pintura: "
+                    + ", ".join(eager))
+        # Só reporta quando pedido (--profile-startup) ou acima da meta
+        elapsed_ms = (time.perf_counter() - STARTUP_TIME) * 1000
+        over_budget = elapsed_ms > FIRST_PAINT_BUDGET_MS
+        if startup_profiler.enabled or over_budget:
+            budget_note = f" (acima da meta de {FIRST_PAINT_BUDGET_MS} ms)" if over_budget else ""
+            print(f"⏱ Primeira pintura em {elapsed_ms:.0f} ms{budget_note}")
+
+        self.stall_watchdog.start()
+        self.deferred_startup_tasks = [
+            self.start_shell,
+            self.activate_project,
+            self.check_python_version,
+            self.scan_python_versions,
+            self.setup_plugin_system,
+        ]
+        QTimer.singleShot(0, self.run_next_deferred_task)
+
+    def run_next_deferred_task(self):
+        if not self.deferred_startup_tasks:
+            if startup_profiler.enabled:
+                self.finish_startup_profile()
+            return
+        task = self.deferred_startup_tasks.pop(0)
+        try:
+            with startup_profiler.phase(task.__name__, 'deferred'):
+                task()
+        except Exception as e:
+            print(f"❌ Erro na inicialização adiada ({task.__name__}): {e}")
+        QTimer.singleShot(0, self.run_next_deferred_task)
+
+    def finish_startup_profile(self):
+        """Grava o relatório do modo --profile-startup e encerra o IDE"""
+        startup_profiler.mark('startup_done')
+        output_dir = os.path.join(CACHE_DIR, "startup_profiles")
+        try:
+            report_path, trace_path = startup_profiler.write_report(output_dir)
+            print(f"⏱ Relatório de inicialização: {report_path}")
+            print(f"⏱ Trace (chrome://tracing): {trace_path}")
+        except OSError as e:
+            print(f"❌ Erro ao gravar o perfil de inicialização: {e}")
+        QTimer.singleShot(0, self.close)
+
+    def scan_python_versions(self):
+        """Detecta os interpretadores instalados em background"""
+        threading.Thread(
+            target=self.python_version_manager.scan_installed_versions,
+            daemon=True).start()
+
     def exception_hook(self, exctype, value, tb):
         """Captura exceções globais"""
         print("ERRO GLOBAL:", exctype, value)
@@ -6132,6 +10731,11 @@ class IDE(QMainWindow):
             self.plugin_manager = PluginManager(
                 self)
             self.plugin_manager.load_plugins()
+            # Arquivos já abertos (sessão restaurada) disparam onLanguage
+            for i in range(self.tab_widget.count()):
+                widget = self.tab_widget.widget(i)
+                if isinstance(widget, EditorTab) and widget.file_path:
+                    self.plugin_manager.fire_file_opened(widget.file_path)
             self.integrate_plugins()
             print(
                 "🔌 Sistema de plugins inicializado com sucesso")
@@ -6145,7 +10749,8 @@ class IDE(QMainWindow):
         self.theme_manager = ThemeManager()
         self.indentation_checker = IndentationChecker()
         self.language_config = LanguageConfig()
-        self.language_syntax_manager = LanguageSyntaxManager()
+        # Reaproveita a instância global em vez de montar outra
+        self.language_syntax_manager = language_syntax_manager
 
         # Gerenciador de cache global
         global module_cache_manager
@@ -6171,6 +10776,44 @@ class IDE(QMainWindow):
         self.auto_complete_worker = None
         self.debug_worker = None
 
+        # Índice de arquivos do projeto (localizador fuzzy)
+        self.file_index = None
+        self.file_index_worker = None
+
+        # Índice de trigramas (opcional) para busca no projeto
+        self.trigram_index = None
+        self.trigram_index_worker = None
+        self.trigram_index_enabled = False
+
+        # Observador de arquivos do projeto (criado em setup_file_watcher)
+        self.file_watcher = None
+
+        # Abas de resultados dos profilers (criadas na primeira execução)
+        self.profiler_tab = None
+        self.memory_profiler_tab = None
+        self.memory_profiler_session = None
+
+        # Detector de travamentos do loop de eventos (inicia após a primeira pintura)
+        self.stall_watchdog = EventLoopWatchdog(self)
+
+        # Processo de plugins, criado ao ativar um plugin "host": "process";
+        # recebe o snapshot da aba ativa após uma pausa na digitação
+        self.plugin_host = None
+        self.plugin_document_timer = QTimer(self)
+        self.plugin_document_timer.setSingleShot(True)
+        self.plugin_document_timer.timeout.connect(self.push_plugin_documents)
+
+        # Inicialização adiada para depois da primeira pintura
+        self.deferred_startup_done = False
+        self.deferred_startup_tasks = []
+
+        # Sessão (abas, cursores, projeto e layout), gravada com debounce
+        self.session_manager = SessionManager()
+        self.session_timer = QTimer(self)
+        self.session_timer.setSingleShot(True)
+        self.session_timer.timeout.connect(self.save_session)
+        self.restoring_session = False
+
         # Estado
         self.is_linting = False
         self.pending_lint = False
@@ -6179,6 +10822,7 @@ class IDE(QMainWindow):
         # UI components - inicializar como None
         self.problems_list = None
         self.file_model = None
+        self.explorer_proxy = None
         self.file_tree = None
         self.tab_widget = None
         self.output_tabs = None
@@ -6206,9 +10850,6 @@ class IDE(QMainWindow):
         self.setup_toolbar()
         self.setup_statusbar()
 
-        self.start_shell()
-        self.check_python_version()
-
     def setup_central_widget(self):
         self.tab_widget = QTabWidget()
         self.tab_widget.setTabsClosable(True)
@@ -6245,6 +10886,7 @@ class IDE(QMainWindow):
 
     def setup_left_dock(self):
         left_dock = QDockWidget("Explorer", self)
+        left_dock.setObjectName("explorer_dock")
         left_dock.setFeatures(
             QDockWidget.DockWidgetMovable | QDockWidget.DockWidgetFloatable)
         left_dock.setMaximumWidth(300)
@@ -6275,20 +10917,12 @@ class IDE(QMainWindow):
 
         explorer_layout.addWidget(explorer_toolbar)
 
-        self.file_model = QFileSystemModel()
-        self.file_model.setRootPath(QDir.homePath())
-
+        # O modelo só é criado (e enraizado) quando um projeto é aberto,
+        # para não observar nem enumerar a pasta pessoal na inicialização
         self.file_tree = QTreeView()
-        self.file_tree.setModel(self.file_model)
-        self.file_tree.setRootIndex(
-            self.file_model.index(QDir.homePath()))
         self.file_tree.setAnimated(True)
         self.file_tree.setIndentation(15)
-        self.file_tree.setSortingEnabled(True)
-
-        self.file_tree.hideColumn(1)
-        self.file_tree.hideColumn(2)
-        self.file_tree.hideColumn(3)
+        self.file_tree.setUniformRowHeights(True)
 
         explorer_layout.addWidget(self.file_tree)
 
@@ -6319,26 +10953,19 @@ class IDE(QMainWindow):
 
     def setup_right_dock(self):
         right_dock = QDockWidget("Minimap", self)
+        right_dock.setObjectName("minimap_dock")
         right_dock.setFeatures(
             QDockWidget.DockWidgetMovable | QDockWidget.DockWidgetFloatable)
         right_dock.setMaximumWidth(200)
 
         self.minimap = Minimap()
-        self.minimap.setStyleSheet("""
-                                                QPlainTextEdit {
-                                                                background-color: #1e1e1e;
-                                                                color: #569cd6;
-                                                                border: none;
-                                                                font-family: 'Consolas', monospace;
-                                                                font-size: 2px;
-                                                }
-                                """)
 
         right_dock.setWidget(self.minimap)
         self.addDockWidget(Qt.RightDockWidgetArea, right_dock)
 
     def setup_bottom_dock(self):
         bottom_dock = QDockWidget("Output", self)
+        bottom_dock.setObjectName("output_dock")
         bottom_dock.setFeatures(
             QDockWidget.DockWidgetMovable | QDockWidget.DockWidgetFloatable)
 
@@ -6457,6 +11084,21 @@ class IDE(QMainWindow):
             self.open_advanced_find_similar)
         tools_menu.addAction(find_similar_action)
 
+        # Busca de texto em todo o projeto
+        find_in_files_action = QAction(
+            "🔎 Buscar em Arquivos do Projeto", self)
+        find_in_files_action.setShortcut("Ctrl+Alt+F")
+        find_in_files_action.triggered.connect(
+            self.open_find_in_files)
+        tools_menu.addAction(find_in_files_action)
+
+        self.trigram_index_action = QAction(
+            "⚡ Indexar Projeto para Busca Rápida", self)
+        self.trigram_index_action.setCheckable(True)
+        self.trigram_index_action.toggled.connect(
+            self.set_trigram_index_enabled)
+        tools_menu.addAction(self.trigram_index_action)
+
         # Gerenciador de Pacotes
         package_action = QAction(
             "📦 Gerenciador de Pacotes Python", self)
@@ -6479,6 +11121,18 @@ class IDE(QMainWindow):
             self.show_plugin_manager)
         tools_menu.addAction(plugin_manager_action)
 
+        plugin_performance_action = QAction(
+            "📊 Desempenho de Plugins", self)
+        plugin_performance_action.triggered.connect(
+            self.show_plugin_performance)
+        tools_menu.addAction(plugin_performance_action)
+
+        stall_report_action = QAction(
+            "🐢 Travamentos da Interface", self)
+        stall_report_action.triggered.connect(
+            self.show_stall_reports)
+        tools_menu.addAction(stall_report_action)
+
         tools_menu.addSeparator()
 
         # Outras ferramentas existentes
@@ -6510,6 +11164,103 @@ class IDE(QMainWindow):
                                 "Sistema de plugins em desenvolvimento!\n\n"
                                 "Em breve você poderá instalar e gerenciar plugins.")
 
+    def show_plugin_performance(self):
+        """Mostra os tempos de cada plugin"""
+        if not hasattr(self, 'plugin_manager'):
+            QMessageBox.information(
+                self, "Plugins", "Os plugins ainda estão sendo carregados.")
+            return
+        dialog = PluginPerformanceDialog(self, self.plugin_manager)
+        dialog.exec()
+
+    def show_stall_reports(self):
+        """Mostra os travamentos do loop de eventos detectados"""
+        dialog = StallReportDialog(self, self.stall_watchdog)
+        dialog.exec()
+
+    def get_plugin_host(self):
+        """Processo de plugins, iniciado na primeira ativação que o usa"""
+        if self.plugin_host is None:
+            self.plugin_host = PluginHostClient(self)
+            self.plugin_host.plugin_loaded.connect(self.on_plugin_host_loaded)
+            self.plugin_host.plugin_failed.connect(self.on_plugin_host_failed)
+            self.plugin_host.command_finished.connect(self.on_plugin_command_finished)
+            self.plugin_host.diagnostics_received.connect(self.on_plugin_diagnostics)
+            self.plugin_host.message_received.connect(self.on_plugin_message)
+            self.plugin_host.restarted.connect(
+                lambda: self.push_plugin_documents(all_tabs=True))
+            self.plugin_host.start()
+            self.push_plugin_documents(all_tabs=True)
+        return self.plugin_host
+
+    def schedule_plugin_document_push(self):
+        if self.plugin_host is not None:
+            self.plugin_document_timer.start(300)
+
+    def push_plugin_documents(self, all_tabs=False):
+        """Envia ao processo de plugins o snapshot da aba ativa (ou de todas)"""
+        if self.plugin_host is None:
+            return
+        current = self.tab_widget.currentWidget()
+        if all_tabs:
+            tabs = [self.tab_widget.widget(i) for i in range(self.tab_widget.count())]
+        else:
+            tabs = [current]
+        for tab in tabs:
+            if isinstance(tab, EditorTab) and tab.file_path:
+                self.plugin_host.push_document(tab.editor.snapshot())
+        if isinstance(current, EditorTab) and current.file_path:
+            self.plugin_host.set_active_document(current.file_path)
+
+    def on_plugin_host_loaded(self, name, command_ids):
+        """Comandos que o plugin registrou além do manifesto viram itens de menu"""
+        descriptor = self.plugin_manager.descriptors.get(name)
+        if descriptor is None:
+            return
+        known = {command['id'] for command in descriptor.commands}
+        tools_menu = self.get_tools_menu()
+        for command_id in command_ids:
+            if command_id in known:
+                continue
+            command = {'id': command_id, 'title': command_id}
+            descriptor.commands.append(command)
+            if tools_menu:
+                tools_menu.addAction(self.plugin_manager.command_action(name, command))
+        self.statusBar().showMessage(
+            f"🔌 {name} carregado no processo de plugins", 3000)
+
+    def on_plugin_host_failed(self, name, message):
+        descriptor = self.plugin_manager.descriptors.get(name)
+        if descriptor is not None:
+            descriptor.failed = True
+            descriptor.plugin = None
+        self.plugin_manager.plugins.pop(name, None)
+        print(f"❌ Erro ao ativar plugin {name} no processo de plugins: {message}")
+        self.statusBar().showMessage(f"❌ Plugin {name} falhou: {message}", 5000)
+
+    def on_plugin_command_finished(self, name, command_id, wall_time, cpu_time, error):
+        if error:
+            print(f"❌ Comando {command_id} do plugin {name} falhou: {error}")
+            self.statusBar().showMessage(
+                f"❌ {name}: {command_id} falhou ({error})", 5000)
+
+    def on_plugin_diagnostics(self, name, file_path, items):
+        """Mostra no gutter e na lista de problemas os diagnósticos do plugin"""
+        for i in range(self.tab_widget.count()):
+            tab = self.tab_widget.widget(i)
+            if not isinstance(tab, EditorTab) or tab.file_path != file_path:
+                continue
+            tab.set_plugin_diagnostics(name, items)
+            if tab is self.tab_widget.currentWidget() and self.problems_list:
+                for row in reversed(range(self.problems_list.count())):
+                    data = self.problems_list.item(row).data(Qt.UserRole) or {}
+                    if data.get('plugin') and data.get('file') == file_path:
+                        self.problems_list.takeItem(row)
+                tab.add_plugin_problems(self.problems_list)
+
+    def on_plugin_message(self, name, text):
+        self.statusBar().showMessage(f"🔌 {name}: {text}" if name else text, 5000)
+
     def open_python_version_manager(self):
         """Abre o gerenciador de versões Python"""
         dialog = PythonVersionDialog(
@@ -6547,17 +11298,126 @@ class IDE(QMainWindow):
         """Abre a busca de arquivos por nome"""
         if hasattr(self, 'project_path') and self.project_path:
             dialog = FindFilesDialog(
-                self.project_path, self)
+                self.project_path, self, self.file_index)
             dialog.exec()
         else:
             QMessageBox.warning(
                 self, "Aviso", "Nenhum projeto aberto!")
 
+    def open_find_in_files(self):
+        """Abre a busca de texto em todos os arquivos do projeto"""
+        if hasattr(self, 'project_path') and self.project_path:
+            dialog = FindInFilesDialog(
+                self.project_path, self)
+            dialog.show()
+        else:
+            QMessageBox.warning(
+                self, "Aviso", "Nenhum projeto aberto!")
+
+    def start_file_index(self):
+        """Constrói a lista de arquivos do projeto uma vez, em background"""
+        if self.file_index_worker and self.file_index_worker.isRunning():
+            self.file_index_worker.stop()
+        self.file_index = ProjectFileIndex(self.project_path)
+        self.file_index_worker = FileIndexWorker(self.file_index)
+        self.file_index_worker.start()
+
+    def set_trigram_index_enabled(self, enabled):
+        """Liga/desliga o índice de trigramas do projeto atual"""
+        self.trigram_index_enabled = enabled
+        if enabled:
+            self.start_trigram_index()
+        else:
+            self.stop_trigram_index()
+
+    def start_trigram_index(self):
+        """Carrega e sincroniza o índice do projeto em background"""
+        self.stop_trigram_index()
+        if not self.trigram_index_enabled or not self.project_path:
+            return
+        self.trigram_index = TrigramIndex(self.project_path)
+        self.trigram_index_worker = TrigramIndexWorker(self.trigram_index)
+        self.trigram_index_worker.index_ready.connect(
+            lambda count: self.statusBar().showMessage(
+                f"⚡ Índice de busca pronto: {count} arquivos", 3000))
+        self.trigram_index_worker.start()
+
+    def stop_trigram_index(self):
+        # A thread do índice grava as alterações pendentes antes de terminar
+        if self.trigram_index_worker and self.trigram_index_worker.isRunning():
+            self.trigram_index_worker.stop()
+        self.trigram_index = None
+        self.trigram_index_worker = None
+
+    def note_file_written(self, file_path):
+        """Mantém os índices em dia após uma escrita feita pelo próprio IDE"""
+        if self.trigram_index:
+            self.trigram_index.update_file(file_path)
+
+    def setup_file_watcher(self):
+        """Cria o serviço de observação de arquivos na primeira utilização"""
+        if self.file_watcher is None:
+            self.file_watcher = FileWatcherService(self)
+            self.file_watcher.files_changed.connect(self.on_files_changed)
+
+    def on_files_changed(self, changes):
+        """Repassa as mudanças externas aos índices, ao cache e às abas abertas"""
+        tabs = {}
+        for i in range(self.tab_widget.count()):
+            widget = self.tab_widget.widget(i)
+            if isinstance(widget, EditorTab) and widget.file_path:
+                tabs[os.path.abspath(widget.file_path)] = widget
+
+        project_prefix = os.path.join(os.path.abspath(self.project_path), '') if self.project_path else None
+
+        for kind, path, old_path in changes:
+            removed = old_path if kind == 'renamed' else (path if kind == 'deleted' else None)
+            added = None if kind == 'deleted' else path
+
+            # Índices só conhecem arquivos do projeto (abas podem estar fora dele)
+            in_project = bool(project_prefix) and path.startswith(project_prefix)
+            if in_project and self.file_index and self.file_index.is_ready:
+                if removed:
+                    self.file_index.remove_path(removed)
+                if added and kind != 'modified':
+                    self.file_index.add_path(added)
+            # O índice de trigramas aceita atualizações mesmo durante a construção
+            if in_project and self.trigram_index:
+                if removed:
+                    self.trigram_index.remove_file(removed)
+                if added:
+                    self.trigram_index.update_file(added)
+            for changed in (removed, added):
+                if changed and changed.endswith('.py'):
+                    module_cache_manager.invalidate_file(changed)
+
+            tab = tabs.get(old_path if kind == 'renamed' else path)
+            if tab is None:
+                continue
+            if kind == 'renamed':
+                self.file_watcher.unwatch_file(old_path)
+                self.file_watcher.watch_file(path)
+                tab.set_file_path(path)
+                self.tab_widget.setTabText(
+                    self.tab_widget.indexOf(tab), os.path.basename(path))
+            elif kind == 'deleted':
+                tab.on_disk_deleted()
+                self.statusBar().showMessage(
+                    f"🗑 {os.path.basename(path)} foi removido do disco", 5000)
+            else:
+                tab.on_disk_changed()
+
     def open_theme_manager(self):
         """Abre o gerenciador de temas"""
         dialog = ThemeDialog(self.theme_manager, self)
         dialog.exec()
 
+    def get_tools_menu(self):
+        for action in self.menuBar().actions():
+            if action.text() == "🛠️ Ferramentas":
+                return action.menu()
+        return None
+
     def integrate_plugins(self):
         """Integra plugins na interface do IDE"""
         # Por enquanto, apenas log
@@ -6568,11 +11428,7 @@ class IDE(QMainWindow):
 
         if plugin_actions:
             # Adiciona ao menu Ferramentas
-            tools_menu = None
-            for action in self.menuBar().actions():
-                if action.text() == "🛠️ Ferramentas":
-                    tools_menu = action.menu()
-                    break
+            tools_menu = self.get_tools_menu()
 
             if tools_menu:
                 tools_menu.addSeparator()
@@ -6588,6 +11444,8 @@ class IDE(QMainWindow):
             ("📂 Abrir Arquivo", "Ctrl+O", self.open_file),
             ("📂 Abrir Projeto",
              "Ctrl+Shift+O", self.set_project),
+            ("👁 Abrir no Visualizador (somente leitura)",
+             "Ctrl+Alt+O", self.open_large_file_viewer),
             ("💾 Salvar", "Ctrl+S", self.save_file),
             ("💾 Salvar Como", "Ctrl+Shift+S",
              self.save_file_as),
@@ -6823,6 +11681,10 @@ class IDE(QMainWindow):
     def setup_run_menu(self, menu):
         actions = [
             ("▶️ Executar", "F5", self.run_code),
+            ("🔥 Executar com Profiler", "Ctrl+F5",
+             self.run_code_with_profiler),
+            ("🧠 Executar com Profiler de Memória", "Ctrl+Shift+F5",
+             self.run_code_with_memory_profiler),
             ("🐛 Debug", "F6", self.debug_code),
             ("⏸️ Pausar", "F7", self.pause_execution),
             ("⏹️ Parar", "F8", self.stop_execution),
@@ -6884,6 +11746,8 @@ class IDE(QMainWindow):
 
     def setup_toolbar(self):
         toolbar = QToolBar("Ferramentas Principais")
+        # saveState/restoreState da sessão identificam a barra pelo nome
+        toolbar.setObjectName("main_toolbar")
         toolbar.setIconSize(QSize(20, 20))
         toolbar.setMovable(True)
         toolbar.setToolButtonStyle(Qt.ToolButtonTextBesideIcon)
@@ -7126,12 +11990,18 @@ class IDE(QMainWindow):
                             i)
                         return
 
+                # Arquivos enormes vão para o visualizador mmap
+                if os.path.getsize(file_path) >= LargeFileViewerTab.AUTO_OPEN_THRESHOLD:
+                    self.open_large_file_viewer(file_path)
+                    return
+
                 # Cria nova aba com
                 # EditorTab
                 editor_tab = EditorTab(
                     file_path=file_path, parent=self.tab_widget)
                 index = self.tab_widget.addTab(
                     editor_tab, os.path.basename(file_path))
+                self.register_editor_tab(editor_tab)
                 self.tab_widget.setCurrentIndex(
                     index)
 
@@ -7144,20 +12014,83 @@ class IDE(QMainWindow):
                 QMessageBox.warning(
                     self, "Erro", f"Não foi possível abrir o arquivo:\n{str(e)}")
 
+    def open_file_at_line(self, file_path, line_number):
+        """Abre o arquivo (ou ativa sua aba) e posiciona o cursor na linha (base 1)"""
+        self.open_file(file_path)
+        widget = self.tab_widget.currentWidget()
+        if isinstance(widget, LargeFileViewerTab):
+            widget.view.go_to_line(max(0, line_number - 1))
+            return
+        if not isinstance(widget, EditorTab) or widget.file_path != file_path:
+            return
+
+        editor = widget.editor
+        block = editor.document().findBlockByNumber(
+            max(0, line_number - 1))
+        if block.isValid():
+            cursor = editor.textCursor()
+            cursor.setPosition(block.position())
+            editor.setTextCursor(cursor)
+            editor.centerCursor()
+            editor.setFocus()
+
+    def open_large_file_viewer(self, file_path=None):
+        """Abre um arquivo grande no visualizador somente leitura (mmap)"""
+        if not file_path:
+            file_path, _ = QFileDialog.getOpenFileName(
+                self,
+                "Abrir no Visualizador",
+                self.project_path or QDir.homePath(),
+                "Logs e Dados (*.log *.csv *.tsv *.txt *.json *.jsonl);;Todos os Arquivos (*.*)"
+            )
+
+        if file_path:
+            try:
+                for i in range(self.tab_widget.count()):
+                    widget = self.tab_widget.widget(i)
+                    if isinstance(widget, LargeFileViewerTab) and widget.file_path == file_path:
+                        self.tab_widget.setCurrentIndex(i)
+                        return
+
+                viewer_tab = LargeFileViewerTab(
+                    file_path, parent=self.tab_widget)
+                index = self.tab_widget.addTab(
+                    viewer_tab, f"👁 {os.path.basename(file_path)}")
+                self.tab_widget.setCurrentIndex(index)
+                self.statusBar().showMessage(
+                    f"✅ Visualizador aberto: {os.path.basename(file_path)}", 3000)
+
+            except Exception as e:
+                QMessageBox.warning(
+                    self, "Erro", f"Não foi possível abrir o arquivo:\n{str(e)}")
+
     def save_file(self):
         """Salva o arquivo atual"""
         current_widget = self.tab_widget.currentWidget()
 
         if isinstance(current_widget, EditorTab):
             editor = current_widget.editor
+            if current_widget.is_loading:
+                self.statusBar().showMessage(
+                    "⏳ Aguarde o carregamento do arquivo para salvar", 3000)
+                return
             if hasattr(
                     editor, 'file_path') and editor.file_path:
                 try:
-                    with open(editor.file_path, 'w', encoding='utf-8') as f:
-                        f.write(
-                            editor.toPlainText())
-                    self.statusBar().showMessage(
-                        f"✅ Arquivo salvo: {os.path.basename(editor.file_path)}", 3000)
+                    encoding = write_text_file(
+                        editor.file_path, editor.toPlainText(), current_widget.encoding)
+                    editor.document().setModified(False)
+                    current_widget.disk_signature = current_widget.read_disk_signature()
+                    self.note_file_written(editor.file_path)
+                    if encoding != current_widget.encoding:
+                        self.statusBar().showMessage(
+                            f"⚠ {os.path.basename(editor.file_path)} salvo em UTF-8: o texto tem "
+                            f"caracteres fora de {current_widget.encoding.upper()}", 8000)
+                        current_widget.encoding = encoding
+                        self.update_file_info(editor.file_path)
+                    else:
+                        self.statusBar().showMessage(
+                            f"✅ Arquivo salvo: {os.path.basename(editor.file_path)}", 3000)
                 except Exception as e:
                     QMessageBox.warning(
                         self, "Erro", f"Não foi possível salvar o arquivo:\n{str(e)}")
@@ -7188,7 +12121,14 @@ class IDE(QMainWindow):
 
                     # Atualiza
                     # a aba
-                    editor.file_path = new_path
+                    self.setup_file_watcher()
+                    if current_widget.file_path:
+                        self.file_watcher.unwatch_file(current_widget.file_path)
+                    current_widget.encoding = 'utf-8'
+                    current_widget.set_file_path(new_path)
+                    editor.document().setModified(False)
+                    self.file_watcher.watch_file(new_path)
+                    self.note_file_written(new_path)
                     index = self.tab_widget.currentIndex()
                     self.tab_widget.setTabText(
                         index, os.path.basename(new_path))
@@ -7208,22 +12148,36 @@ class IDE(QMainWindow):
             self.tab_widget.setCurrentIndex(i)
             self.save_file()
 
-    def run_code(self):
-        """Executa o código atual com melhorias visuais"""
+    def current_python_file(self):
+        """Arquivo Python da aba atual, ou None (com aviso)"""
         current_widget = self.tab_widget.currentWidget()
 
         if not current_widget or not hasattr(
                 current_widget, 'file_path'):
             QMessageBox.information(
                 self, "Informação", "Nenhum arquivo para executar.")
-            return
+            return None
 
         file_path = current_widget.file_path
         if not file_path or not file_path.endswith('.py'):
             QMessageBox.information(
                 self, "Informação", "Apenas arquivos Python podem ser executados.")
-            return
+            return None
+        return file_path
+
+    def run_code(self):
+        """Executa o código atual com melhorias visuais"""
+        file_path = self.current_python_file()
+        if file_path:
+            self.start_python_run(file_path, "🚀 Executando")
+
+    def start_python_run(self, file_path, banner, interpreter_args=(), on_finished=None):
+        """Executa o arquivo no Python do projeto, com a saída no Output.
 
+        interpreter_args vêm antes do arquivo (ex.: ['-c', bootstrap, ...]);
+        on_finished(exit_code) é chamado ao fim do processo, ou com -1 se
+        ele nem chegar a iniciar (para liberar temporários e canais).
+        """
         try:
             # Salva o arquivo primeiro
             self.save_file()
@@ -7235,7 +12189,7 @@ class IDE(QMainWindow):
             self.output_tabs.setCurrentWidget(
                 self.output_text)
             self.output_text.appendPlainText(
-                f"🚀 Executando: {os.path.basename(file_path)}")
+                f"{banner}: {os.path.basename(file_path)}")
             self.output_text.appendPlainText(
                 "=" * 50 + "\n")
 
@@ -7262,6 +12216,8 @@ class IDE(QMainWindow):
                 else:
                     self.output_text.appendPlainText(
                         f"\n❌ Execução falhou (código: {exit_code})")
+                if on_finished:
+                    on_finished(exit_code)
 
             self.current_process.readyRead.connect(
                 handle_output)
@@ -7276,17 +12232,108 @@ class IDE(QMainWindow):
 
             # Inicia o processo
             self.current_process.start(
-                python_exec, [file_path])
+                python_exec, list(interpreter_args) + [file_path])
 
             if not self.current_process.waitForStarted(
                     5000):
                 self.output_text.appendPlainText(
                     "❌ Erro: Não foi possível iniciar o processo Python")
+                if on_finished:
+                    on_finished(-1)
                 return
 
         except Exception as e:
             self.output_text.appendPlainText(
                 f"💥 Erro na execução: {str(e)}")
+            if on_finished:
+                on_finished(-1)
+
+    def run_code_with_profiler(self):
+        """Executa o arquivo atual sob o profiler por amostragem"""
+        file_path = self.current_python_file()
+        if not file_path:
+            return
+        fd, output_path = tempfile.mkstemp(prefix="py_dragon_profile_", suffix=".json")
+        os.close(fd)
+        self.start_python_run(
+            file_path, "🔥 Executando com profiler",
+            ['-c', PROFILER_BOOTSTRAP, output_path, str(PROFILER_INTERVAL_S)],
+            lambda exit_code: self.show_profile_results(file_path, output_path))
+
+    def show_profile_results(self, file_path, output_path):
+        """Carrega o perfil gravado e mostra a aba do profiler"""
+        try:
+            profile = SamplingProfile.load(output_path)
+        except (OSError, ValueError, TypeError) as e:
+            profile = None
+            self.output_text.appendPlainText(
+                f"❌ Perfil não gravado (processo interrompido?): {e}")
+        try:
+            os.remove(output_path)
+        except OSError:
+            pass
+        if profile is None:
+            return
+        if not profile.total_samples:
+            self.output_text.appendPlainText(
+                "⚠ Nenhuma amostra coletada (execução curta demais)")
+            return
+
+        if self.profiler_tab is None:
+            self.profiler_tab = ProfilerResultsTab()
+            self.profiler_tab.source_requested.connect(self.open_profiled_source)
+            self.output_tabs.addTab(self.profiler_tab, "🔥 Profiler")
+        self.profiler_tab.set_profile(profile, file_path)
+        self.output_tabs.setCurrentWidget(self.profiler_tab)
+
+    def run_code_with_memory_profiler(self):
+        """Executa o arquivo atual com tracemalloc e snapshots periódicos"""
+        file_path = self.current_python_file()
+        if not file_path:
+            return
+        if self.memory_profiler_session is not None:
+            self.memory_profiler_session.close()
+        session = self.memory_profiler_session = MemoryProfilerSession(self)
+        address = session.listen()
+        if address is None:
+            QMessageBox.warning(
+                self, "Erro", "Não foi possível abrir o canal do profiler de memória.")
+            return
+
+        if self.memory_profiler_tab is None:
+            self.memory_profiler_tab = MemoryProfilerTab()
+            self.memory_profiler_tab.source_requested.connect(self.open_profiled_source)
+            self.output_tabs.addTab(self.memory_profiler_tab, "🧠 Memória")
+        self.memory_profiler_tab.start_session(file_path)
+        session.snapshot_received.connect(self.memory_profiler_tab.add_snapshot)
+
+        self.start_python_run(
+            file_path, "🧠 Executando com profiler de memória",
+            ['-c', MEMORY_PROFILER_BOOTSTRAP, address, str(MEMORY_SNAPSHOT_INTERVAL_S)],
+            lambda exit_code: self.finish_memory_profile(session))
+
+    def finish_memory_profile(self, session):
+        """Fecha o canal e mostra os snapshots recebidos"""
+        session.close()
+        if session is not self.memory_profiler_session:
+            # Uma nova execução já substituiu esta sessão
+            session.deleteLater()
+            return
+        self.memory_profiler_session = None
+        session.deleteLater()
+        if self.memory_profiler_tab.snapshots:
+            self.output_tabs.setCurrentWidget(self.memory_profiler_tab)
+        else:
+            self.output_text.appendPlainText(
+                "⚠ Nenhum snapshot de memória recebido")
+
+    def open_profiled_source(self, file_path, line_number):
+        """Abre a função do perfil no editor (código de bibliotecas incluso)"""
+        if os.path.isfile(file_path):
+            self.open_file_at_line(file_path, line_number)
+        else:
+            self.statusBar().showMessage(
+                f"Código não disponível: {file_path}", 5000)
 
     def debug_code(self):
         """Executa o código em modo debug com terminal especializado"""
@@ -7334,6 +12381,33 @@ class IDE(QMainWindow):
             self.output_tabs.setCurrentWidget(
                 self.debug_text)
 
+    def open_command_line_args(self, cwd, args):
+        """Abre arquivos/projetos da linha de comando (arquivo, arquivo:linha, pasta)"""
+        for arg in args:
+            if arg.startswith('-'):
+                continue
+            path, line_number = arg, 0
+            match = re.match(r'^(.*?):(\d+)(?::\d+)?$', arg)
+            if match and not os.path.exists(os.path.join(cwd, arg)):
+                path, line_number = match.group(1), int(match.group(2))
+            path = os.path.abspath(os.path.join(cwd, path))
+
+            if os.path.isdir(path):
+                self.set_project(path)
+            elif not os.path.isfile(path):
+                self.statusBar().showMessage(
+                    f"❌ Arquivo não encontrado: {arg}", 5000)
+            elif line_number:
+                self.open_file_at_line(path, line_number)
+            else:
+                self.open_file(path)
+
+        # Traz a janela para frente ao receber arquivos de outra instância
+        if self.isMinimized():
+            self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
     def close_tab(self, index):
         """Fecha uma aba com confirmação se não salvo"""
         widget = self.tab_widget.widget(index)
@@ -7355,10 +12429,26 @@ class IDE(QMainWindow):
                 elif reply == QMessageBox.Cancel:
                     return
 
+            widget.stop_loading()
+            if self.file_watcher and widget.file_path:
+                self.file_watcher.unwatch_file(widget.file_path)
+            if self.plugin_host and widget.file_path:
+                self.plugin_host.close_document(widget.file_path)
+        elif isinstance(widget, LargeFileViewerTab):
+            widget.close_file()
+
         self.tab_widget.removeTab(index)
+        if isinstance(widget, PendingEditorTab):
+            widget.deleteLater()
+        self.schedule_session_save()
 
     def on_tab_changed(self, index):
         """Atualiza a interface quando a aba muda"""
+        self.schedule_session_save()
+        self.schedule_plugin_document_push()
+        if index >= 0 and isinstance(self.tab_widget.widget(index), PendingEditorTab):
+            self.materialize_tab(index)
+
         if index >= 0:
             widget = self.tab_widget.widget(index)
             if isinstance(
@@ -7367,13 +12457,145 @@ class IDE(QMainWindow):
                 self.update_file_info(
                     widget.editor.file_path)
 
-                # Atualiza minimap
-                self.minimap.setPlainText(
-                    widget.editor.toPlainText())
+                # Minimap acompanha o editor ativo (sem copiar o texto)
+                self.minimap.set_editor(widget.editor)
             else:
                 self.update_file_info(
                     None)
                 self.minimap.clear()
+        else:
+            self.minimap.clear()
+
+    def register_editor_tab(self, editor_tab):
+        """Liga uma aba de editor recém-criada ao observador e à sessão"""
+        self.setup_file_watcher()
+        self.file_watcher.watch_file(editor_tab.file_path)
+        if hasattr(self, 'plugin_manager'):
+            self.plugin_manager.fire_file_opened(editor_tab.file_path)
+        editor_tab.editor.cursorPositionChanged.connect(
+            self.schedule_session_save)
+        editor_tab.editor.verticalScrollBar().valueChanged.connect(
+            lambda _value: self.schedule_session_save())
+        editor_tab.editor.textChanged.connect(
+            self.schedule_plugin_document_push)
+        self.schedule_session_save()
+        self.schedule_plugin_document_push()
+
+    def materialize_tab(self, index):
+        """Troca a aba pendente da sessão por um EditorTab completo"""
+        placeholder = self.tab_widget.widget(index)
+        editor_tab = EditorTab(
+            file_path=placeholder.file_path, parent=self.tab_widget)
+
+        blocked = self.tab_widget.blockSignals(True)
+        self.tab_widget.removeTab(index)
+        self.tab_widget.insertTab(
+            index, editor_tab, os.path.basename(placeholder.file_path))
+        self.tab_widget.setCurrentIndex(index)
+        self.tab_widget.blockSignals(blocked)
+        placeholder.deleteLater()
+
+        editor = editor_tab.editor
+        cursor = editor.textCursor()
+        cursor.setPosition(min(placeholder.cursor_position,
+                               editor.document().characterCount() - 1))
+        editor.setTextCursor(cursor)
+        scroll_value = placeholder.scroll_value
+        QTimer.singleShot(
+            0, lambda: editor.verticalScrollBar().setValue(scroll_value))
+
+        self.register_editor_tab(editor_tab)
+        return editor_tab
+
+    # ===== SESSÃO =====
+
+    def schedule_session_save(self):
+        """Agenda a gravação da sessão (debounce)"""
+        if not self.restoring_session:
+            self.session_timer.start(1000)
+
+    def collect_session(self):
+        """Estado atual: projeto, abas com cursor/rolagem e layout da janela"""
+        tabs = []
+        current_tab = -1
+        for i in range(self.tab_widget.count()):
+            widget = self.tab_widget.widget(i)
+            if isinstance(widget, EditorTab) and widget.file_path:
+                entry = {
+                    'file_path': widget.file_path,
+                    'cursor': widget.editor.textCursor().position(),
+                    'scroll': widget.editor.verticalScrollBar().value(),
+                }
+            elif isinstance(widget, PendingEditorTab):
+                entry = {
+                    'file_path': widget.file_path,
+                    'cursor': widget.cursor_position,
+                    'scroll': widget.scroll_value,
+                }
+            else:
+                continue
+            if i == self.tab_widget.currentIndex():
+                current_tab = len(tabs)
+            tabs.append(entry)
+
+        return {
+            'project_path': self.project_path,
+            'tabs': tabs,
+            'current_tab': current_tab,
+            'geometry': bytes(self.saveGeometry().toBase64()).decode('ascii'),
+            'window_state': bytes(self.saveState().toBase64()).decode('ascii'),
+        }
+
+    def save_session(self):
+        try:
+            self.session_manager.save(self.collect_session())
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Erro ao salvar sessão: {e}")
+
+    def restore_session(self):
+        """Restaura a sessão; só a aba ativa constrói seu EditorTab agora"""
+        data = self.session_manager.load()
+        if not data:
+            return
+
+        self.restoring_session = True
+        try:
+            if data.get('geometry'):
+                self.restoreGeometry(QByteArray.fromBase64(
+                    data['geometry'].encode('ascii')))
+            if data.get('window_state'):
+                self.restoreState(QByteArray.fromBase64(
+                    data['window_state'].encode('ascii')))
+
+            project_path = data.get('project_path')
+            if project_path and os.path.isdir(project_path) and not self.project_path:
+                self.set_project(project_path)
+
+            open_paths = {
+                getattr(self.tab_widget.widget(i), 'file_path', None)
+                for i in range(self.tab_widget.count())}
+            first_index = self.tab_widget.count()
+            blocked = self.tab_widget.blockSignals(True)
+            for entry in data.get('tabs', []):
+                file_path = entry.get('file_path')
+                if not file_path or file_path in open_paths or not os.path.isfile(file_path):
+                    continue
+                open_paths.add(file_path)
+                placeholder = PendingEditorTab(
+                    file_path, entry.get('cursor', 0), entry.get('scroll', 0))
+                self.tab_widget.addTab(placeholder, os.path.basename(file_path))
+            restored = self.tab_widget.count() - first_index
+            if restored:
+                current_tab = data.get('current_tab', 0)
+                current_tab = min(max(current_tab, 0), restored - 1)
+                self.tab_widget.setCurrentIndex(first_index + current_tab)
+            self.tab_widget.blockSignals(blocked)
+
+            if restored:
+                self.on_tab_changed(self.tab_widget.currentIndex())
+                self.update_cursor_info()
+        finally:
+            self.restoring_session = False
 
     # ===== MÉTODOS DE EDIÇÃO =====
 
@@ -7421,6 +12643,9 @@ class IDE(QMainWindow):
         )
 
         if ok and find_text:
+            # Destaca todas as ocorrências (Esc no editor limpa)
+            editor.search_highlight.set_regex(compile_search_regex(find_text))
+
             # Implementação de busca simples
             cursor = editor.textCursor()
             document = editor.document()
@@ -7633,6 +12858,17 @@ Thumbs.db
             threading.Thread(target=module_cache_manager.preload_all_project_modules,
                              args=(project_path,), daemon=True).start()
 
+            # Índice de arquivos para o localizador fuzzy
+            self.start_file_index()
+
+            # Índice de busca do novo projeto (se habilitado)
+            self.start_trigram_index()
+
+            # Mudanças externas mantêm índices, cache e abas coerentes
+            self.setup_file_watcher()
+            self.file_watcher.set_root(project_path)
+            self.schedule_session_save()
+
             self.statusBar().showMessage(
                 f"✅ Projeto carregado: {project_path}", 3000)
 
@@ -7897,29 +13133,25 @@ Thumbs.db
             zip_path = os.path.join(
                 config['output_dir'], f"{os.path.basename(self.project_path)}.zip")
 
+            # O próprio ZIP não pode entrar nele mesmo
+            zip_abs_path = os.path.abspath(zip_path)
             with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                # O pacote leva tudo exceto .git e __pycache__ (sem
+                # .gitignore: arquivos ignorados, como .env, podem ser
+                # necessários no deploy)
                 for root, dirs, files in os.walk(
                         self.project_path):
-                    # Filtra
-                    # arquivos
-                    # e
-                    # diretórios
-                    if '__pycache__' in dirs:
-                        dirs.remove(
-                            '__pycache__')
-                    if '.git' in dirs:
-                        dirs.remove(
-                            '.git')
-
+                    dirs[:] = [name for name in dirs
+                               if name not in ('.git', '__pycache__')]
                     for file in files:
-                        if not file.endswith(
-                                ('.pyc', '.tmp')):
-                            file_path = os.path.join(
-                                root, file)
-                            arcname = os.path.relpath(
-                                file_path, self.project_path)
-                            zipf.write(
-                                file_path, arcname)
+                        file_path = os.path.join(root, file)
+                        if file.endswith(('.pyc', '.tmp')) or \
+                                os.path.abspath(file_path) == zip_abs_path:
+                            continue
+                        arcname = os.path.relpath(
+                            file_path, self.project_path)
+                        zipf.write(
+                            file_path, arcname)
 
             self.output_text.appendPlainText(
                 f"✅ Projeto compactado: {zip_path}")
@@ -7940,13 +13172,12 @@ Thumbs.db
                     file_path)
                 size_str = f"{size} bytes" if size < 1024 else f"{size / 1024:.1f} KB"
 
-                # Detecta encoding
-                try:
-                    with open(file_path, 'rb') as f:
-                        raw = f.read()
-                    encoding = "UTF-8"
-                except:
-                    encoding = "Desconhecido"
+                # Encoding detectado na abertura (ou pelo prefixo do arquivo)
+                current_widget = self.tab_widget.currentWidget()
+                if getattr(current_widget, 'file_path', None) == file_path:
+                    encoding = current_widget.encoding.upper()
+                else:
+                    encoding = detect_file_encoding(file_path).upper()
 
                 file_name = os.path.basename(
                     file_path)
@@ -7972,22 +13203,41 @@ Thumbs.db
             self.cursor_info_label.setText(
                 "Linha: 1, Coluna: 1")
 
+    def setup_explorer_model(self):
+        """Cria o modelo do explorador na primeira abertura de projeto"""
+        if self.file_model is not None:
+            return
+        self.file_model = QFileSystemModel(self)
+        self.explorer_proxy = ProjectExplorerProxyModel(self)
+        self.explorer_proxy.setSourceModel(self.file_model)
+
+        self.file_tree.setModel(self.explorer_proxy)
+        self.file_tree.setSortingEnabled(True)
+        self.file_tree.sortByColumn(0, Qt.AscendingOrder)
+        self.file_tree.hideColumn(1)
+        self.file_tree.hideColumn(2)
+        self.file_tree.hideColumn(3)
+
     def refresh_explorer(self):
         """Atualiza o explorador de arquivos"""
-        if self.project_path and self.file_model:
-            self.file_model.setRootPath(
-                self.project_path)
-            self.file_tree.setRootIndex(
-                self.file_model.index(self.project_path))
-        elif self.file_model:
-            self.file_model.setRootPath(
-                QDir.homePath())
-            self.file_tree.setRootIndex(
-                self.file_model.index(QDir.homePath()))
+        if not self.project_path:
+            return
+        self.setup_explorer_model()
+        root_index = self.file_model.setRootPath(
+            self.project_path)
+        self.explorer_proxy.set_root_path(
+            self.file_model.filePath(root_index))
+        self.file_tree.setRootIndex(
+            self.explorer_proxy.mapFromSource(root_index))
+
+    def explorer_file_path(self, index):
+        """Caminho do item do explorador (índice do proxy)"""
+        return self.file_model.filePath(
+            self.explorer_proxy.mapToSource(index))
 
     def open_from_tree(self, index):
         """Abre arquivo a partir do explorador"""
-        file_path = self.file_model.filePath(index)
+        file_path = self.explorer_file_path(index)
         if os.path.isfile(file_path):
             self.open_file(file_path)
 
@@ -7998,7 +13248,7 @@ Thumbs.db
             return
 
         menu = QMenu(self)
-        file_path = self.file_model.filePath(index)
+        file_path = self.explorer_file_path(index)
 
         if os.path.isfile(file_path):
             menu.addAction(
@@ -8027,7 +13277,7 @@ Thumbs.db
         if not parent_path:
             current_index = self.file_tree.currentIndex()
             if current_index.isValid():
-                parent_path = self.file_model.filePath(
+                parent_path = self.explorer_file_path(
                     current_index)
                 if not os.path.isdir(
                         parent_path):
@@ -8058,7 +13308,7 @@ Thumbs.db
         if not parent_path:
             current_index = self.file_tree.currentIndex()
             if current_index.isValid():
-                parent_path = self.file_model.filePath(
+                parent_path = self.explorer_file_path(
                     current_index)
                 if not os.path.isdir(
                         parent_path):
@@ -8397,15 +13647,21 @@ Thumbs.db
         return sys.executable
 
     def check_python_version(self):
-        """Verifica e exibe a versão do Python"""
-        try:
-            result = subprocess.run([self.get_python_executable(), "--version"],
-                                    capture_output=True, text=True)
-            version = result.stdout.strip()
-            self.statusBar().showMessage(
-                f"🐍 {version}", 5000)
-        except:
-            self.statusBar().showMessage("❌ Não foi possível detectar Python", 5000)
+        """Verifica e exibe a versão do Python (sem bloquear a GUI)"""
+        process = QProcess(self)
+        process.setProcessChannelMode(QProcess.MergedChannels)
+        process.finished.connect(
+            lambda _code, _status: self.on_python_version_checked(process))
+        process.errorOccurred.connect(
+            lambda _error: self.statusBar().showMessage(
+                "❌ Não foi possível detectar Python", 5000))
+        process.start(self.get_python_executable(), ["--version"])
+
+    def on_python_version_checked(self, process):
+        version = process.readAllStandardOutput().data().decode(
+            'utf-8', errors='ignore').strip()
+        self.statusBar().showMessage(f"🐍 {version}", 5000)
+        process.deleteLater()
 
     # ===== MÉTODOS DE VISUALIZAÇÃO =====
 
@@ -9058,12 +14314,21 @@ Thumbs.db
 
     def closeEvent(self, event):
         """Lida com o fechamento da aplicação"""
+        # Desmontar o IDE pode demorar; não é um travamento a reportar
+        self.stall_watchdog.stop()
+
+        # Grava a sessão antes de desmontar abas e processos
+        self.session_timer.stop()
+        self.save_session()
+
         # Para todos os processos
         self.stop_execution()
 
         # Finaliza plugins
         if hasattr(self, 'plugin_manager'):
             self.plugin_manager.shutdown_plugins()
+        if self.plugin_host:
+            self.plugin_host.stop()
 
         # Para workers em execução
         if hasattr(
@@ -9074,6 +14339,11 @@ Thumbs.db
             self.auto_complete_worker.stop()
         if hasattr(self, 'debug_worker') and self.debug_worker:
             self.debug_worker.stop()
+        self.stop_trigram_index()
+        if self.file_index_worker and self.file_index_worker.isRunning():
+            self.file_index_worker.stop()
+        if self.file_watcher:
+            self.file_watcher.stop()
 
         event.accept()
 
@@ -9245,12 +14515,17 @@ def handle_terminal_error(self):
 
 
 
-class SingleApplication:
+class SingleApplication(QObject):
+    """Garante uma única instância e recebe os argumentos das próximas"""
+    arguments_received = QSignal(str, list)  # diretório de trabalho, argv
+
     def __init__(self, app_id):
         self.app = QApplication(sys.argv)
+        super().__init__()
         self.app_id = app_id
         self.server = None
         self.socket = QLocalSocket()
+        self.pending_data = {}
 
     def is_running(self):
         self.socket.connectToServer(self.app_id)
@@ -9261,14 +14536,48 @@ class SingleApplication:
 
     def run(self):
         if self.is_running():
-            print("Aplicação já está em execução!")
+            # Normalmente já repassado no início do módulo; aqui cobre a
+            # instância aberta enquanto esta carregava
+            if forward_to_running_instance(self.app_id, sys.argv[1:]):
+                print("Aplicação já está em execução: argumentos repassados")
+            else:
+                print("Aplicação já está em execução!")
             return False
 
-        # Criar servidor local
-        self.server = QLocalServer()
-        self.server.listen(self.app_id)
+        # Criar servidor local (removendo o socket de uma execução que
+        # terminou sem fechá-lo)
+        self.server = QLocalServer(self)
+        self.server.newConnection.connect(self.on_new_connection)
+        if not self.server.listen(self.app_id):
+            QLocalServer.removeServer(self.app_id)
+            self.server.listen(self.app_id)
         return True
 
+    def on_new_connection(self):
+        while self.server.hasPendingConnections():
+            connection = self.server.nextPendingConnection()
+            self.pending_data[connection] = b""
+            connection.readyRead.connect(
+                lambda connection=connection: self.on_connection_ready_read(connection))
+            connection.disconnected.connect(
+                lambda connection=connection: self.pending_data.pop(connection, None))
+            connection.disconnected.connect(connection.deleteLater)
+
+    def on_connection_ready_read(self, connection):
+        """Lê a mensagem (JSON em uma linha) enviada pela outra instância"""
+        data = self.pending_data.get(connection, b"") + connection.readAll().data()
+        if b"\n" not in data:
+            self.pending_data[connection] = data
+            return
+        self.pending_data.pop(connection, None)
+        try:
+            message = json.loads(data.split(b"\n", 1)[0].decode('utf-8'))
+            self.arguments_received.emit(
+                message.get('cwd', os.getcwd()), list(message.get('args', [])))
+        except (ValueError, AttributeError) as e:
+            print(f"Mensagem inválida de outra instância: {e}")
+        connection.disconnectFromServer()
+
 
 if __name__ == "__main__":
     # Configurar encoding de forma segura
@@ -9281,18 +14590,25 @@ if __name__ == "__main__":
         # Fallback seguro se reconfigure não estiver disponível
         pass
 
+    # Processo de plugins iniciado pelo próprio IDE (sem interface)
+    if '--plugin-host' in sys.argv:
+        sys.exit(run_plugin_host())
+
     try:
-        # Verificar se já está rodando
-        single_app = SingleApplication("py_dragon_studio_ide")
-        if not single_app.run():
-            sys.exit(1)
+        # Verificar se já está rodando (o perfil de inicialização roda
+        # mesmo com outra instância aberta)
+        single_app = SingleApplication(APP_ID)
+        if not startup_profiler.enabled and not single_app.run():
+            sys.exit(0)
 
         app = single_app.app
         app.setApplicationName("Py Dragon Studio IDE")
         app.setApplicationVersion("1.0.0")
 
         window = IDE()
+        single_app.arguments_received.connect(window.open_command_line_args)
         window.show()
+        window.open_command_line_args(os.getcwd(), sys.argv[1:])
 
         exit_code = app.exec()
         
@@ -0,0 +1,10 @@
+import os
+import sys
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, TESTS_DIR)
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+
+import pyside6_stub  # noqa: E402
+
+pyside6_stub.install()
@@ -0,0 +1,45 @@
+"""detect_file_encoding e write_text_file"""
+import codecs
+
+import pytest
+
+import main
+
+
+@pytest.mark.parametrize("raw, expected", [
+    (codecs.BOM_UTF8 + "olá".encode('utf-8'), 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE + "olá".encode('utf-16-le'), 'utf-16'),
+    (codecs.BOM_UTF16_BE + "olá".encode('utf-16-be'), 'utf-16'),
+    (codecs.BOM_UTF32_LE + "olá".encode('utf-32-le'), 'utf-32'),
+    ("olá 😀".encode('utf-8'), 'utf-8'),
+    (b"", 'utf-8'),
+    ("olá".encode('latin-1'), 'latin-1'),
+])
+def test_detect_file_encoding(tmp_path, raw, expected):
+    path = tmp_path / "f.txt"
+    path.write_bytes(raw)
+    assert main.detect_file_encoding(str(path)) == expected
+
+
+def test_detect_ignores_utf8_sequence_cut_at_sample_end(tmp_path):
+    path = tmp_path / "f.txt"
+    path.write_bytes(b"a" * 7 + "é".encode('utf-8') + b"b")
+    assert main.detect_file_encoding(str(path), sample_size=8) == 'utf-8'
+
+
+def test_detect_missing_file_defaults_to_utf8(tmp_path):
+    assert main.detect_file_encoding(str(tmp_path / "missing")) == 'utf-8'
+
+
+def test_write_text_file_keeps_encoding_when_possible(tmp_path):
+    path = tmp_path / "f.txt"
+    assert main.write_text_file(str(path), "olá", 'latin-1') == 'latin-1'
+    assert path.read_bytes() == "olá".encode('latin-1')
+
+
+def test_write_text_file_falls_back_to_utf8(tmp_path):
+    path = tmp_path / "f.txt"
+    path.write_bytes("antigo".encode('latin-1'))
+    assert main.write_text_file(str(path), "olá 😀", 'latin-1') == 'utf-8'
+    assert path.read_text(encoding='utf-8') == "olá 😀"
+    assert main.detect_file_encoding(str(path)) == 'utf-8'
@@ -0,0 +1,79 @@
+"""GitIgnoreMatcher: curingas, negação, padrões de diretório e ancoragem"""
+import os
+
+import main
+
+
+def ignored(lines, rel_path, is_dir=False, base_dir=""):
+    return main.GitIgnoreMatcher(base_dir, lines).match(rel_path, is_dir)
+
+
+def test_comments_and_blank_lines_are_skipped():
+    assert main.GitIgnoreMatcher("", ["# *.py", "", "   "]).rules == []
+
+
+def test_unanchored_pattern_matches_at_any_depth():
+    assert ignored(["*.log"], "debug.log") is True
+    assert ignored(["*.log"], "a/b/debug.log") is True
+    assert ignored(["*.log"], "debug.log.txt") is None
+
+
+def test_star_does_not_cross_directories():
+    assert ignored(["docs/*.md"], "docs/a.md") is True
+    assert ignored(["docs/*.md"], "docs/sub/a.md") is None
+
+
+def test_double_star():
+    assert ignored(["**/cache"], "cache", True) is True
+    assert ignored(["**/cache"], "a/b/cache", True) is True
+    assert ignored(["logs/**"], "logs/a/b.txt") is True
+
+
+def test_anchored_patterns_only_match_from_base():
+    assert ignored(["/build"], "build", True) is True
+    assert ignored(["/build"], "src/build", True) is None
+    assert ignored(["/build/"], "src/build", True) is None
+    assert ignored(["src/gen"], "src/gen", True) is True
+    assert ignored(["src/gen"], "lib/src/gen", True) is None
+
+
+def test_directory_only_patterns():
+    assert ignored(["out/"], "out", True) is True
+    assert ignored(["out/"], "a/out", True) is True
+    assert ignored(["out/"], "out", False) is None
+
+
+def test_negation_reincludes_and_last_rule_wins():
+    lines = ["*.log", "!keep.log"]
+    assert ignored(lines, "x.log") is True
+    assert ignored(lines, "keep.log") is False
+    assert ignored(["!keep.log", "*.log"], "keep.log") is True
+
+
+def test_character_classes():
+    assert ignored(["file[0-9].txt"], "file3.txt") is True
+    assert ignored(["file[!0-9].txt"], "file3.txt") is None
+    assert ignored(["file[!0-9].txt"], "filex.txt") is True
+    assert ignored(["?.txt"], "a.txt") is True
+    assert ignored(["?.txt"], "ab.txt") is None
+
+
+def test_nested_gitignore_is_relative_to_its_directory():
+    assert ignored(["/tmp"], "pkg/tmp", True, base_dir="pkg") is True
+    assert ignored(["/tmp"], "tmp", True, base_dir="pkg") is None
+    assert ignored(["/tmp"], "pkg/sub/tmp", True, base_dir="pkg") is None
+
+
+def test_project_walker_respects_gitignore_and_venvs(tmp_path):
+    (tmp_path / ".gitignore").write_text("*.log\n/build/\n", encoding="utf-8")
+    (tmp_path / "a.py").write_text("", encoding="utf-8")
+    (tmp_path / "debug.log").write_text("", encoding="utf-8")
+    for directory in ("build", "src/build", ".venv2", "node_modules"):
+        (tmp_path / directory).mkdir(parents=True)
+        (tmp_path / directory / "x.py").write_text("", encoding="utf-8")
+    (tmp_path / ".venv2" / "pyvenv.cfg").write_text("", encoding="utf-8")
+
+    walker = main.ProjectWalker(str(tmp_path))
+    files = sorted(os.path.relpath(path, tmp_path) for path, _size in walker.iter_files())
+    assert files == [".gitignore", "a.py", os.path.join("src", "build", "x.py")]
+
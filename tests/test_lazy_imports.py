@@ -0,0 +1,33 @@
+"""Importar o main não pode carregar os módulos adiados (LAZY_MODULES)
+
+O import roda em um subprocesso: o próprio pytest já carrega tempfile e
+outros módulos. Sem o PySide6 instalado, ele é substituído por stubs
+(pyside6_stub), já que só os imports do main interessam aqui.
+"""
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(TESTS_DIR)
+
+CHILD = textwrap.dedent('''
+    import json, sys
+    sys.path.insert(0, sys.argv[1])
+    sys.path.insert(0, sys.argv[2])
+    import pyside6_stub
+    pyside6_stub.install()
+    import main
+    print(json.dumps([name for name in main.LAZY_MODULES if name in sys.modules]))
+''')
+
+
+def test_import_does_not_load_lazy_modules():
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD, TESTS_DIR, ROOT],
+        capture_output=True, text=True, cwd=ROOT, timeout=120)
+    assert result.returncode == 0, result.stderr
+    eager = json.loads(result.stdout.strip().splitlines()[-1])
+    assert eager == [], f"importados na inicialização: {eager}"
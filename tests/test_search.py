@@ -0,0 +1,127 @@
+"""Busca e substituição em arquivos: search_file_contents, replace_in_lines e afins"""
+import re
+import threading
+
+import main
+
+
+def search(path, pattern, **options):
+    regex = main.compile_search_regex(pattern, **options)
+    return main.search_file_contents(str(path), regex, None, threading.Event())
+
+
+def test_search_reports_first_match_per_line(tmp_path):
+    path = tmp_path / "a.py"
+    path.write_bytes(b"foo bar\r\nbaz foo foo\r\nend\nfoo")
+    assert search(path, "foo") == [(1, 0, "foo bar"), (2, 4, "baz foo foo"), (4, 0, "foo")]
+
+
+def test_search_anchors_per_line_with_crlf(tmp_path):
+    path = tmp_path / "a.py"
+    path.write_bytes(b"foo\r\nx foo\r\nfoo")
+    assert search(path, "^foo$", use_regex=True) == [(1, 0, "foo"), (3, 0, "foo")]
+
+
+def test_search_only_breaks_lines_on_newline(tmp_path):
+    # \x0c e \u2028 não são quebras de linha para a busca (nem para a substituição)
+    path = tmp_path / "a.py"
+    path.write_text("a\x0cfoo\u2028b\nfoo", encoding="utf-8")
+    assert [line for line, _column, _text in search(path, "foo")] == [1, 2]
+
+
+def test_search_case_and_whole_word(tmp_path):
+    path = tmp_path / "a.py"
+    path.write_text("Foo\nfoobar\nfoo\n", encoding="utf-8")
+    assert [m[0] for m in search(path, "foo")] == [1, 2, 3]
+    assert [m[0] for m in search(path, "foo", case_sensitive=True)] == [2, 3]
+    assert [m[0] for m in search(path, "foo", whole_word=True)] == [1, 3]
+
+
+def test_search_literal_prefilter_rejects_file(tmp_path):
+    path = tmp_path / "a.py"
+    path.write_text("nothing here\n", encoding="utf-8")
+    regex = main.compile_search_regex("foo", case_sensitive=True)
+    assert main.search_file_contents(str(path), regex, "foo", threading.Event()) == []
+
+
+def test_search_cancelled_returns_nothing(tmp_path):
+    path = tmp_path / "a.py"
+    path.write_text("foo\n", encoding="utf-8")
+    cancel = threading.Event()
+    cancel.set()
+    assert main.search_file_contents(
+        str(path), main.compile_search_regex("foo"), None, cancel) == []
+
+
+def test_read_text_file_skips_binary_and_large(tmp_path):
+    binary = tmp_path / "b.bin"
+    binary.write_bytes(b"abc\0def" + b"x" * 100)
+    large = tmp_path / "big.txt"
+    large.write_bytes(b"x" * 101)
+    text = tmp_path / "t.txt"
+    text.write_bytes("olá\n".encode("utf-8"))
+    assert main.read_text_file(str(binary)) is None
+    assert main.read_text_file(str(large), max_file_size=100) is None
+    assert main.read_text_file(str(large), max_file_size=101) == "x" * 101
+    assert main.read_text_file(str(text)) == "olá\n"
+    assert main.read_text_file(str(tmp_path / "missing")) is None
+
+
+def test_replace_in_text_is_literal():
+    regex = re.compile(r"(a)")
+    assert main.replace_in_text("banana", regex, r"\1$0") == (r"b\1$0n\1$0n\1$0", 3)
+
+
+def test_replace_in_lines_keeps_line_endings():
+    regex = main.compile_search_regex("foo$", use_regex=True)
+    text = "a foo\r\nfoo\nbar foo\r\nfoo"
+    assert main.replace_in_lines(text, regex, "X") == ("a X\r\nX\nbar X\r\nX", 4)
+
+
+def test_replace_in_lines_only_splits_on_newline():
+    regex = main.compile_search_regex("^foo", use_regex=True)
+    text = "foo\x0bfoo\u2028foo\nfoo"
+    # Só o início de cada linha separada por \n casa com ^, como na busca
+    assert main.replace_in_lines(text, regex, "X") == ("X\x0bfoo\u2028foo\nX", 2)
+
+
+def test_replace_in_lines_does_not_cross_lines():
+    regex = main.compile_search_regex(r"a\s+b", use_regex=True)
+    assert main.replace_in_lines("a\nb a  b", regex, "-") == ("a\nb -", 1)
+
+
+def test_replace_in_lines_limited_to_selected_lines():
+    regex = main.compile_search_regex("foo")
+    text = "foo\r\nfoo\nfoo foo"
+    assert main.replace_in_lines(text, regex, "X", {1, 3}) == ("X\r\nfoo\nX X", 3)
+    assert main.replace_in_lines(text, regex, "X", set()) == (text, 0)
+
+
+def test_preview_matches_replace_and_search_line_numbers(tmp_path):
+    text = "foo\r\nbar\nx\x0cfoo\nfoo"
+    regex = main.compile_search_regex("foo")
+    preview = main.preview_line_replacements(text, regex, "X")
+    assert preview == [(1, "foo", "X"), (3, "x\x0cfoo", "x\x0cX"), (4, "foo", "X")]
+
+    path = tmp_path / "a.py"
+    path.write_bytes(text.encode("utf-8"))
+    assert [line for line, *_ in preview] == [line for line, *_ in search(path, "foo")]
+
+
+def test_replace_in_file_preserves_bytes_outside_matches(tmp_path):
+    path = tmp_path / "a.py"
+    path.write_bytes(b"foo = 1\r\nbar = foo\r\n")
+    regex = main.compile_search_regex("foo")
+    assert main.replace_in_file(str(path), regex, "baz", {2}) == 1
+    assert path.read_bytes() == b"foo = 1\r\nbar = baz\r\n"
+
+
+def test_fuzzy_score():
+    assert main.fuzzy_score("xyz", "src/main.py") is None
+    assert main.fuzzy_score("mp", "src/main.py") is not None
+    # Consecutivos e no nome do arquivo pontuam mais que espalhados
+    assert main.fuzzy_score("main", "src/main.py") > main.fuzzy_score("main", "m/a/i/n.py")
+    # Início de segmento vale mais que o meio de uma palavra
+    assert main.fuzzy_score("m", "src/main.py") > main.fuzzy_score("m", "src/amx.py")
+    # Empate nos caracteres: o caminho mais curto ganha
+    assert main.fuzzy_score("main", "main.py") > main.fuzzy_score("main", "a" * 64 + "/main.py")
@@ -0,0 +1,90 @@
+"""Utf16Offsets, find_aligned e BufferSnapshot"""
+import codecs
+
+import pytest
+
+import main
+
+
+def utf16_position(text, index):
+    return len(text[:index].encode('utf-16-le')) // 2
+
+
+@pytest.mark.parametrize("text", ["", "abc", "a😀b", "😀😀x🐍", "é😀\n\U0010ffff!"])
+def test_utf16_offsets_round_trip(text):
+    offsets = main.Utf16Offsets(text)
+    for index in range(len(text) + 1):
+        position = offsets.to_document(index)
+        assert position == utf16_position(text, index)
+        assert offsets.from_document(position) == index
+
+
+def test_utf16_offsets_inside_surrogate_pair_rounds_forward():
+    offsets = main.Utf16Offsets("a😀b")
+    # Posição 2 fica entre as metades do par substituto: vai para após o emoji
+    assert offsets.from_document(2) == 2
+
+
+def find_all(data, needle, origin, unit):
+    found, position = [], main.find_aligned(data, needle, origin, len(data), origin, unit)
+    while position != -1:
+        found.append(position)
+        position = main.find_aligned(data, needle, position + 1, len(data), origin, unit)
+    return found
+
+
+@pytest.mark.parametrize("encoding, bom", [
+    ('utf-16-le', codecs.BOM_UTF16_LE),
+    ('utf-16-be', codecs.BOM_UTF16_BE),
+    ('utf-32-le', codecs.BOM_UTF32_LE),
+])
+def test_find_aligned_skips_newline_bytes_inside_characters(encoding, bom):
+    # U+0A0A tem os bytes 0A 0A: um \n falso no meio do caractere
+    data = bom + "ਊa\nbਊ\nc".encode(encoding)
+    newline = "\n".encode(encoding)
+    unit = len(newline)
+    positions = find_all(data, newline, len(bom), unit)
+    assert [data[len(bom):p].decode(encoding) for p in positions] == ["ਊa", "ਊa\nbਊ"]
+
+    last_b = main.find_aligned(
+        data, "b".encode(encoding), len(bom), len(data), len(bom), unit, reverse=True)
+    assert data[len(bom):last_b].decode(encoding) == "ਊa\n"
+
+
+def test_find_aligned_single_byte_is_plain_find():
+    data = b"abcabc"
+    assert main.find_aligned(data, b"c", 0, len(data)) == 2
+    assert main.find_aligned(data, b"c", 0, len(data), reverse=True) == 5
+    assert main.find_aligned(data, b"x", 0, len(data)) == -1
+
+
+def make_snapshot(lines, version=1, current=1):
+    size = main.BufferSnapshot.CHUNK_LINES
+    chunks = ['\n'.join(lines[i:i + size]) for i in range(0, len(lines), size)]
+    return main.BufferSnapshot(version, chunks, len(lines), None, lambda: current)
+
+
+def test_buffer_snapshot_lines_across_chunks():
+    lines = [f"linha {i}" for i in range(main.BufferSnapshot.CHUNK_LINES * 2 + 5)]
+    snapshot = make_snapshot(lines)
+    assert snapshot.text() == '\n'.join(lines)
+    assert list(snapshot.iter_lines()) == lines
+    last = len(lines) - 1
+    assert snapshot.line(0) == lines[0]
+    assert snapshot.line(main.BufferSnapshot.CHUNK_LINES) == lines[main.BufferSnapshot.CHUNK_LINES]
+    assert snapshot.line(last) == lines[last]
+
+    text = snapshot.text()
+    starts = snapshot.line_starts()
+    assert len(starts) == len(lines)
+    assert snapshot.line_of_offset(text.index("linha 300")) == 300
+    assert snapshot.line_of_offset(len(text)) == last
+
+
+def test_buffer_snapshot_staleness_and_utf16_cache():
+    snapshot = make_snapshot(["a😀", "b"], version=3, current=3)
+    assert not snapshot.is_stale()
+    assert make_snapshot(["a"], version=3, current=4).is_stale()
+    offsets = snapshot.utf16_offsets()
+    assert offsets is snapshot.utf16_offsets()
+    assert offsets.to_document(len("a😀\nb")) == 5
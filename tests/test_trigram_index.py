@@ -0,0 +1,111 @@
+"""TrigramIndex: atualização, candidatos, persistência e arquivos não indexáveis"""
+import os
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'CACHE_DIR', str(tmp_path / "cache"))
+    root = tmp_path / "project"
+    root.mkdir()
+    (root / "a.py").write_text("def parse_config():\n    pass\n", encoding="utf-8")
+    (root / "b.py").write_text("import os\nprint(os.sep)\n", encoding="utf-8")
+    return root
+
+
+def build_index(root):
+    index = main.TrigramIndex(str(root))
+    for name in sorted(os.listdir(root)):
+        index.update_file(str(root / name))
+    index.is_ready = True
+    return index
+
+
+def test_candidates_narrow_to_files_with_all_trigrams(project):
+    index = build_index(project)
+    assert index.candidates("parse_config") == [str(project / "a.py")]
+    assert index.candidates("PRINT") == [str(project / "b.py")]
+    assert index.candidates("missing_name") == []
+    # Menos de um trigrama: o índice não ajuda
+    assert index.candidates("os") is None
+
+
+def test_candidates_for_regex_use_required_literals(project):
+    index = build_index(project)
+    assert index.candidates(r"parse_\w+\(", use_regex=True) == [str(project / "a.py")]
+    assert index.candidates(r"\w+", use_regex=True) is None
+
+
+def test_not_ready_index_gives_no_candidates(project):
+    index = main.TrigramIndex(str(project))
+    index.update_file(str(project / "a.py"))
+    assert index.candidates("parse") is None
+
+
+def test_update_and_remove(project):
+    index = build_index(project)
+    path = project / "a.py"
+    path.write_text("def load_settings():\n", encoding="utf-8")
+    index.update_file(str(path))
+    assert index.candidates("load_settings") == [str(path)]
+    # Postings antigos ficam: só falsos positivos, nunca falsos negativos
+    assert index.candidates("parse_config") == [str(path)]
+
+    index.remove_file(str(path))
+    assert index.candidates("load_settings") == []
+    assert str(path) not in index.files
+
+    path.unlink()
+    index.update_file(str(path))
+    assert str(path) not in index.files
+
+
+def test_binary_and_oversized_files_are_current_without_postings(project, monkeypatch):
+    binary = project / "image.bin"
+    binary.write_bytes(b"\0parse_config" * 10)
+    index = build_index(project)
+    path = str(binary)
+    assert path in index.files
+    assert index.is_current(path, os.stat(path))
+    assert index.candidates("parse_config") == [str(project / "a.py")]
+
+    # Alterado no disco: deixa de estar atualizado até ser reindexado
+    binary.write_bytes(b"\0changed")
+    assert not index.is_current(path, os.stat(path))
+
+
+def test_save_and_load_round_trip(project):
+    index = build_index(project)
+    assert index.is_dirty
+    index.save()
+    assert not index.is_dirty
+    assert os.path.dirname(index.cache_path) == main.CACHE_DIR
+
+    loaded = main.TrigramIndex(str(project))
+    assert loaded.load()
+    loaded.is_ready = True
+    assert loaded.files == index.files
+    assert loaded.candidates("parse_config") == [str(project / "a.py")]
+    path = str(project / "b.py")
+    assert loaded.is_current(path, os.stat(path))
+
+
+def test_load_rejects_other_format_version(project, monkeypatch):
+    build_index(project).save()
+    monkeypatch.setattr(main.TrigramIndex, 'FORMAT_VERSION', 999)
+    assert not main.TrigramIndex(str(project)).load()
+
+
+def test_indexed_search_adds_only_files_the_index_misses(project):
+    (project / "image.bin").write_bytes(b"\0" * 10)
+    index = build_index(project)
+    (project / "new.py").write_text("parse_config()\n", encoding="utf-8")
+
+    worker = main.FindInFilesWorker(str(project), "parse_config", trigram_index=index)
+    files = [path for path, _size in worker.iter_index_candidates(
+        index.candidates("parse_config"))]
+    # Candidato do índice + arquivo novo; o binário já indexado não é relido
+    assert files == [str(project / "a.py"), str(project / "new.py")]